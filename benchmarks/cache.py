@@ -0,0 +1,81 @@
+""" Cache compression benchmark.
+
+Stores fixture pages with every compression method and reports stored
+size ratio and cache hit latency (read and decompress) of every backend.
+
+Usage::
+
+    python benchmarks/cache.py [--runs 50]
+"""
+
+import sys
+import gzip
+import time
+import tempfile
+import statistics
+from pathlib import Path
+from argparse import ArgumentParser
+
+from weatherapp.core import config, compression
+from weatherapp.core.backends import SQLiteBackend, FileBackend
+
+from common import FIXTURES
+
+
+BACKENDS = {'sqlite': SQLiteBackend, 'file': FileBackend}
+
+
+def get_variants(page):
+    """ Stored data for every compression method as (data, encoding).
+    """
+
+    variants = {method: compression.compress(page, method)
+                for method in compression.get_methods()}
+    # body which server sent gzip encoded is stored as is
+    variants['gzip (as is)'] = compression.compress(
+        page, 'zlib', gzip.compress(page), 'gzip')
+    return variants
+
+
+def measure_hit(backend, key, runs):
+    """ Returns median cache hit time in ms.
+    """
+
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        entry = backend.get(key)
+        compression.decompress(entry.data, entry.info['encoding'])
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main(argv=sys.argv[1:]):
+    parser = ArgumentParser()
+    parser.add_argument('--runs', type=int, default=50)
+    options = parser.parse_args(argv)
+
+    for page_path in sorted(FIXTURES.glob('*.html')):
+        page = page_path.read_bytes()
+        sys.stdout.write(f"{page_path.name} ({len(page) // 1024} KiB)\n")
+        variants = get_variants(page)
+        for name, backend_class in BACKENDS.items():
+            with tempfile.TemporaryDirectory() as location:
+                backend = backend_class(Path(location), config.CACHE_MAX_SIZE,
+                                        config.CACHE_MAX_ENTRIES,
+                                        config.CACHE_EVICT_TIME)
+                for method, (data, encoding) in variants.items():
+                    backend.set(method, data, {'encoding': encoding})
+                    assert compression.decompress(
+                        backend.get(method).data, encoding) == page
+                    hit = measure_hit(backend, method, options.runs)
+                    sys.stdout.write(
+                        f"  {name:6} {method:13} "
+                        f"ratio {len(page) / len(data):5.1f}  "
+                        f"hit {hit:6.3f} ms\n")
+                backend.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,32 @@
+""" Helpers shared by benchmarks.
+"""
+
+import time
+import statistics
+from pathlib import Path
+
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+
+def measure(func, runs, *args):
+    """ Calls function several times.
+
+    :return: median and minimum call time in ms
+    :rtype: dict
+    """
+
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+    return {'median': statistics.median(timings), 'min': min(timings)}
+
+
+def iter_fixtures():
+    """ Recorded provider pages as (name, content) pairs.
+    """
+
+    for path in sorted(FIXTURES.glob('*.html')):
+        yield path.stem, path.read_bytes()
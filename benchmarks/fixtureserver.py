@@ -0,0 +1,83 @@
+""" Local stand-in for provider sites.
+
+Serves recorded pages from fixtures directory: '/<fixture>/<anything>'
+returns 'fixtures/<fixture>.html'. Responses are gzip encoded when client
+accepts it, carry ETag and max-age and are answered with 304 on
+revalidation, like real provider sites.
+"""
+
+import gzip
+import time
+import hashlib
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from common import iter_fixtures
+
+
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        fixture = self.path.strip('/').split('/')[0]
+        if fixture not in self.server.pages:
+            self.send_error(404)
+            return
+
+        page, encoded, etag = self.server.pages[fixture]
+        self.server.requests += 1
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        body = page
+        self.send_response(200)
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = encoded
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Cache-Control', 'max-age=300')
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer(ThreadingHTTPServer):
+
+    """ HTTP server with recorded pages, run in a background thread.
+
+    :param latency: delay before every response (in seconds)
+    :type latency: float
+    """
+
+    daemon_threads = True
+
+    def __init__(self, latency=0):
+        super().__init__(('127.0.0.1', 0), FixtureRequestHandler)
+        self.latency = latency
+        self.requests = 0
+        self.pages = {}
+        for name, page in iter_fixtures():
+            etag = '"{}"'.format(hashlib.md5(page).hexdigest())
+            self.pages[name] = (page, gzip.compress(page), etag)
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_port}'
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,90 @@
+""" Page parsing benchmark.
+
+Parses stored fixture pages with every installed parser backend, with
+and without restricting the parse to the weather fragment.
+
+Usage::
+
+    python benchmarks/parsing.py [--runs 20]
+"""
+
+import sys
+import time
+import statistics
+from argparse import ArgumentParser
+
+from weatherapp.core import parsing
+
+from common import FIXTURES
+
+
+SELECTORS = {
+    'cond': 'div.current-weather div.phrase',
+    'temp': 'div.current-weather div.temp',
+    'feels_like': 'div.current-weather div.real-feel',
+    'wind': 'div.current-weather div.wind',
+}
+
+FRAGMENT = (b'<div class="current-weather">', b'</div>\n</div>')
+
+STRAINER = ('div', {'class': 'current-weather'})
+
+
+def full(content, backend):
+    return parsing.select_text(content, SELECTORS, backend)
+
+
+def strained(content, backend):
+    return parsing.select_text(content, SELECTORS, backend, STRAINER)
+
+
+def sliced(content, backend):
+    return parsing.select_text(parsing.slice_fragment(content, *FRAGMENT),
+                               SELECTORS, backend)
+
+
+MODES = {
+    'full page': full,
+    'strainer': strained,
+    'byte slice': sliced,
+}
+
+
+def measure(func, content, backend, runs):
+    """ Returns median time of parse in ms.
+    """
+
+    expected = full(content, backend)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func(content, backend)
+        timings.append((time.perf_counter() - start) * 1000)
+    assert result == expected, (result, expected)
+    return statistics.median(timings)
+
+
+def main(argv=sys.argv[1:]):
+    parser = ArgumentParser()
+    parser.add_argument('--runs', type=int, default=20)
+    options = parser.parse_args(argv)
+
+    backends = [name for name in parsing.BACKEND_MODULES
+                if parsing.is_available(name)]
+    for page in sorted(FIXTURES.glob('*.html')):
+        content = page.read_bytes()
+        sys.stdout.write(f"{page.name} ({len(content) // 1024} KiB)\n")
+        for backend in backends:
+            baseline = None
+            for mode, func in MODES.items():
+                if backend == 'selectolax' and mode == 'strainer':
+                    continue  # SoupStrainer is BeautifulSoup only
+                timing = measure(func, content, backend, options.runs)
+                baseline = baseline or timing
+                sys.stdout.write(f"  {backend:12} {mode:11} {timing:8.2f} ms"
+                                 f" (x{baseline / timing:.1f})\n")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,63 @@
+""" Startup time benchmark.
+
+Measures how long 'wfapp providers' and warm cache 'wfapp' runs take
+on top of the bare interpreter startup.
+
+Usage::
+
+    python benchmarks/startup.py [--runs 20] [--limit 100]
+"""
+
+import sys
+import time
+import statistics
+import subprocess
+from argparse import ArgumentParser
+
+
+SCENARIOS = {
+    'providers': ['providers'],
+    'warm cache': [],
+}
+
+SNIPPET = "from weatherapp.core.app import main; main({argv!r})"
+
+
+def measure(code, runs):
+    """ Runs python code in a new process, returns timings in ms.
+    """
+
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main(argv=sys.argv[1:]):
+    parser = ArgumentParser()
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--limit', type=float, default=100,
+                        help="Maximum allowed startup time (in ms)")
+    options = parser.parse_args(argv)
+
+    interpreter = statistics.median(measure('pass', options.runs))
+    sys.stdout.write(f"interpreter: {interpreter:.1f} ms\n")
+
+    failed = False
+    for name, app_argv in SCENARIOS.items():
+        code = SNIPPET.format(argv=app_argv)
+        # first run fills providers index and page cache
+        measure(code, 1)
+        timings = measure(code, options.runs)
+        startup = statistics.median(timings) - interpreter
+        failed = failed or startup > options.limit
+        sys.stdout.write(f"{name}: {startup:.1f} ms "
+                         f"(min {min(timings) - interpreter:.1f} ms)\n")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
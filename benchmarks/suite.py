@@ -0,0 +1,247 @@
+""" Benchmark suite for the full provider pipeline.
+
+Providers fetch recorded pages from the local fixture server, so results
+don't depend on network and real provider plugins. Measures cold and
+warm cache runs of serial and concurrent 'run_providers', the same runs
+replayed from the response archive, parse time,
+formatter time and process startup, stores results as JSON and compares
+them with a baseline.
+
+Usage::
+
+    python benchmarks/suite.py [--runs 10] [--output results.json]
+                               [--baseline baseline.json] [--threshold 0.25]
+"""
+
+import io
+import os
+import sys
+import json
+import platform
+import tempfile
+import statistics
+from pathlib import Path
+from argparse import ArgumentParser
+
+from weatherapp.core import config
+from weatherapp.core.app import App
+from weatherapp.core.abstract import WeatherProvider
+from weatherapp.core.configuration import Configuration
+
+import startup
+from common import measure, iter_fixtures
+from fixtureserver import FixtureServer
+
+
+WEATHER = {'cond': 'Partly sunny', 'temp': '+12°C',
+           'feels_like': 'RealFeel® +10°', 'wind': 'SW 14 km/h'}
+
+
+class BenchProvider(WeatherProvider):
+
+    """ Provider which parses recorded forecast page.
+    """
+
+    name = 'bench'
+    title = 'Bench'
+    server_url = ''
+    fixture = 'forecast'
+    page_fragment = ('<div class="current-weather">', '</div>\n</div>')
+
+    def get_name(self):
+        return self.name
+
+    def get_default_location(self):
+        return 'Lviv'
+
+    def get_default_url(self):
+        return f'{self.server_url}/{self.fixture}/{self.name}'
+
+    def configurate(self):
+        pass
+
+    def get_weather_info(self, content):
+        return self.select_weather_info(content, {
+            'cond': 'div.phrase',
+            'temp': 'div.temp',
+            'feels_like': 'div.real-feel',
+            'wind': 'div.wind',
+        })
+
+
+def make_app(server_url, providers):
+    """ Application with bench providers pointing to the fixture server.
+    """
+
+    app = App(stdout=io.StringIO())
+    app.providermanager._commands = {}
+    for index in range(providers):
+        name = f'bench{index}'
+        app.providermanager.add(name, type(name, (BenchProvider,), {
+            'name': name, 'server_url': server_url}))
+    return app
+
+
+def run_pipeline(server, providers, *argv):
+    """ Runs all bench providers once in a new application.
+    """
+
+    app = make_app(server.url, providers)
+    try:
+        app.options, remaining = app.arg_parser.parse_known_args(list(argv))
+        app.run_providers(remaining)
+    finally:
+        app.close()
+    assert WEATHER['temp'] in app.stdout.getvalue()
+
+
+def bench_pipeline(options, results):
+    with FixtureServer(options.latency / 1000) as server:
+        for mode, jobs in (('serial', 1), ('concurrent', options.providers)):
+            argv = ['--jobs', str(jobs), '--formatter', 'jsonl']
+            results[f'pipeline.cold.{mode}'] = measure(
+                run_pipeline, options.runs, server, options.providers,
+                '--refresh', *argv)
+            results[f'pipeline.warm.{mode}'] = measure(
+                run_pipeline, options.runs, server, options.providers, *argv)
+
+        # the same pages replayed from the archive, without sockets
+        archive = os.path.join(os.environ['HOME'], 'pipeline.db')
+        run_pipeline(server, options.providers, '--refresh', '--no-history',
+                     '--record', archive)
+    for mode, jobs in (('serial', 1), ('concurrent', options.providers)):
+        results[f'pipeline.replay.{mode}'] = measure(
+            run_pipeline, options.runs, server, options.providers,
+            '--refresh', '--jobs', str(jobs), '--formatter', 'jsonl',
+            '--replay', archive,
+            '--replay-latency', str(options.latency / 1000))
+
+
+def parse(provider, page):
+    return provider.get_weather_info(provider.get_content(page, 'utf-8'))
+
+
+def bench_parse(options, results):
+    app = make_app('', 1)
+    for name, page in iter_fixtures():
+        provider = app.providermanager.get('bench0')(app)
+        assert parse(provider, page) == WEATHER
+        results[f'parse.{name}'] = measure(parse, options.runs,
+                                           provider, page)
+        # whole page parse, as providers without 'page_fragment' do
+        provider.page_fragment = None
+        results[f'parse.{name}.full'] = measure(parse, options.runs,
+                                                provider, page)
+    app.close()
+
+
+def bench_format(options, results):
+    app = App()
+    for name, formatter_class in app.formatters.items():
+        def emit():
+            formatter = formatter_class()
+            stdout = io.StringIO()
+            for index in range(100):
+                formatter.emit([f'Bench{index}', 'Lviv'], WEATHER, stdout)
+        results[f'format.{name}'] = measure(emit, options.runs)
+
+
+def bench_startup(options, results):
+    interpreter = statistics.median(startup.measure('pass', options.runs))
+    for name, app_argv in startup.SCENARIOS.items():
+        code = startup.SNIPPET.format(argv=app_argv)
+        # first run fills providers index and page cache
+        startup.measure(code, 1)
+        timings = startup.measure(code, options.runs)
+        results[f'startup.{name}'] = {
+            'median': statistics.median(timings) - interpreter,
+            'min': min(timings) - interpreter}
+
+
+BENCHMARKS = {
+    'pipeline': bench_pipeline,
+    'parse': bench_parse,
+    'format': bench_format,
+    'startup': bench_startup,
+}
+
+
+def compare(results, baseline, threshold):
+    """ Finds benchmarks which became slower than baseline.
+
+    :param threshold: allowed slowdown, 0.25 is 25% slower
+    :type threshold: float
+    :return: (name, baseline ms, current ms) of regressions
+    :rtype: list
+    """
+
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]['median'], result['median']
+        if after > before * (1 + threshold):
+            regressions.append((name, before, after))
+    return regressions
+
+
+def prepare_home(home):
+    """ Isolates configuration and cache from the user ones.
+    """
+
+    os.environ['HOME'] = home
+    configuration = Configuration(Path(home) / config.CONFIG_FILE)
+    # fixture server is local, so it shouldn't be rate limited
+    configuration.set(config.RATE_LIMITS_SECTION, **{'127.0.0.1': '10000'})
+    configuration.save()
+
+
+def main(argv=sys.argv[1:]):
+    parser = ArgumentParser()
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--providers', type=int, default=8,
+                        help="How many providers are run in pipeline")
+    parser.add_argument('--latency', type=float, default=20,
+                        help="Fixture server response delay (in ms)")
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS),
+                        default=list(BENCHMARKS))
+    parser.add_argument('--output', help="Write results to JSON file")
+    parser.add_argument('--baseline', help="Compare with results JSON file")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="Allowed slowdown against baseline")
+    options = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as home:
+        prepare_home(home)
+        for name in options.only:
+            BENCHMARKS[name](options, results)
+
+    baseline = {}
+    if options.baseline:
+        with open(options.baseline) as baseline_file:
+            baseline = json.load(baseline_file)['results']
+
+    for name, result in results.items():
+        line = f"{name:32} {result['median']:9.2f} ms"
+        if name in baseline:
+            ratio = result['median'] / (baseline[name]['median'] or 1e-9)
+            line += f"  x{ratio:.2f} of baseline"
+        sys.stdout.write(line + '\n')
+
+    if options.output:
+        with open(options.output, 'w') as output:
+            json.dump({'python': platform.python_version(),
+                       'platform': platform.platform(),
+                       'runs': options.runs,
+                       'results': results}, output, indent=2)
+
+    regressions = compare(results, baseline, options.threshold)
+    for name, before, after in regressions:
+        sys.stdout.write(f"REGRESSION {name}: {before:.2f} ms -> "
+                         f"{after:.2f} ms\n")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,7 +6,7 @@ setup(
     author="Ihor Korzhelskyi",
     description="A simple cli weather aggregator",
     long_descriptoin="",
-    packages=find_namespace_packages(),
+    packages=find_namespace_packages(include=['weatherapp.*']),
     entry_points={
         'console_scripts': 'wfapp=weatherapp.core.app:main'
     },
@@ -14,5 +14,8 @@ setup(
         'requests',
         'bs4',
         'prettytable'
-    ]
+    ],
+    extras_require={
+        'brotli': ['brotli'],
+    }
 )
\ No newline at end of file
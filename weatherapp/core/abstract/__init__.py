@@ -2,6 +2,17 @@ from weatherapp.core.abstract.command import Command
 from weatherapp.core.abstract.manager import Manager
 from weatherapp.core.abstract.provider import WeatherProvider
 from weatherapp.core.abstract.formatter import Formatter
+from weatherapp.core.abstract.backend import CacheBackend, CacheEntry
 
 
-__all__ = ['Command', 'Manager', 'WeatherProvider', 'Formatter']
\ No newline at end of file
+__all__ = ['Command', 'Manager', 'WeatherProvider', 'AsyncWeatherProvider',
+           'Formatter', 'CacheBackend', 'CacheEntry']
+
+
+def __getattr__(name):
+    # asyncio is slow to import, so async provider is imported on demand
+    if name == 'AsyncWeatherProvider':
+        from weatherapp.core.abstract.asyncprovider import \
+            AsyncWeatherProvider
+        return AsyncWeatherProvider
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
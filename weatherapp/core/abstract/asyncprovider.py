@@ -0,0 +1,85 @@
+import asyncio
+
+from weatherapp.core.abstract.provider import WeatherProvider
+
+
+class AsyncWeatherProvider(WeatherProvider):
+
+    """ Weather provider with asynchronous fetch and parse hooks.
+
+    Async providers are awaited directly by the application event loop.
+    By default page is fetched by the synchronous transport in the loop
+    executor, which is the application thread pool of '--jobs' size, so
+    only providers with native async HTTP client run many fetches in a
+    single thread. Such providers should override 'fetch' and save the
+    page with 'save_cache'.
+    """
+
+    async def fetch(self, url, refresh=False):
+        """ Gets page cache entry by given url address.
+
+        :param refresh: whether page cache should be bypassed
+        :type refresh: bool
+        :rtype: abstract.CacheEntry
+        """
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get_page, url, refresh)
+
+    async def parse(self, content):
+        """ Collects weather information from page source.
+
+        See 'get_weather_info' for the result format.
+        """
+
+        return self.get_weather_info(content)
+
+    async def parse_async(self, page):
+        """ Collects weather information from page cache entry.
+
+        Page is parsed in the application process pool if it is enabled,
+        'parse' hook is used otherwise.
+
+        :param page: page cache entry
+        :type page: abstract.CacheEntry
+        :rtype: dict
+        """
+
+        charset = page.info.get('charset')
+        parse_pool = self.app.parse_pool
+        if parse_pool is not None:
+            with self.app.metrics.timer(self.get_name(), 'parse'):
+                return await asyncio.wrap_future(
+                    parse_pool.submit(self, page.data, charset))
+        with self.app.metrics.timer(self.get_name(), 'decode'):
+            content = self.get_content(page.data, charset)
+        with self.app.metrics.timer(self.get_name(), 'parse'):
+            return await self.parse(content)
+
+    async def run_async(self, argv):
+        """ Runs provider in the event loop.
+
+        HTML is parsed only if there is no parsed result for current
+        page cache.
+        """
+
+        weather_info = None
+        if not self.app.options.refresh:
+            weather_info = self.get_parsed_cache(self.url)
+
+        if weather_info is None:
+            page = await self.fetch(self.url)
+            digest = page.info.get('digest')
+            # page might be just revalidated without changes
+            weather_info = self.get_parsed_cache(self.url, digest)
+            if weather_info is None:
+                weather_info = await self.parse_async(page)
+                if digest is not None:
+                    self.save_parsed_cache(self.url, weather_info, digest)
+        return weather_info
+
+    def run(self, argv):
+        """ Runs provider outside of the event loop.
+        """
+
+        return asyncio.run(self.run_async(argv))
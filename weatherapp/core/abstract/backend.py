@@ -0,0 +1,121 @@
+import abc
+import collections
+
+from weatherapp.core import config
+from weatherapp.core.locks import KeyLock
+
+
+CacheEntry = collections.namedtuple('CacheEntry', 'data info stored_at')
+CacheEntry.__doc__ = """ Cached value along with its metadata.
+
+:param data: cached value, None if entry was requested without data,
+             backends may return read-only memoryview instead of bytes
+:type data: bytes or memoryview
+:param info: entry metadata, e.g. response validators
+:type info: dict
+:param stored_at: timestamp of the last entry update
+:type stored_at: float
+"""
+
+
+class CacheBackend(abc.ABC):
+
+    """ Base abstract class for cache backends.
+
+    :param location: where backend keeps its data
+    :type location: pathlib.Path
+    :param max_size: maximum total size of cached data (in bytes)
+    :type max_size: int
+    :param max_entries: maximum number of cached entries
+    :type max_entries: int
+    :param evict_time: how long unused entries are kept (in seconds)
+    :type evict_time: int
+
+    Backend 'lock' is used to let only one thread or process at a time
+    fill the entry::
+
+        with backend.lock(key):
+            ...
+    """
+
+    def __init__(self, location, max_size, max_entries, evict_time):
+        self.location = location
+        self.max_size = max_size
+        self.max_entries = max_entries
+        self.evict_time = evict_time
+        self.lock = KeyLock(location / config.LOCK_DIR)
+
+    @abc.abstractmethod
+    def get(self, key):
+        """ Gets entry with its data by key.
+
+        :param key: entry key
+        :type key: str
+        :return: cache entry or None if there is no such entry
+        :rtype: CacheEntry
+        """
+
+    @abc.abstractmethod
+    def head(self, key):
+        """ Gets entry metadata by key without reading its data.
+
+        :param key: entry key
+        :type key: str
+        :return: cache entry with empty data or None
+        :rtype: CacheEntry
+        """
+
+    @abc.abstractmethod
+    def set(self, key, data, info):
+        """ Stores entry, evicts other entries if limits are exceeded.
+
+        :param key: entry key
+        :type key: str
+        :param data: cached value
+        :type data: bytes
+        :param info: entry metadata
+        :type info: dict
+        """
+
+    @abc.abstractmethod
+    def touch(self, key, info):
+        """ Updates entry metadata and marks entry as just stored.
+
+        :param key: entry key
+        :type key: str
+        :param info: entry metadata
+        :type info: dict
+        """
+
+    @abc.abstractmethod
+    def delete(self, key):
+        """ Removes entry by key if any.
+
+        :param key: entry key
+        :type key: str
+        """
+
+    @abc.abstractmethod
+    def prune(self):
+        """ Removes outdated entries and entries over the limits.
+
+        :return: number of removed entries
+        :rtype: int
+        """
+
+    @abc.abstractmethod
+    def clear(self):
+        """ Removes all entries.
+        """
+
+    @abc.abstractmethod
+    def stats(self):
+        """ Returns cache usage statistics.
+
+        :return: number of entries and their total size
+        :rtype: dict
+        """
+
+    def close(self):
+        """ Releases resources held by backend.
+        """
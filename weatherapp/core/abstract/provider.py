@@ -1,14 +1,15 @@
 import abc
 import time
 import sys
+import json
 import hashlib
-import configparser
 from pathlib import Path
 
-import requests
-
 from weatherapp.core import config
+from weatherapp.core import parsing
+from weatherapp.core import compression
 from weatherapp.core.abstract.command import Command
+from weatherapp.core.abstract.backend import CacheEntry
 
 
 class WeatherProvider(Command):
@@ -18,12 +19,34 @@ class WeatherProvider(Command):
     Defines behavior for all weather providers.
     """
 
-    def __init__(self, app, stdout=None):
+    # should be increased when 'get_weather_info' produces different result
+    parser_version = 1
+    # HTML parser backend, the best installed one is used if None
+    html_parser = None
+    # (start, end) markers of the page part with weather information
+    page_fragment = None
+    # tag name or (name, attrs) pair, restricts BeautifulSoup tree
+    parse_only = None
+    # whether 'get_weather_info' gets raw page bytes instead of text
+    raw_content = False
+    # should be increased when 'get_locations' produces different result
+    location_index_version = 1
+
+    def __init__(self, app, stdout=None, location=None):
         super().__init__(app)
-        location, url = self._get_configuration()
+        with app.metrics.timer(self.get_name(), 'config'):
+            name, url, settings = self._get_configuration()
+        if location is not None:
+            # label distinguishes locations of the same city in output
+            name, url = location.label or location.name, location.url
         self.stdout = stdout or sys.stdout
-        self.location = location
+        self.location = name
         self.url = url
+        self.stale_modes = self.get_stale_modes(
+            settings.get('stale', config.STALE_MODES))
+        self.max_stale = int(settings.get('max_stale', config.MAX_STALE))
+        # age of the page source if stale one was used
+        self.stale_age = None
 
     @abc.abstractmethod
     def get_name(self):
@@ -45,6 +68,37 @@ class WeatherProvider(Command):
         """ Performs provider cnfiguration.
         """
 
+    def supports_location_index(self):
+        """ Whether provider implements both location index hooks.
+
+        Location index is supported if provider returns url from
+        'get_locations_url' and overrides 'get_locations'.
+
+        :rtype: bool
+        """
+
+        return (self.get_locations_url() is not None and
+                type(self).get_locations is not WeatherProvider.get_locations)
+
+    def get_locations_url(self):
+        """ Url of the top level locations page, e.g. list of countries.
+        """
+
+        return None
+
+    def get_locations(self, content):
+        """ Parses locations page.
+
+        :param content: locations page content
+        :type content: str
+        :return: name, url and leaf flag of every listed location, url of
+                 not leaf location is the next level page, e.g. regions of
+                 a country
+        :rtype: list of tuples
+        """
+
+        raise NotImplementedError
+
     @abc.abstractmethod
     def get_weather_info(self, content):
         """ Collects weather information.
@@ -60,6 +114,68 @@ class WeatherProvider(Command):
         }
         """
 
+    def get_content(self, data, charset=None):
+        """ Prepares page data for 'get_weather_info'.
+
+        Page is cut down to 'page_fragment' before decoding, so only the
+        fragment is copied out of the cache. Page is decoded by the response
+        charset unless provider parses raw bytes itself, e.g. with parser
+        which detects page encoding.
+
+        :param data: page data
+        :type data: bytes or memoryview
+        :param charset: response charset
+        :type charset: str
+        :rtype: str or bytes
+        """
+
+        if self.page_fragment is not None:
+            data = parsing.slice_fragment(data, *self.page_fragment)
+        if self.raw_content:
+            return data if isinstance(data, bytes) else bytes(data)
+        return parsing.decode(data, charset)
+
+    def get_fragment(self, content):
+        """ Cuts page source down to the part with weather information.
+
+        :param content: page source
+        :type content: str or bytes
+        """
+
+        if self.page_fragment is None:
+            return content
+        return parsing.slice_fragment(content, *self.page_fragment)
+
+    def get_soup(self, content):
+        """ Parses relevant part of page source into BeautifulSoup tree.
+
+        Only lxml and html.parser backends build BeautifulSoup tree.
+        """
+
+        backend = self.html_parser
+        if backend == 'selectolax':
+            backend = None
+        return parsing.make_soup(self.get_fragment(content), backend,
+                                 self.parse_only)
+
+    def select_weather_info(self, content, selectors):
+        """ Collects weather information by CSS selectors.
+
+        Helper for 'get_weather_info', for example::
+
+            return self.select_weather_info(content, {
+                'cond': 'div.cond', 'temp': 'span.temp', ...})
+
+        :param content: page source
+        :type content: str or bytes
+        :param selectors: CSS selector for each weather field
+        :type selectors: dict
+        :rtype: dict
+        """
+
+        return parsing.select_text(self.get_fragment(content), selectors,
+                                   self.html_parser, self.parse_only)
+
     @staticmethod
     def get_configuration_file():
         """ Returns path to configuration file in home directory.
@@ -68,30 +184,35 @@ class WeatherProvider(Command):
         return Path.home() / config.CONFIG_FILE
 
     def _get_configuration(self):
-        """ Returns configured location name and url.
+        """ Returns configured location name, url and other settings.
 
-        :return: city name and url
+        :return: city name, url and provider section of configuration
         :rtype: tuple
         """
 
-        name = self.get_default_location()
-        url = self.get_default_url()
-        configuration = configparser.ConfigParser()
+        configuration = self.app.configuration
+        location = configuration.get_location(self.get_name())
+        if location is None:
+            name, url = self.get_default_location(), self.get_default_url()
+        else:
+            name, url = location.name, location.url
+        return name, url, configuration.get_section(self.get_name())
 
-        try:
-            configuration.read(self.get_configuration_file())
-        except configparser.Error:
-            msg = f"Bad configuration file. " \
-                  f"Please reconfigurate your provider: {self.name}"
-            if self.app.options.debug:
-                self.app.logger.exception(msg)
-            else:
-                self.app.logger.error(msg)
+    @staticmethod
+    def get_stale_modes(value):
+        """ Parses stale cache modes from configuration value.
 
-        if self.get_name() in configuration.sections():
-            location_config = configuration[self.get_name()]
-            name, url = location_config['name'], location_config['url']
-        return name, url
+        Supported modes are 'revalidate' to use expired cache at once and
+        refresh it in the background and 'error' to use expired cache when
+        page can't be fetched.
+
+        :param value: comma separated list of modes
+        :type value: str
+        :rtype: set
+        """
+
+        modes = {mode.strip() for mode in value.split(',')}
+        return modes & {'revalidate', 'error'}
 
     def save_configuration(self, name, url):
         """ Saves selected location to configuration file.
@@ -103,15 +224,8 @@ class WeatherProvider(Command):
         :param type: str
         """
 
-        parser = configparser.ConfigParser()
-        config_file = self.get_configuration_file()
-
-        if config_file.exists():
-            parser.read(config_file)
-
-        parser[self.get_name()] = {'name': name, 'url': url}
-        with open(config_file, 'w') as configfile:
-            parser.write(configfile)
+        self.app.configuration.set_location(self.get_name(), name, url)
+        self.app.configuration.save()
 
     @staticmethod
     def get_request_headers():
@@ -128,59 +242,341 @@ class WeatherProvider(Command):
         return hashlib.md5(url.encode('utf-8')).hexdigest()
 
     @staticmethod
-    def get_cache_directory():
-        """ Path to cache directory.
+    def get_max_age(headers):
+        """ Returns how long response may be cached according to server.
+
+        :param headers: response headers
+        :type headers: dict
+        :return: max age in seconds or None if server doesn't specify it
+        :rtype: int or None
+        """
+
+        cache_control = headers.get('Cache-Control', '')
+        for directive in cache_control.lower().split(','):
+            directive = directive.strip()
+            if directive in ('no-cache', 'no-store'):
+                return 0
+            if directive.startswith('max-age='):
+                try:
+                    return max(int(directive[len('max-age='):]), 0)
+                except ValueError:
+                    return None
+        return None
+
+    @staticmethod
+    def get_validators(headers):
+        """ Collects cache validators from response headers.
+
+        :param headers: response headers
+        :type headers: dict
+        :return: ETag, Last-Modified, max-age and charset of the response
+        :rtype: dict
         """
 
-        return Path.home() / config.CACHE_DIR
+        return {'etag': headers.get('ETag'),
+                'last_modified': headers.get('Last-Modified'),
+                'max_age': WeatherProvider.get_max_age(headers),
+                'charset': parsing.get_charset(headers.get('Content-Type'))}
 
     @staticmethod
-    def is_valid(path):
-        """ Checks if current cache is valid.
+    def is_valid(entry):
+        """ Checks if cache entry is still valid.
+
+        Server max-age is used as entry lifetime if it was provided,
+        otherwise 'config.CACHE_TIME' is used.
+
+        :param entry: page cache entry
+        :type entry: abstract.CacheEntry
         """
 
-        return (time.time() - path.stat().st_mtime) < config.CACHE_TIME
+        max_age = entry.info.get('max_age')
+        if max_age is None:
+            max_age = config.CACHE_TIME
+        return (time.time() - entry.stored_at) < max_age
+
+    @staticmethod
+    def get_cache_key(url):
+        """ Page cache key of given url address.
+        """
+
+        return f'page:{url}'
 
     def get_cache(self, url):
-        """ Returns cache by given url address if any.
+        """ Returns cache by given url address if it is still valid.
         """
 
-        cache = b''
-        cache_dir = self.get_cache_directory()
-        if cache_dir.exists():
-            cache_path = cache_dir / self.get_url_hash(url)
-            if cache_path.exists() and self.is_valid(cache_path):
-                with cache_path.open('rb') as cache_file:
-                    cache = cache_file.read()
-        return cache
+        entry = self.app.cache.get(self.get_cache_key(url))
+        if entry is not None and self.is_valid(entry):
+            return self.load_entry(entry).data
+        return b''
+
+    def load_entry(self, entry):
+        """ Decompresses page cache entry data.
+
+        :rtype: abstract.CacheEntry
+        """
+
+        with self.app.metrics.timer(self.get_name(), 'decode'):
+            return entry._replace(data=compression.decompress(
+                entry.data, entry.info.get('encoding')))
+
+    def save_cache(self, url, page_source, headers=None, encoded=None):
+        """ Saves page source data and its validators to cache.
+
+        Page is compressed by configured cache compression method, gzip
+        encoded response body is stored as is.
 
-    def save_cache(self, url, page_source):
-        """ Saves page source data to file.
+        :param encoded: response body as it was sent by the server
+        :type encoded: bytes
+        :return: saved cache entry metadata
+        :rtype: dict
         """
 
-        cache_dir = self.get_cache_directory()
-        if not cache_dir.exists():
-            cache_dir.mkdir(parents=True)
+        headers = headers or {}
+        info = self.get_validators(headers)
+        info['digest'] = hashlib.md5(page_source).hexdigest()
+        data, info['encoding'] = compression.compress(
+            page_source, self.app.options.cache_compression, encoded,
+            headers.get('Content-Encoding'))
+        self.app.cache.set(self.get_cache_key(url), data, info)
+        return info
 
-        with  (cache_dir / self.get_url_hash(url)).open('wb') as cache_file:
-            cache_file.write(page_source)
+    def refresh_cache(self, url, entry, headers):
+        """ Marks cached page as fresh after successful revalidation.
+
+        :return: updated cache entry metadata
+        :rtype: dict
+        """
+
+        info = dict(entry.info)
+        validators = self.get_validators(headers)
+        # 304 response may omit validators which haven't changed
+        info.update({key: value for key, value in validators.items()
+                     if value is not None})
+        info['max_age'] = validators['max_age']
+        self.app.cache.touch(self.get_cache_key(url), info)
+        return info
+
+    @staticmethod
+    def get_conditional_headers(entry):
+        """ Request headers for revalidation of expired cache entry.
+        """
+
+        headers = {}
+        if entry.info.get('etag'):
+            headers['If-None-Match'] = entry.info['etag']
+        if entry.info.get('last_modified'):
+            headers['If-Modified-Since'] = entry.info['last_modified']
+        return headers
+
+    def fetch_page(self, url, entry=None):
+        """ Downloads page and saves it to cache.
+
+        Page is revalidated with conditional request if expired cache
+        entry is provided.
+
+        :return: fresh page cache entry
+        :rtype: abstract.CacheEntry
+        """
+
+        headers = self.get_request_headers()
+        if entry is not None:
+            headers.update(self.get_conditional_headers(entry))
+        with self.app.metrics.timer(self.get_name(), 'network'):
+            page = self.app.transport.get(url, headers=headers)
+        if page.status_code == 304 and entry is not None:
+            self.app.metrics.incr(self.get_name(), 'not_modified')
+            info = self.refresh_cache(url, entry, page.headers)
+            return self.load_entry(CacheEntry(entry.data, info, time.time()))
+
+        info = self.save_cache(url, page.content, page.headers,
+                               getattr(page, 'encoded_content', None))
+        return CacheEntry(page.content, info, time.time())
+
+    def fetch_page_once(self, url, refresh=False):
+        """ Downloads page unless it was fetched by another thread or process.
+
+        Only one thread or process at a time downloads the same page,
+        others wait and use its result.
+
+        :rtype: abstract.CacheEntry
+        """
+
+        key = self.get_cache_key(url)
+        with self.app.cache.lock(key):
+            if refresh:
+                return self.fetch_page(url)
+            # page could be fetched while we were waiting for the lock
+            entry = self.app.cache.get(key)
+            if entry is not None and self.is_valid(entry):
+                return self.load_entry(entry)
+            return self.fetch_page(url, entry)
+
+    def refresh_page(self, url):
+        """ Refreshes page cache regardless of its age.
+
+        Used by scheduled refreshes, so cached page is revalidated with
+        conditional request and downloaded again only if it was changed.
+        Page cache is bypassed only if '--refresh' is passed.
+
+        :rtype: abstract.CacheEntry
+        """
+
+        key = self.get_cache_key(url)
+        with self.app.cache.lock(key):
+            entry = None
+            if not self.app.options.refresh:
+                entry = self.app.cache.get(key)
+            return self.fetch_page(url, entry)
+
+    def revalidate(self, url):
+        """ Refreshes expired page cache, invoked in the background.
+        """
+
+        try:
+            self.fetch_page_once(url)
+        except Exception:
+            msg = "Background refresh of %s failed"
+            if self.app.options.debug:
+                self.app.logger.exception(msg, url)
+            else:
+                self.app.logger.warning(msg, url)
+
+    def can_be_stale(self, entry):
+        """ Checks if expired cache entry is not too old to be used.
+        """
+
+        return (time.time() - entry.stored_at) <= self.max_stale
+
+    def use_stale(self, entry):
+        """ Marks provider output as produced from expired cache.
+        """
+
+        self.stale_age = time.time() - entry.stored_at
+        self.app.metrics.incr(self.get_name(), 'stale')
+        return self.load_entry(entry)
+
+    def get_page(self, url, refresh=False):
+        """ Gets page cache entry by given url address.
+
+        Expired cache is revalidated with conditional request, so page is
+        downloaded again only if it was changed on the server. Depending on
+        configured stale modes expired cache may be served at once or when
+        page can't be fetched.
+
+        :rtype: abstract.CacheEntry
+        """
+
+        refresh = refresh or self.app.options.refresh
+        with self.app.metrics.timer(self.get_name(), 'cache'):
+            entry = self.app.cache.get(self.get_cache_key(url))
+        if entry is not None and not refresh:
+            if self.is_valid(entry):
+                self.app.metrics.incr(self.get_name(), 'hit')
+                return self.load_entry(entry)
+            if 'revalidate' in self.stale_modes and self.can_be_stale(entry):
+                self.app.run_in_background(self.revalidate, url)
+                return self.use_stale(entry)
+
+        self.app.metrics.incr(self.get_name(), 'miss')
+        try:
+            return self.fetch_page_once(url, refresh)
+        except OSError:
+            if 'error' in self.stale_modes and entry is not None and \
+                    self.can_be_stale(entry):
+                self.app.logger.warning("Can't fetch %s, expired cache is "
+                                        "used", url)
+                return self.use_stale(entry)
+            raise
 
     def get_page_source(self, url, refresh=False):
         """ Gets page source by given url address.
         """
 
-        cache = self.get_cache(url)
-        if cache and not self.app.options.refresh:
-            page_source = cache
-        else:
-            page = requests.get(url, headers=self.get_request_headers())
-            page_source = page.content
-            self.save_cache(url, page_source)
-        return page_source.decode('utf-8')
+        page = self.get_page(url, refresh)
+        return parsing.decode(page.data, page.info.get('charset'))
+
+    def get_parsed_cache_key(self, url):
+        """ Parsed weather information cache key of given url address.
+
+        Key depends on provider name and parser version, so results of
+        the outdated parser are never used.
+        """
+
+        return f'parsed:{self.get_name()}|{url}|{self.parser_version}'
+
+    def get_parsed_cache(self, url, digest=None):
+        """ Returns parsed weather information by given url address if any.
+
+        Parsed result is valid while page cache it was produced from is
+        valid and unchanged.
+
+        :param digest: digest of the page source, if omitted parsed result
+                       is looked up for valid page cache only
+        :type digest: str
+        """
+
+        with self.app.metrics.timer(self.get_name(), 'cache'):
+            if digest is None:
+                page = self.app.cache.head(self.get_cache_key(url))
+                if page is None or not self.is_valid(page):
+                    return None
+                digest = page.info.get('digest')
+
+            parsed = self.app.cache.get(self.get_parsed_cache_key(url))
+            if parsed is None or digest is None or \
+                    parsed.info.get('digest') != digest:
+                return None
+        self.app.metrics.incr(self.get_name(), 'parsed_hit')
+        return json.loads(parsing.decode(parsed.data))
+
+    def save_parsed_cache(self, url, weather_info, digest):
+        """ Saves parsed weather information along with page digest.
+        """
+
+        data = json.dumps(weather_info, separators=(',', ':'),
+                          ensure_ascii=False).encode('utf-8')
+        self.app.cache.set(self.get_parsed_cache_key(url), data,
+                           {'digest': digest})
+
+    def parse_page(self, page):
+        """ Collects weather information from page cache entry.
+
+        Page is parsed in the application process pool if it is enabled.
+
+        :param page: page cache entry
+        :type page: abstract.CacheEntry
+        :rtype: dict
+        """
+
+        charset = page.info.get('charset')
+        parse_pool = self.app.parse_pool
+        if parse_pool is not None:
+            with self.app.metrics.timer(self.get_name(), 'parse'):
+                return parse_pool.parse(self, page.data, charset)
+        with self.app.metrics.timer(self.get_name(), 'decode'):
+            content = self.get_content(page.data, charset)
+        with self.app.metrics.timer(self.get_name(), 'parse'):
+            return self.get_weather_info(content)
 
     def run(self, argv):
         """ Runs provider.
+
+        HTML is parsed only if there is no parsed result for current
+        page cache.
         """
 
-        content = self.get_page_source(self.url)
-        return self.get_weather_info(content)
\ No newline at end of file
+        weather_info = None
+        if not self.app.options.refresh:
+            weather_info = self.get_parsed_cache(self.url)
+
+        if weather_info is None:
+            page = self.get_page(self.url)
+            digest = page.info.get('digest')
+            # page might be just revalidated without changes
+            weather_info = self.get_parsed_cache(self.url, digest)
+            if weather_info is None:
+                weather_info = self.parse_page(page)
+                if digest is not None:
+                    self.save_parsed_cache(self.url, weather_info, digest)
+        return weather_info
@@ -2,13 +2,64 @@
 """
 
 import sys
+import json
+import time
 import logging
+import tempfile
+import threading
+import configparser
+from pathlib import Path
 from argparse import ArgumentParser
+from concurrent.futures import TimeoutError
 
-from weatherapp.core.formatters import TableFormatter
+from weatherapp.core.formatters import (TableFormatter, JSONLinesFormatter,
+                                        CSVFormatter, PlainFormatter)
+from weatherapp.core.backends import SQLiteBackend, FileBackend
 from weatherapp.core import config
+from weatherapp.core import compression
 from weatherapp.core.commandmanager import CommandManager
+from weatherapp.core.configuration import Configuration, read_locations
 from weatherapp.core.providermanager import ProviderManager
+from weatherapp.core.scheduler import RateLimiter
+from weatherapp.core.executor import DaemonExecutor, InlineExecutor
+from weatherapp.core.metrics import Metrics
+from weatherapp.core.observation import (Observation, ObservationBatch,
+                                         format_summary)
+from weatherapp.core.history import HistoryStore
+
+
+class ProviderTask:
+
+    """ Provider scheduled for execution in the application thread pool.
+
+    :param name: provider name
+    :type name: str
+    :param location: location to run provider for, configured one if None
+    :type location: configuration.Location
+    :param refresh: whether page cache is revalidated before the run
+                    regardless of its age
+    :type refresh: bool
+    """
+
+    def __init__(self, name, location=None, refresh=False):
+        self.name = name
+        self.location = location
+        self.refresh = refresh
+        self.future = None
+        self.started = threading.Event()
+        self.started_at = None
+
+    def start(self):
+        """ Marks provider as picked up by a worker.
+        """
+
+        self.started_at = time.monotonic()
+        self.started.set()
+
+    def __str__(self):
+        if self.location is None:
+            return self.name
+        return f'{self.name} ({self.location.label or self.location.name})'
 
 
 class App:
@@ -29,6 +80,18 @@ class App:
         self.providermanager = ProviderManager()
         self.commandmanager = CommandManager()
         self.formatters = self._load_formatters()
+        self.cache_backends = self._load_cache_backends()
+        self._transport = None
+        self._cache = None
+        self._replay_cache_dir = None
+        self._configuration = None
+        self._formatter = None
+        self._parse_pool = None
+        self._history = None
+        self._lock = threading.Lock()
+        self._background = []
+        self._deadline = None
+        self.metrics = Metrics()
 
     @staticmethod
     def _arg_parse():
@@ -43,23 +106,279 @@ class App:
             '-f', '--formatter',
             action='store',
             default='table',
-            help="Output format, defaults to table")
+            help="Output format: table, jsonl, csv or plain, "
+                 "defaults to table")
+        arg_parser.add_argument(
+            '--cache-backend',
+            action='store',
+            default=config.CACHE_BACKEND,
+            choices=['sqlite', 'file'],
+            help="Cache storage, defaults to sqlite")
+        arg_parser.add_argument(
+            '--cache-compression',
+            action='store',
+            default=config.CACHE_COMPRESSION,
+            choices=compression.get_methods(),
+            help="How cached pages are compressed, defaults to zlib")
         arg_parser.add_argument(
             '-v', '--verbose',
             action='count',
             dest='verbose_level',
             default=config.DEFAULT_VERBOSE_LEVEL,
             help='Increase verbosity of output')
+        arg_parser.add_argument(
+            '--locations',
+            action='store',
+            metavar='FILE',
+            help="CSV file with provider, name and url of locations to run")
+        arg_parser.add_argument(
+            '--all-locations',
+            action='store_true',
+            help="Run providers for all configured locations")
+        arg_parser.add_argument(
+            '--aggregate',
+            action='store_true',
+            default=False,
+            help="Print min, max, mean and the most common condition of "
+                 "all providers for every location")
+        arg_parser.add_argument(
+            '--no-history',
+            action='store_true',
+            default=False,
+            help="Don't save results to the local history")
+        arg_parser.add_argument(
+            '-j', '--jobs',
+            action='store',
+            type=int,
+            default=config.DEFAULT_JOBS,
+            help="How many providers are run in parallel")
+        arg_parser.add_argument(
+            '--timeout',
+            action='store',
+            type=float,
+            default=config.PROVIDER_TIMEOUT,
+            help="How long to wait for a single provider (in seconds)")
+        arg_parser.add_argument(
+            '-w', '--workers',
+            action='store',
+            type=int,
+            default=config.DEFAULT_WORKERS,
+            help="How many processes parse pages, pages are parsed "
+                 "in-process if 0")
+        arg_parser.add_argument(
+            '--deadline',
+            action='store',
+            type=float,
+            default=None,
+            help="How long the whole run may take (in seconds)")
+        arg_parser.add_argument(
+            '--async',
+            action='store_true',
+            dest='use_async',
+            help="Run providers in the asyncio event loop")
+        arg_parser.add_argument(
+            '--connect-timeout',
+            action='store',
+            type=float,
+            default=config.CONNECT_TIMEOUT,
+            help="How long to wait for connection (in seconds)")
+        arg_parser.add_argument(
+            '--read-timeout',
+            action='store',
+            type=float,
+            default=config.READ_TIMEOUT,
+            help="How long to wait for server response (in seconds)")
+        arg_parser.add_argument(
+            '--record',
+            metavar='FILE',
+            help="Record all responses to the archive file")
+        arg_parser.add_argument(
+            '--replay',
+            metavar='FILE',
+            help="Serve responses recorded to the archive file, "
+                 "without network access")
+        arg_parser.add_argument(
+            '--replay-latency',
+            action='store',
+            type=float,
+            default=0,
+            help="Delay of every replayed response (in seconds)")
         arg_parser.add_argument(
             '--debug',
             action='store_true',
             default=False,
             help='Show tracebacks on errors')
+        arg_parser.add_argument(
+            '--profile',
+            action='store_true',
+            default=False,
+            help='Print phase timings and cache counters to stderr')
+        arg_parser.add_argument(
+            '--profile-json',
+            metavar='FILE',
+            help="Write phase timings and cache counters as JSON, "
+                 "'-' for stderr")
+        arg_parser.add_argument(
+            '--profile-stats',
+            metavar='FILE',
+            help='Dump cProfile statistics of the run for pstats, '
+                 'providers are run one by one without timeouts')
         return arg_parser
 
+    @property
+    def transport(self):
+        """ HTTP transport shared by providers and commands.
+
+        Created on first access.
+        """
+
+        # requests is slow to import, commands which don't go to the
+        # network shouldn't pay for it
+        from weatherapp.core import transport
+        from weatherapp.core.archive import ResponseArchive
+
+        rates = self.configuration.get_section(config.RATE_LIMITS_SECTION)
+        with self._lock:
+            if self._transport is not None:
+                return self._transport
+            if self.options.replay:
+                self._transport = transport.ReplayTransport(
+                    ResponseArchive(Path(self.options.replay)),
+                    latency=self.options.replay_latency)
+                return self._transport
+
+            pool_size = max(self.options.jobs, config.POOL_SIZE)
+            self._transport = transport.HttpTransport(
+                connect_timeout=self.options.connect_timeout,
+                read_timeout=self.options.read_timeout,
+                pool_size=pool_size,
+                rate_limiter=RateLimiter(rates=rates))
+            if self.options.record:
+                self._transport = transport.RecordingTransport(
+                    self._transport,
+                    ResponseArchive(Path(self.options.record)))
+            return self._transport
+
+    @property
+    def cache(self):
+        """ Cache backend shared by providers and commands.
+
+        Replay runs use temporary cache which is removed on close.
+        """
+
+        with self._lock:
+            if self._cache is None:
+                location = Path.home() / config.CACHE_DIR
+                if self.options.replay:
+                    # replayed pages must not be served as fresh later
+                    self._replay_cache_dir = tempfile.TemporaryDirectory()
+                    location = Path(self._replay_cache_dir.name)
+                backend = self.cache_backends[self.options.cache_backend]
+                self._cache = backend(location,
+                                      max_size=config.CACHE_MAX_SIZE,
+                                      max_entries=config.CACHE_MAX_ENTRIES,
+                                      evict_time=config.CACHE_EVICT_TIME)
+            return self._cache
+
+    @property
+    def configuration(self):
+        """ Configuration shared by providers and commands.
+
+        Configuration file is read only once per application.
+        """
+
+        with self._lock:
+            if self._configuration is None:
+                self._configuration = Configuration(
+                    Path.home() / config.CONFIG_FILE)
+                try:
+                    self._configuration.load()
+                except configparser.Error:
+                    msg = "Bad configuration file. " \
+                          "Please reconfigurate your providers"
+                    if self.options.debug:
+                        self.logger.exception(msg)
+                    else:
+                        self.logger.error(msg)
+            return self._configuration
+
+    @property
+    def history(self):
+        """ Local history of provider observations.
+        """
+
+        with self._lock:
+            if self._history is None:
+                self._history = HistoryStore(
+                    Path.home() / config.CACHE_DIR / config.HISTORY_DIR)
+            return self._history
+
+    @property
+    def parse_pool(self):
+        """ Process pool for page parsing, None if it is disabled.
+        """
+
+        if not getattr(self.options, 'workers', 0):
+            return None
+
+        # process pool is started only when pages are parsed
+        from weatherapp.core.parsepool import ParsePool
+
+        with self._lock:
+            if self._parse_pool is None:
+                self._parse_pool = ParsePool(self.options.workers)
+            return self._parse_pool
+
+    def run_in_background(self, func, *args):
+        """ Runs function in a separate thread.
+
+        Application waits for all background functions before closing,
+        but not past the run deadline. Function is run at once if the run
+        is profiled, see 'get_executor'.
+        """
+
+        if self.options.profile_stats:
+            func(*args)
+            return
+        thread = threading.Thread(target=func, args=args, daemon=True)
+        with self._lock:
+            self._background.append(thread)
+        thread.start()
+
+    def close(self):
+        """ Releases resources held by application.
+        """
+
+        for thread in self._background:
+            timeout = None
+            if self._deadline is not None:
+                timeout = max(self._deadline - time.monotonic(), 0)
+            thread.join(timeout)
+        self._background = []
+
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+        if self._replay_cache_dir is not None:
+            self._replay_cache_dir.cleanup()
+            self._replay_cache_dir = None
+        if self._parse_pool is not None:
+            self._parse_pool.close()
+            self._parse_pool = None
+
     @staticmethod
     def _load_formatters():
-        return {'table': TableFormatter}
+        return {'table': TableFormatter,
+                'jsonl': JSONLinesFormatter,
+                'csv': CSVFormatter,
+                'plain': PlainFormatter}
+
+    @staticmethod
+    def _load_cache_backends():
+        return {'sqlite': SQLiteBackend, 'file': FileBackend}
 
     def configure_logging(self):
         """ Creates logging handlers for any log output.
@@ -76,15 +395,22 @@ class App:
         console.setFormatter(formatter)
         root_logger.addHandler(console)
 
+    @property
+    def formatter(self):
+        """ Output formatter, single instance for the whole run.
+        """
+
+        if self._formatter is None:
+            formatter = self.formatters.get(self.options.formatter,
+                                            TableFormatter)
+            self._formatter = formatter()
+        return self._formatter
+
     def produce_output(self, title, location, data):
         """ Prints results.
         """
 
-        formatter = self.formatters.get(self.options.formatter, 'table')()
-        columns = [title, location]
-
-        self.stdout.write(formatter.emit(columns, data))
-        self.stdout.write('\n')
+        self.formatter.emit([title, location], data, self.stdout)
 
     def run_command(self, name, argv):
         """ Runs command.
@@ -103,22 +429,393 @@ class App:
         """ Runs specified provider.
         """
 
-        provider = self.providermanager.get(name)
-        if provider:
-            provider = provider(self)
-            self.produce_output(provider.title,
-                                provider.location,
-                                provider.run(argv))
+        if name in self.providermanager:
+            self.run_providers(argv, [name])
+
+    @staticmethod
+    def _run_provider(provider, argv):
+        """ Runs provider and collects its output.
+
+        Title is marked if weather information is produced from
+        expired cache.
+
+        :return: title, location and weather information
+        :rtype: tuple
+        """
+
+        return App._get_output(provider, provider.run(argv))
+
+    @staticmethod
+    def _get_output(provider, weather_info):
+        """ Collects provider output.
+
+        Title is marked if weather information is produced from
+        expired cache.
+
+        :return: title, location and weather information
+        :rtype: tuple
+        """
+
+        title = provider.title
+        if getattr(provider, 'stale_age', None) is not None:
+            title = f'{title} (stale, {int(provider.stale_age // 60)} min old)'
+        return title, provider.location, weather_info
+
+    def _create_provider(self, task):
+        """ Creates provider instance for the task location.
+        """
+
+        provider_factory = self.providermanager.get(task.name)
+        if task.location is None:
+            return provider_factory(self)
+        return provider_factory(self, location=task.location)
+
+    def _execute_provider(self, task, argv):
+        """ Creates provider and collects its weather information.
+
+        Invoked in the worker thread.
+        """
+
+        task.start()
+        provider = self._create_provider(task)
+        if task.refresh:
+            provider.refresh_page(provider.url)
+        return self._run_provider(provider, argv)
+
+    async def _execute_async_provider(self, task, argv):
+        """ Creates async provider and awaits its weather information.
+        """
+
+        import asyncio
+
+        task.start()
+        provider = self._create_provider(task)
+        if task.refresh:
+            await asyncio.get_running_loop().run_in_executor(
+                None, provider.refresh_page, provider.url)
+        return self._get_output(provider, await provider.run_async(argv))
+
+    def refresh_provider(self, name, location=None):
+        """ Refreshes provider page cache and collects its output.
+
+        :return: title, location and weather information
+        :rtype: tuple
+        """
+
+        task = ProviderTask(name, location, refresh=True)
+        result = self._execute_provider(task, [])
+        self.save_history(name, result)
+        return result
+
+    def _wait_provider(self, task, deadline=None):
+        """ Waits for provider result no longer than configured timeout.
+
+        The timeout is counted from the moment the provider was started,
+        so providers waiting in the queue are not penalized by slow ones.
+        Nothing is waited after the run deadline.
+
+        :param deadline: 'time.monotonic' value when whole run should end
+        :type deadline: float
+        """
+
+        # waiting in the queue is bounded only by the run deadline
+        timeout = None
+        if deadline is not None:
+            timeout = max(deadline - time.monotonic(), 0)
+        if not task.started.wait(timeout):
+            task.future.cancel()
+            raise TimeoutError
+        remaining = task.started_at + self.options.timeout - time.monotonic()
+        if deadline is not None:
+            remaining = min(remaining, deadline - time.monotonic())
+        return task.future.result(timeout=max(remaining, 0))
+
+    def get_deadline(self):
+        """ Returns 'time.monotonic' value when current run should end.
+        """
+
+        if self.options.deadline is None:
+            return None
+        return time.monotonic() + self.options.deadline
+
+    def get_executor(self):
+        """ Executor providers are run in.
+
+        Providers are run one by one in the calling thread when the run
+        is profiled, so their work shows up in cProfile statistics.
+        Timeouts and the deadline can't stop them then.
+
+        :rtype: concurrent.futures.ThreadPoolExecutor
+        """
+
+        if self.options.profile_stats:
+            return InlineExecutor()
+        return DaemonExecutor(max(self.options.jobs, 1))
+
+    def get_tasks(self, names=None):
+        """ Lists (provider, location) pairs to run.
+
+        Locations are taken from '--locations' file or from configuration
+        if '--all-locations' is passed, otherwise every provider is run
+        for its default location.
+
+        :param names: names of providers to run, all providers if None
+        :type names: list
+        :return: tasks, none if locations file can't be read
+        :rtype: list
+        """
+
+        if names is None:
+            names = self.providermanager.names()
+
+        tasks = []
+        if self.options.locations:
+            try:
+                locations = list(read_locations(self.options.locations))
+            except (OSError, KeyError, ValueError):
+                msg = "Can't read locations file: %s"
+                if self.options.debug:
+                    self.logger.exception(msg, self.options.locations)
+                else:
+                    self.logger.error(msg, self.options.locations)
+                return tasks
+            for name, location in locations:
+                if name in names:
+                    tasks.append(ProviderTask(name, location))
+                else:
+                    self.logger.warning("Unknown provider: %s", name)
+        elif self.options.all_locations:
+            for name in names:
+                locations = self.configuration.get_locations(name) or [None]
+                tasks.extend(ProviderTask(name, location)
+                             for location in locations)
+        else:
+            tasks.extend(ProviderTask(name) for name in names)
+        return tasks
+
+    def iter_results(self, tasks, argv):
+        """ Executes providers concurrently.
+
+        Results are produced as soon as they are ready in the order of
+        given tasks. Provider errors are logged and produced as None.
+
+        :param tasks: providers to run
+        :type tasks: list of ProviderTask
+        :return: task and its title, location and weather information
+        :rtype: generator
+        """
+
+        deadline = self.get_deadline()
+        executor = self.get_executor()
+        for task in tasks:
+            task.future = executor.submit(self._execute_provider, task, argv)
 
-    def run_providers(self, argv):
+        try:
+            for task in tasks:
+                try:
+                    yield task, self._wait_provider(task, deadline)
+                except TimeoutError:
+                    self.logger.error("Provider: %s timed out", task)
+                    yield task, None
+                except Exception:
+                    msg = "Error during provider: %s run"
+                    if self.options.debug:
+                        self.logger.exception(msg, task)
+                    else:
+                        self.logger.error(msg, task)
+                    yield task, None
+        finally:
+            # providers which are still hanging are left in daemon workers,
+            # so they hold neither the run nor the process exit
+            executor.shutdown(wait=False)
+
+    def run_providers(self, argv, names=None):
         """ Executes all available providers.
+
+        Providers are run concurrently, results are printed as soon as
+        they are ready in the order providers are registered in provider
+        manager.
+
+        :param names: names of providers to run, all providers if None
+        :type names: list
         """
 
-        for name, provider in self.providermanager:
-            provider = provider(self)
-            self.produce_output(provider.title,
-                                provider.location,
-                                provider.run(argv))
+        tasks = self.get_tasks(names)
+        batch = ObservationBatch() if self.options.aggregate else None
+        if self.options.use_async:
+            self._run_async(tasks, argv, batch)
+        else:
+            for task, result in self.iter_results(tasks, argv):
+                self._produce_result(task, result, batch)
+
+        if batch is not None:
+            self.produce_summary(batch)
+
+    def _produce_result(self, task, result, batch=None):
+        """ Prints provider result, adds it to the batch and history.
+        """
+
+        if result is None:
+            return
+        with self.metrics.timer(task.name, 'format'):
+            self.produce_output(*result)
+        observation = self.save_history(task.name, result)
+        if batch is not None:
+            batch.append(observation)
+
+    def save_history(self, name, result):
+        """ Appends provider result to the local history unless disabled.
+
+        History is optional, so errors are only logged. Replayed responses
+        are not current observations and are not saved.
+
+        :param name: provider name
+        :type name: str
+        :param result: title, location and weather information
+        :type result: tuple
+        :return: result observation
+        :rtype: observation.Observation
+        """
+
+        title, location, weather_info = result
+        observation = Observation.from_weather_info(name, location,
+                                                    weather_info)
+        if not (self.options.no_history or self.options.replay):
+            try:
+                self.history.append(observation, time.time())
+            except OSError:
+                self.logger.warning("Can't save history of %s", name,
+                                    exc_info=self.options.debug)
+        return observation
+
+    def produce_summary(self, batch):
+        """ Prints aggregated weather of all providers per location.
+
+        :param batch: results of all providers
+        :type batch: observation.ObservationBatch
+        """
+
+        for location, stats in batch.aggregate().items():
+            self.produce_output(f"All providers ({stats['count']})",
+                                location, format_summary(stats))
+
+    def _run_async(self, tasks, argv, batch=None):
+        """ Runs providers in a new event loop.
+
+        'asyncio.run' isn't used, it waits for the loop executor, so
+        providers hanging in it would hold the run past the deadline.
+        """
+
+        # asyncio is slow to import, it is needed only with '--async'
+        import asyncio
+
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(self._produce_async(tasks, argv, batch))
+        finally:
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(
+                    asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            # executor is shut down without waiting, hanging providers are
+            # left in its daemon workers
+            loop.close()
+
+    def _start_async(self, task, argv, executor):
+        """ Starts provider in the event loop.
+
+        Async providers are awaited in the loop, synchronous ones are run
+        in the executor. Provider timeout is counted from the moment it
+        is started, so providers waiting for a free worker are not
+        penalized by slow ones.
+
+        :rtype: asyncio.Future
+        """
+
+        import asyncio
+        from weatherapp.core.abstract.asyncprovider import \
+            AsyncWeatherProvider
+
+        if issubclass(self.providermanager.get(task.name),
+                      AsyncWeatherProvider):
+            return asyncio.ensure_future(asyncio.wait_for(
+                self._execute_async_provider(task, argv),
+                self.options.timeout))
+        return asyncio.ensure_future(
+            self._execute_in_executor(task, argv, executor))
+
+    async def _execute_in_executor(self, task, argv, executor):
+        """ Runs synchronous provider in the executor of the event loop.
+        """
+
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        started = asyncio.Event()
+
+        def execute():
+            loop.call_soon_threadsafe(started.set)
+            return self._execute_provider(task, argv)
+
+        future = loop.run_in_executor(executor, execute)
+        try:
+            await started.wait()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        return await asyncio.wait_for(future, self.options.timeout)
+
+    async def iter_results_async(self, tasks, argv):
+        """ Executes async and synchronous providers in the event loop.
+
+        Results are produced as soon as they are ready in the order of
+        given tasks. Provider errors are logged and produced as None,
+        providers which are not finished before the run deadline are
+        cancelled.
+
+        :param tasks: providers to run
+        :type tasks: list of ProviderTask
+        :return: task and its title, location and weather information
+        :rtype: async generator
+        """
+
+        import asyncio
+
+        deadline = self.get_deadline()
+        executor = self.get_executor()
+        # async providers fetch pages in the same executor by default
+        asyncio.get_running_loop().set_default_executor(executor)
+        futures = [self._start_async(task, argv, executor) for task in tasks]
+        try:
+            for task, future in zip(tasks, futures):
+                remaining = None
+                if deadline is not None:
+                    remaining = max(deadline - time.monotonic(), 0)
+                try:
+                    yield task, await asyncio.wait_for(
+                        asyncio.shield(future), remaining)
+                except asyncio.TimeoutError:
+                    future.cancel()
+                    self.logger.error("Provider: %s timed out", task)
+                    yield task, None
+                except Exception:
+                    msg = "Error during provider: %s run"
+                    if self.options.debug:
+                        self.logger.exception(msg, task)
+                    else:
+                        self.logger.error(msg, task)
+                    yield task, None
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    async def _produce_async(self, tasks, argv, batch=None):
+        async for task, result in self.iter_results_async(tasks, argv):
+            self._produce_result(task, result, batch)
 
     def run(self, argv):
         """ Runs application.
@@ -127,8 +824,48 @@ class App:
         """
 
         self.options, remaining_args = self.arg_parser.parse_known_args(argv)
+        self._deadline = self.get_deadline()
         self.configure_logging()
 
+        profiler = None
+        if self.options.profile_stats:
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+
+        started_at = time.perf_counter()
+        try:
+            return self.dispatch(remaining_args)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                profiler.dump_stats(self.options.profile_stats)
+            self.report_metrics(time.perf_counter() - started_at)
+
+    def report_metrics(self, run_time):
+        """ Writes collected metrics if profiling is requested.
+
+        :param run_time: how long the whole run took (in seconds)
+        :type run_time: float
+        """
+
+        if self.options.profile:
+            self.stderr.write(self.metrics.summary())
+            self.stderr.write(f'total: {run_time * 1000:.1f}ms\n')
+
+        if self.options.profile_json:
+            report = json.dumps({'total': run_time,
+                                 'providers': self.metrics.as_dict()},
+                                indent=2)
+            if self.options.profile_json == '-':
+                self.stderr.write(report + '\n')
+            else:
+                Path(self.options.profile_json).write_text(report + '\n')
+
+    def dispatch(self, remaining_args):
+        """ Runs command, provider or all providers given in options.
+        """
+
         command_name = self.options.command
         if not command_name:
             # runs all providers
@@ -149,7 +886,11 @@ def main(argv=sys.argv[1:]):
     """ Main entry point.
     """
 
-    return App().run(argv)
+    app = App()
+    try:
+        return app.run(argv)
+    finally:
+        app.close()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,109 @@
+""" Archive of recorded HTTP responses.
+
+Responses are kept in a single SQLite file indexed by url, body is stored
+as it was sent by the server, so replayed response is decoded the same
+way as the recorded one.
+"""
+
+import json
+import time
+import sqlite3
+import threading
+import collections
+
+
+ArchivedResponse = collections.namedtuple(
+    'ArchivedResponse', 'url status_code headers body recorded_at')
+ArchivedResponse.__doc__ = """ Recorded response.
+
+:param headers: response headers
+:type headers: dict
+:param body: response body as it was sent, e.g. gzip encoded
+:type body: bytes
+"""
+
+
+class ResponseArchive:
+
+    """ Recorded responses in SQLite file.
+
+    :param path: archive file path
+    :type path: pathlib.Path
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS responses (
+            url TEXT PRIMARY KEY,
+            status_code INTEGER NOT NULL,
+            headers TEXT NOT NULL,
+            body BLOB NOT NULL,
+            recorded_at REAL NOT NULL
+        );
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = None
+
+    @property
+    def connection(self):
+        """ Connection to the archive database, opened on first access.
+        """
+
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.path), timeout=30,
+                                         check_same_thread=False,
+                                         isolation_level=None)
+            connection.executescript(self.SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def add(self, url, status_code, headers, body):
+        """ Records response, previous response of the url is replaced.
+        """
+
+        with self._lock:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO responses '
+                '(url, status_code, headers, body, recorded_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (url, status_code, json.dumps(dict(headers)), body,
+                 time.time()))
+
+    def get(self, url):
+        """ Recorded response of the url, None if there is no such.
+
+        :rtype: ArchivedResponse
+        """
+
+        with self._lock:
+            row = self.connection.execute(
+                'SELECT url, status_code, headers, body, recorded_at '
+                'FROM responses WHERE url = ?', (url,)).fetchone()
+        return None if row is None else self._make_response(row)
+
+    def load(self):
+        """ All recorded responses by url.
+
+        :rtype: dict
+        """
+
+        with self._lock:
+            rows = self.connection.execute(
+                'SELECT url, status_code, headers, body, recorded_at '
+                'FROM responses').fetchall()
+        return {row[0]: self._make_response(row) for row in rows}
+
+    @staticmethod
+    def _make_response(row):
+        url, status_code, headers, body, recorded_at = row
+        return ArchivedResponse(url, status_code, json.loads(headers),
+                                bytes(body), recorded_at)
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -0,0 +1,2 @@
+from weatherapp.core.backends.sqlite import SQLiteBackend
+from weatherapp.core.backends.filesystem import FileBackend
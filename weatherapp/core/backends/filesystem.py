@@ -0,0 +1,205 @@
+import os
+import json
+import mmap
+import time
+import zlib
+import hashlib
+import tempfile
+
+from weatherapp.core.abstract import CacheBackend, CacheEntry
+
+
+class FileBackend(CacheBackend):
+
+    """ Cache backend which keeps every entry in a separate file.
+
+    Entry data is stored in a file named by key hash, metadata is stored
+    next to it in a json file along with data size and checksum. Files are
+    written to temporary file first and then renamed, so readers never see
+    partially written file. Data is replaced before metadata, and reader
+    checks data against metadata checksum, so data and metadata of
+    different writes are never paired.
+    Oldest entries are evicted when size or count limits are exceeded.
+    Entry data is memory-mapped, so cache hit doesn't copy page into
+    memory until it is used.
+    """
+
+    INFO_SUFFIX = '.json'
+    TEMP_SUFFIX = '.tmp'
+    # how many times entry is read again if it is being replaced
+    READ_ATTEMPTS = 3
+
+    def get_path(self, key):
+        """ Path to the entry data file.
+        """
+
+        return self.location / hashlib.md5(key.encode('utf-8')).hexdigest()
+
+    def get_info_path(self, key):
+        """ Path to the entry metadata file.
+        """
+
+        return self.get_path(key).with_suffix(self.INFO_SUFFIX)
+
+    def _read_info(self, key):
+        """ Entry metadata with data size and checksum, None if missing.
+
+        :rtype: dict
+        """
+
+        try:
+            with self.get_info_path(key).open('r') as info_file:
+                stored = json.load(info_file)
+        except (OSError, ValueError):
+            return None
+        # metadata of the older layout has no checksum
+        if not isinstance(stored, dict) or 'crc32' not in stored:
+            return None
+        return stored
+
+    def head(self, key):
+        stored = self._read_info(key)
+        if stored is None:
+            return None
+        try:
+            stored_at = self.get_path(key).stat().st_mtime
+        except OSError:
+            return None
+        return CacheEntry(None, stored['info'], stored_at)
+
+    def get(self, key):
+        path = self.get_path(key)
+        for attempt in range(self.READ_ATTEMPTS):
+            stored = self._read_info(key)
+            if stored is None:
+                return None
+            try:
+                with path.open('rb') as data_file:
+                    stored_at = os.fstat(data_file.fileno()).st_mtime
+                    data = self._map(data_file)
+            except (OSError, ValueError):
+                return None
+            if len(data) == stored['size'] and \
+                    zlib.crc32(data) == stored['crc32']:
+                return CacheEntry(data, stored['info'], stored_at)
+            # data is replaced, but its metadata is not yet
+        return None
+
+    @staticmethod
+    def _map(data_file):
+        """ Read-only view of the whole file.
+
+        Mapping stays valid after the file is closed or replaced.
+
+        :rtype: memoryview or bytes
+        """
+
+        if not os.fstat(data_file.fileno()).st_size:
+            return b''  # empty file can't be mapped
+        return memoryview(mmap.mmap(data_file.fileno(), 0,
+                                    access=mmap.ACCESS_READ))
+
+    def _write(self, path, data):
+        """ Atomically replaces file content.
+        """
+
+        fd, temp_path = tempfile.mkstemp(dir=str(self.location),
+                                         suffix=self.TEMP_SUFFIX)
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                temp_file.write(data)
+            os.replace(temp_path, str(path))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def _write_info(self, key, info, size, crc32):
+        stored = {'info': info, 'size': size, 'crc32': crc32}
+        self._write(self.get_info_path(key),
+                    json.dumps(stored).encode('utf-8'))
+
+    def set(self, key, data, info):
+        self.location.mkdir(parents=True, exist_ok=True)
+        # metadata is written last, it commits the new data
+        self._write(self.get_path(key), data)
+        self._write_info(key, info, len(data), zlib.crc32(data))
+        self._evict()
+
+    def touch(self, key, info):
+        stored = self._read_info(key)
+        path = self.get_path(key)
+        if stored is not None and path.exists():
+            self._write_info(key, info, stored['size'], stored['crc32'])
+            path.touch()
+
+    def delete(self, key):
+        for path in (self.get_path(key), self.get_info_path(key)):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _scan(self):
+        """ Lists all data files as (mtime, size, path) oldest first.
+        """
+
+        if not self.location.exists():
+            return []
+
+        files = []
+        with os.scandir(self.location) as entries:
+            for entry in entries:
+                if entry.is_file() and '.' not in entry.name:
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+        return sorted(files)
+
+    def _remove(self, path):
+        for name in (path, path + self.INFO_SUFFIX):
+            try:
+                os.unlink(name)
+            except FileNotFoundError:
+                pass
+
+    def _evict(self, files=None):
+        """ Removes oldest entries over the limits.
+
+        :return: number of removed entries
+        :rtype: int
+        """
+
+        files = self._scan() if files is None else files
+        count, size = len(files), sum(file[1] for file in files)
+        removed = 0
+        for mtime, file_size, path in files:
+            if count <= self.max_entries and size <= self.max_size:
+                break
+            self._remove(path)
+            count -= 1
+            size -= file_size
+            removed += 1
+        return removed
+
+    def prune(self):
+        deadline = time.time() - self.evict_time
+        files = []
+        removed = 0
+        for mtime, size, path in self._scan():
+            if mtime < deadline:
+                self._remove(path)
+                removed += 1
+            else:
+                files.append((mtime, size, path))
+        return removed + self._evict(files)
+
+    def clear(self):
+        for mtime, size, path in self._scan():
+            self._remove(path)
+        # leftovers of interrupted writes
+        for path in self.location.glob('*' + self.TEMP_SUFFIX):
+            path.unlink()
+
+    def stats(self):
+        files = self._scan()
+        return {'entries': len(files),
+                'size': sum(file[1] for file in files)}
@@ -0,0 +1,156 @@
+import json
+import time
+import sqlite3
+import threading
+
+from weatherapp.core import config
+from weatherapp.core.abstract import CacheBackend, CacheEntry
+
+
+class SQLiteBackend(CacheBackend):
+
+    """ Cache backend which keeps all entries in a single SQLite file.
+
+    Least recently used entries are evicted when size or count limits
+    are exceeded. Database file is placed in backend location directory.
+
+    Access time of entry is updated at most once per 'access_resolution'
+    seconds, so warm reads, e.g. of entries read every run, aren't write
+    transactions on the database shared between processes.
+    """
+
+    access_resolution = config.CACHE_ACCESS_RESOLUTION
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entries (
+            key TEXT PRIMARY KEY,
+            data BLOB NOT NULL,
+            info TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            stored_at REAL NOT NULL,
+            accessed_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS entries_accessed_at
+            ON entries (accessed_at);
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.path = self.location / config.CACHE_FILE
+        self._lock = threading.Lock()
+        self._connection = None
+
+    @property
+    def connection(self):
+        """ Connection to the cache database, opened on first access.
+        """
+
+        if self._connection is None:
+            self.location.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.path), timeout=30,
+                                         check_same_thread=False,
+                                         isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.executescript(self.SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def get(self, key):
+        with self._lock:
+            row = self.connection.execute(
+                'SELECT data, info, stored_at, accessed_at FROM entries '
+                'WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if now - row[3] >= self.access_resolution:
+                self.connection.execute(
+                    'UPDATE entries SET accessed_at = ? WHERE key = ?',
+                    (now, key))
+        data, info, stored_at, accessed_at = row
+        return CacheEntry(data, json.loads(info), stored_at)
+
+    def head(self, key):
+        with self._lock:
+            row = self.connection.execute(
+                'SELECT info, stored_at FROM entries WHERE key = ?',
+                (key,)).fetchone()
+        if row is None:
+            return None
+        info, stored_at = row
+        return CacheEntry(None, json.loads(info), stored_at)
+
+    def set(self, key, data, info):
+        now = time.time()
+        with self._lock:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO entries '
+                '(key, data, info, size, stored_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (key, data, json.dumps(info), len(data), now, now))
+            self._evict()
+
+    def touch(self, key, info):
+        now = time.time()
+        with self._lock:
+            self.connection.execute(
+                'UPDATE entries SET info = ?, stored_at = ?, accessed_at = ? '
+                'WHERE key = ?', (json.dumps(info), now, now, key))
+
+    def delete(self, key):
+        with self._lock:
+            self.connection.execute('DELETE FROM entries WHERE key = ?',
+                                    (key,))
+
+    def _evict(self):
+        """ Removes least recently used entries over the limits.
+
+        :return: number of removed entries
+        :rtype: int
+        """
+
+        count, size = self.connection.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries').fetchone()
+        if count <= self.max_entries and size <= self.max_size:
+            return 0
+
+        rows = self.connection.execute(
+            'SELECT key, size FROM entries ORDER BY accessed_at').fetchall()
+        keys = []
+        for key, entry_size in rows:
+            if count <= self.max_entries and size <= self.max_size:
+                break
+            keys.append((key,))
+            count -= 1
+            size -= entry_size
+        self.connection.executemany('DELETE FROM entries WHERE key = ?',
+                                    keys)
+        return len(keys)
+
+    def prune(self):
+        with self._lock:
+            removed = self.connection.execute(
+                'DELETE FROM entries WHERE accessed_at < ?',
+                (time.time() - self.evict_time,)).rowcount
+            removed += self._evict()
+            self.connection.execute('VACUUM')
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self.connection.execute('DELETE FROM entries')
+            self.connection.execute('VACUUM')
+
+    def stats(self):
+        with self._lock:
+            count, size = self.connection.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) '
+                'FROM entries').fetchone()
+        return {'entries': count, 'size': size}
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -1,4 +1,5 @@
-from weatherapp.core.commands import Configurate, Providers
+from weatherapp.core.commands import (Configurate, Providers, Cache,
+                                      Serve, Prefetch, History)
 from weatherapp.core.abstract import Manager
 
 
@@ -26,7 +27,8 @@ class CommandManager(Manager):
         """ Loads all external (from an entrypoints) commands.
         """
 
-        for command in [Configurate, Providers]:
+        for command in [Configurate, Providers, Cache, Serve, Prefetch,
+                        History]:
             self.add(command.name, command)
 
     def get(self, name):
@@ -41,6 +43,14 @@ class CommandManager(Manager):
 
         return self._commands.get(name, None)
 
+    def names(self):
+        """ Names of all registered commands.
+
+        :rtype: list
+        """
+
+        return list(self._commands)
+
     def __getitem__(self, name):
         return self._commands[name]
 
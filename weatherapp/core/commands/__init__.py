@@ -1,2 +1,6 @@
 from weatherapp.core.commands.config import Configurate
-from weatherapp.core.commands.providers import Providers
\ No newline at end of file
+from weatherapp.core.commands.providers import Providers
+from weatherapp.core.commands.cache import Cache
+from weatherapp.core.commands.serve import Serve
+from weatherapp.core.commands.prefetch import Prefetch
+from weatherapp.core.commands.history import History
@@ -0,0 +1,32 @@
+from weatherapp.core.abstract.command import Command
+
+
+class Cache(Command):
+
+    """ Shows cache usage and removes cached entries.
+    """
+
+    name = 'cache'
+
+    def get_parser(self):
+        parser = super().get_parser()
+        parser.add_argument('action', choices=['stats', 'prune', 'clear'],
+                            help='Cache action')
+        return parser
+
+    def run(self, argv):
+        """ Runs command.
+        """
+
+        parsed_args = self.get_parser().parse_args(argv)
+        cache = self.app.cache
+        if parsed_args.action == 'stats':
+            stats = cache.stats()
+            self.app.stdout.write(
+                f"entries: {stats['entries']} / {cache.max_entries} \n"
+                f"size: {stats['size']} / {cache.max_size} bytes \n")
+        elif parsed_args.action == 'prune':
+            removed = cache.prune()
+            self.app.stdout.write(f"removed entries: {removed} \n")
+        else:
+            cache.clear()
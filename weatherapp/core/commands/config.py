@@ -1,9 +1,15 @@
+from pathlib import Path
+
+from weatherapp.core import config
 from weatherapp.core.abstract.command import Command
 
 
 class Configurate(Command):
 
     """ Helps to configure weatherapp providers.
+
+    Locations are chosen interactively on the provider site, or found
+    offline in the local location index if provider supports it.
     """
 
     name = 'configurate'
@@ -11,8 +17,44 @@ class Configurate(Command):
     def get_parser(self):
         parser = super().get_parser()
         parser.add_argument('provider', help='Provider name')
+        parser.add_argument('--search', metavar='NAME',
+                            help='Find location in the location index')
+        parser.add_argument('--batch', metavar='FILE',
+                            help='Add the best match of every location '
+                                 'name in file, one name per line')
+        parser.add_argument('--label',
+                            help='Save found location as additional one')
+        parser.add_argument('--limit', type=int, default=10,
+                            help='How many found locations are shown')
+        parser.add_argument('--update-index', action='store_true',
+                            help='Build or refresh the location index')
         return parser
 
+    @staticmethod
+    def get_index_file(provider_name):
+        """ Path to the provider location index file.
+        """
+
+        return (Path.home() / config.CACHE_DIR / config.LOCATIONS_DIR /
+                f'{provider_name}.json')
+
+    def get_index(self, provider, update=False):
+        """ Loads provider location index, builds it if it is outdated.
+
+        :rtype: locationindex.LocationIndex
+        """
+
+        # imported here, so other commands don't pay for it at startup
+        from weatherapp.core.locationindex import LocationIndex, build_index
+
+        path = self.get_index_file(provider.get_name())
+        index = LocationIndex.load(path)
+        if update or index is None or \
+                index.version != provider.location_index_version:
+            index = build_index(provider, index, self.app.options.jobs)
+            index.dump(path)
+        return index
+
     def run(self, argv):
         """ Runs command.
         """
@@ -22,4 +64,65 @@ class Configurate(Command):
             provider_name = parsed_args.provider
             if provider_name in self.app.providermanager:
                 provider_factory = self.app.providermanager.get(provider_name)
-                provider_factory(self.app).configurate()
\ No newline at end of file
+                provider = provider_factory(self.app)
+                if not (parsed_args.search or parsed_args.batch or
+                        parsed_args.update_index):
+                    provider.configurate()
+                    return
+
+                if not provider.supports_location_index():
+                    self.app.stderr.write(f"{provider_name} provider doesn't "
+                                          f"support location index\n")
+                    return
+                index = self.get_index(provider, parsed_args.update_index)
+                if parsed_args.search:
+                    self.choose(provider_name, index, parsed_args)
+                elif parsed_args.batch:
+                    self.add_batch(provider_name, index, parsed_args.batch)
+                else:
+                    self.app.stdout.write(
+                        f'{len(index)} locations indexed\n')
+
+    def save_location(self, provider_name, location, label=None):
+        self.app.configuration.set_location(provider_name, location.name,
+                                            location.url, label)
+
+    def choose(self, provider_name, index, parsed_args):
+        """ Saves one of the found locations.
+        """
+
+        locations = index.search(parsed_args.search, parsed_args.limit)
+        if not locations:
+            self.app.stderr.write(f'{parsed_args.search} is not found\n')
+            return
+
+        choice = 0
+        if len(locations) > 1:
+            for number, location in enumerate(locations, 1):
+                self.app.stdout.write(
+                    f'{number}. {location.name} ({location.path})\n')
+            self.app.stdout.write('Choose location number [1]: ')
+            self.app.stdout.flush()
+            answer = self.app.stdin.readline().strip()
+            choice = int(answer) - 1 if answer else 0
+            if not 0 <= choice < len(locations):
+                raise ValueError(f'Wrong location number: {answer}')
+        self.save_location(provider_name, locations[choice],
+                           parsed_args.label)
+        self.app.configuration.save()
+
+    def add_batch(self, provider_name, index, path):
+        """ Adds the best match of every location name as additional one.
+
+        Location name is used as location label.
+        """
+
+        with open(path, encoding='utf-8') as names_file:
+            names = [line.strip() for line in names_file if line.strip()]
+        for name in names:
+            locations = index.search(name, 1)
+            if locations:
+                self.save_location(provider_name, locations[0], name)
+            else:
+                self.app.stderr.write(f'{name} is not found\n')
+        self.app.configuration.save()
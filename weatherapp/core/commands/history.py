@@ -0,0 +1,97 @@
+import re
+import math
+import time
+from datetime import datetime
+
+from weatherapp.core.abstract.command import Command
+
+
+# relative time units in seconds
+TIME_UNITS = {'m': 60, 'h': 3600, 'd': 86400, 'w': 7 * 86400}
+
+
+def parse_time(value, now=None):
+    """ Parses absolute or relative time.
+
+    :param value: ISO date or datetime, e.g. '2024-01-31T12:00', or time
+                  ago, e.g. '30m', '12h', '7d', '2w'
+    :type value: str
+    :return: unix timestamp
+    :rtype: float
+    :raises ValueError: if value can't be parsed
+    """
+
+    match = re.fullmatch(r'(\d+)([mhdw])', value.strip())
+    if match is not None:
+        now = time.time() if now is None else now
+        return now - int(match.group(1)) * TIME_UNITS[match.group(2)]
+    return datetime.fromisoformat(value).timestamp()
+
+
+def format_record(record):
+    """ Formats history record as weather information.
+
+    :type record: history.HistoryRecord
+    :rtype: dict
+    """
+
+    def number(value, template):
+        return '' if math.isnan(value) else template.format(value)
+
+    return {'cond': record.cond,
+            'temp': number(record.temp, '{:+.0f}°C'),
+            'feels_like': number(record.feels_like, '{:+.0f}°C'),
+            'wind': number(record.wind, '{:.1f} m/s')}
+
+
+class History(Command):
+
+    """ Shows stored weather history.
+    """
+
+    name = 'history'
+
+    def get_parser(self):
+        parser = super().get_parser()
+        parser.add_argument('provider', nargs='?',
+                            help='Provider name, all providers if omitted')
+        parser.add_argument('--location', help='Location name')
+        parser.add_argument('--since', type=parse_time,
+                            help="Range start: ISO date or time ago, "
+                                 "e.g. 7d")
+        parser.add_argument('--until', type=parse_time,
+                            help="Range end: ISO date or time ago")
+        parser.add_argument('--last', type=int, metavar='N',
+                            help='Only N latest observations of every '
+                                 'series, defaults to 10 without range')
+        return parser
+
+    def run(self, argv):
+        """ Runs command.
+        """
+
+        parsed_args = self.get_parser().parse_args(argv)
+        history = self.app.history
+        last = parsed_args.last
+        if last is None and parsed_args.since is None and \
+                parsed_args.until is None:
+            last = 10
+
+        for series in history.series():
+            if parsed_args.provider not in (None, series.provider) or \
+                    parsed_args.location not in (None, series.location):
+                continue
+            if parsed_args.since is None and parsed_args.until is None:
+                records = history.latest(series.provider, series.location,
+                                         last)
+            else:
+                records = history.range(series.provider, series.location,
+                                        parsed_args.since, parsed_args.until)
+                if last is not None:
+                    records = records[-last:]
+
+            for record in records:
+                observed_at = datetime.fromtimestamp(record.time)
+                self.app.produce_output(
+                    f'{series.provider} {observed_at:%Y-%m-%d %H:%M}',
+                    series.location, format_record(record))
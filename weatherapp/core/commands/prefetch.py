@@ -0,0 +1,44 @@
+from weatherapp.core import config
+from weatherapp.core.abstract.command import Command
+from weatherapp.core.scheduler import Scheduler
+
+
+class Prefetch(Command):
+
+    """ Refreshes page cache of all providers ahead of time.
+
+    Foreground runs are then answered from the warm cache.
+    """
+
+    name = 'prefetch'
+
+    def get_parser(self):
+        parser = super().get_parser()
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep refreshing on schedule')
+        return parser
+
+    def run(self, argv):
+        """ Runs command.
+        """
+
+        parsed_args = self.get_parser().parse_args(argv)
+        tasks = self.app.get_tasks()
+        if not parsed_args.loop:
+            for task in tasks:
+                task.refresh = True
+            # results are not printed, cache and history are refreshed
+            for task, result in self.app.iter_results(tasks, []):
+                if result is not None:
+                    self.app.save_history(task.name, result)
+            return
+
+        scheduler = Scheduler(lambda key: self.app.refresh_provider(*key),
+                              config.CACHE_TIME * config.REFRESH_RATIO,
+                              workers=self.app.options.jobs)
+        for task in tasks:
+            scheduler.add((task.name, task.location))
+        try:
+            scheduler.run()
+        except KeyboardInterrupt:
+            scheduler.stop()
@@ -12,5 +12,5 @@ class Providers(Command):
         """ Runs command.
         """
 
-        for provider in self.app.providermanager:
-            self.app.stdout.write(f"{provider[0]} \n")
\ No newline at end of file
+        for name in self.app.providermanager.names():
+            self.app.stdout.write(f"{name} \n")
\ No newline at end of file
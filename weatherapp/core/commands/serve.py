@@ -0,0 +1,50 @@
+import os
+
+from weatherapp.core import config
+from weatherapp.core.abstract.command import Command
+
+
+class Serve(Command):
+
+    """ Serves weather information over local HTTP API.
+    """
+
+    name = 'serve'
+
+    def get_parser(self):
+        parser = super().get_parser()
+        parser.add_argument('--host', default=config.SERVE_HOST,
+                            help='Address to listen on')
+        parser.add_argument('--port', type=int, default=config.SERVE_PORT,
+                            help='Port to listen on')
+        parser.add_argument('--socket', metavar='PATH',
+                            help='Unix socket to listen on instead of port')
+        return parser
+
+    def run(self, argv):
+        """ Runs command.
+        """
+
+        # http server isn't needed by other commands
+        from weatherapp.core.server import WeatherService, make_server
+
+        parsed_args = self.get_parser().parse_args(argv)
+        service = WeatherService(self.app,
+                                 config.CACHE_TIME * config.REFRESH_RATIO)
+        service.refresh()
+
+        server = make_server(service, parsed_args.host, parsed_args.port,
+                             parsed_args.socket)
+        service.start()
+        self.app.logger.info("Serving weather on %s",
+                             parsed_args.socket or
+                             f'{parsed_args.host}:{parsed_args.port}')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            service.stop()
+            server.server_close()
+            if parsed_args.socket:
+                os.unlink(parsed_args.socket)
@@ -0,0 +1,81 @@
+""" Compression of cached pages.
+
+Page is stored compressed and decompressed only on a cache hit. Body
+which server has sent gzip encoded is stored as is, without decompressing
+and compressing it again.
+"""
+
+import zlib
+import importlib.util
+
+
+def _gzip_decompress(data):
+    # accepts any bytes-like object unlike gzip.decompress
+    return zlib.decompress(data, 16 + zlib.MAX_WBITS)
+
+
+def _zstd_compress(data):
+    import zstandard
+    return zstandard.ZstdCompressor().compress(data)
+
+
+def _zstd_decompress(data):
+    import zstandard
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+# compress and decompress functions for every cache entry encoding
+CODECS = {
+    'zlib': (zlib.compress, zlib.decompress),
+    'gzip': (None, _gzip_decompress),
+    'zstd': (_zstd_compress, _zstd_decompress),
+}
+
+
+def get_methods():
+    """ Compression methods which may be used for new cache entries.
+
+    :rtype: list
+    """
+
+    methods = ['none', 'zlib']
+    if importlib.util.find_spec('zstandard') is not None:
+        methods.append('zstd')
+    return methods
+
+
+def compress(data, method, encoded=None, content_encoding=None):
+    """ Prepares page data for cache.
+
+    :param data: page data
+    :type data: bytes
+    :param method: compression method, 'none' to store page as is
+    :type method: str
+    :param encoded: response body as it was sent by the server
+    :type encoded: bytes
+    :param content_encoding: Content-Encoding of the response
+    :type content_encoding: str
+    :return: stored data and its encoding, None if data isn't compressed
+    :rtype: tuple
+    """
+
+    if method in (None, 'none'):
+        return data, None
+    if encoded is not None and content_encoding == 'gzip':
+        return encoded, 'gzip'
+    return CODECS[method][0](data), method
+
+
+def decompress(data, encoding):
+    """ Restores page data stored in cache.
+
+    :param data: stored data
+    :type data: bytes or memoryview
+    :param encoding: stored data encoding, None if it isn't compressed
+    :type encoding: str
+    :rtype: bytes or memoryview
+    """
+
+    if encoding is None:
+        return data
+    return CODECS[encoding][1](data)
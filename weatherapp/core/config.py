@@ -3,6 +3,9 @@ DEFAULT_VERBOSE_LEVEL = 0
 # Date and time, logging level name, logger object name, message
 DEFAULT_MESSAGE_FORMAT = '%(asctime)s %(levelname)s %(name)s %(message)s'
 
+# Weather information fields produced by providers
+WEATHER_FIELDS = ['cond', 'temp', 'feels_like', 'wind']
+
 # Fake user agent for weather sites requests
 FAKE_MOZILLA_AGENT = 'Mozilla/5.0 (X11; Ubuntu; Linux x86_64;)'
 
@@ -13,6 +16,45 @@ CONFIG_LOCATION = 'Location'
 # Cache settings
 CACHE_DIR = '.wappcache' # cache directory name
 CACHE_TIME = 300         # how long cache files are valid (in seconds)
+CACHE_BACKEND = 'sqlite'  # default cache backend name
+CACHE_FILE = 'cache.sqlite'  # cache database file name in cache directory
+CACHE_COMPRESSION = 'zlib'  # how cached pages are compressed, 'none' to disable
+CACHE_MAX_SIZE = 50 * 1024 * 1024  # maximum total size of cache (in bytes)
+CACHE_MAX_ENTRIES = 1000  # maximum number of cache entries
+CACHE_EVICT_TIME = 7 * 24 * 60 * 60  # how long unused entries are kept
+CACHE_ACCESS_RESOLUTION = 60  # how often entry access time is updated (in seconds)
+LOCK_DIR = 'locks'        # lock files subdirectory of cache directory
+HISTORY_DIR = 'history'   # observations history subdirectory of cache directory
+LOCATIONS_DIR = 'locations'  # location indexes subdirectory of cache directory
+STALE_MODES = ''          # when expired cache is used: revalidate, error
+MAX_STALE = 24 * 60 * 60  # how long expired cache may be used (in seconds)
+
+# Concurrency settings
+DEFAULT_JOBS = 4          # how many providers are run in parallel
+PROVIDER_TIMEOUT = 30     # how long to wait for a single provider (in seconds)
+DEFAULT_WORKERS = 0       # how many processes parse pages, 0 to parse in-process
+
+# HTTP transport settings
+CONNECT_TIMEOUT = 5       # how long to wait for connection (in seconds)
+READ_TIMEOUT = 15         # how long to wait for server response (in seconds)
+MAX_RETRIES = 3           # how many times failed request is repeated
+RETRY_BACKOFF = 0.5       # backoff factor for delays between retries
+RETRY_STATUSES = (500, 502, 503, 504)  # response statuses to retry
+POOL_SIZE = 10            # how many connections are kept open per host
+
+# Rate limit and schedule settings
+RATE_LIMIT = 1.0          # requests per second to the same host
+RATE_BURST = 5            # how many requests to the same host may be sent at once
+RATE_LIMITS_SECTION = 'rate_limits'  # configuration section of host rates
+SCHEDULE_JITTER = 10      # maximum random delay of scheduled refresh
+
+# Server settings
+SERVE_HOST = '127.0.0.1'  # address weather server listens on
+SERVE_PORT = 8421         # port weather server listens on
+REFRESH_RATIO = 0.8       # part of cache time after which data is refreshed
 
 # Entry points group for providers
-PROVIDER_EP_NAMESPACE = 'weatherapp.provider'
\ No newline at end of file
+PROVIDER_EP_NAMESPACE = 'weatherapp.provider'
+PROVIDER_INDEX_FILE = 'providers.json'  # index of discovered providers
+# HTML parser backends in order of preference, the first installed one is used
+HTML_PARSERS = ('selectolax', 'lxml', 'html.parser')
@@ -0,0 +1,207 @@
+""" Application configuration.
+"""
+
+import os
+import csv
+import tempfile
+import threading
+import collections
+import configparser
+
+from weatherapp.core.decorators import memoize
+
+
+Location = collections.namedtuple('Location', 'label name url')
+
+
+def read_locations(path):
+    """ Reads locations from CSV file.
+
+    File should have 'provider', 'name' and 'url' columns, optional
+    'label' column is used to distinguish locations in output and
+    history, location name is used if it is missing.
+
+    :param path: path to CSV file
+    :type path: str
+    :return: provider name and location pairs
+    :rtype: generator
+    """
+
+    with open(path, newline='') as locations_file:
+        for row in csv.DictReader(locations_file):
+            yield row['provider'], Location(row.get('label') or row['name'],
+                                            row['name'], row['url'])
+
+
+class Configuration:
+
+    """ Configuration shared by all providers and commands.
+
+    Configuration file is read once on first access and written back only
+    if something was changed. Every provider has its default location in
+    the section named after the provider, additional locations are kept
+    in sections named 'provider:label'::
+
+        [accu]
+        name = Kyiv
+        url = https://...
+
+        [accu:lviv]
+        name = Lviv
+        url = https://...
+
+    :param path: path to configuration file
+    :type path: pathlib.Path
+    """
+
+    LOCATION_SEPARATOR = ':'
+
+    def __init__(self, path):
+        self.path = path
+        self.changed = False
+        self._parser = None
+        self._lock = threading.RLock()
+        # cached per instance, so configurations don't share and keep
+        # each other's results alive
+        self.get_location = memoize(maxsize=256)(self._get_location)
+
+    def load(self):
+        """ Reads configuration file.
+
+        Configuration stays empty if file is broken.
+
+        :raises configparser.Error: if configuration file can't be parsed
+        """
+
+        with self._lock:
+            self.get_location.cache_clear()
+            self._parser = configparser.ConfigParser()
+            self.changed = False
+            if self.path.exists():
+                parser = configparser.ConfigParser()
+                parser.read(self.path)
+                self._parser = parser
+
+    @property
+    def parser(self):
+        with self._lock:
+            if self._parser is None:
+                self.load()
+            return self._parser
+
+    def get_section(self, name):
+        """ Returns section settings.
+
+        :param name: section name
+        :type name: str
+        :return: section settings or empty dict if there is no such section
+        :rtype: dict
+        """
+
+        with self._lock:
+            if name in self.parser:
+                return dict(self.parser[name])
+        return {}
+
+    def set(self, section, **settings):
+        """ Updates section settings, section is created if missing.
+        """
+
+        with self._lock:
+            if section not in self.parser:
+                self.parser[section] = {}
+            for key, value in settings.items():
+                if self.parser[section].get(key) != value:
+                    self.parser[section][key] = value
+                    self.changed = True
+            self.get_location.cache_clear()
+
+    def _get_location(self, provider, label=None):
+        """ Returns configured provider location.
+
+        Result is cached until configuration is changed or loaded again.
+
+        :param provider: provider name
+        :type provider: str
+        :param label: additional location label, default location if None
+        :type label: str
+        :return: location or None if location isn't configured
+        :rtype: Location
+        """
+
+        settings = self.get_section(self.get_location_section(provider,
+                                                              label))
+        if 'name' in settings and 'url' in settings:
+            return Location(label, settings['name'], settings['url'])
+        return None
+
+    def get_locations(self, provider):
+        """ Returns all configured provider locations, default one first.
+
+        :rtype: list
+        """
+
+        prefix = provider + self.LOCATION_SEPARATOR
+        labels = [None]
+        with self._lock:
+            labels.extend(section[len(prefix):]
+                          for section in self.parser.sections()
+                          if section.startswith(prefix))
+        locations = [self.get_location(provider, label) for label in labels]
+        return [location for location in locations if location is not None]
+
+    def get_location_section(self, provider, label=None):
+        """ Name of the section where provider location is stored.
+        """
+
+        if label is None:
+            return provider
+        return f'{provider}{self.LOCATION_SEPARATOR}{label}'
+
+    def set_location(self, provider, name, url, label=None):
+        """ Saves provider location.
+
+        :param provider: provider name
+        :type provider: str
+        :param name: city name
+        :type name: str
+        :param url: location url
+        :type url: str
+        :param label: additional location label, default location if None
+        :type label: str
+        """
+
+        self.set(self.get_location_section(provider, label),
+                 name=name, url=url)
+
+    def remove_location(self, provider, label):
+        """ Removes additional provider location.
+        """
+
+        with self._lock:
+            if self.parser.remove_section(
+                    self.get_location_section(provider, label)):
+                self.changed = True
+                self.get_location.cache_clear()
+
+    def save(self):
+        """ Writes configuration file if it was changed.
+
+        File is written to temporary file first and then renamed, so
+        configuration is never left partially written.
+        """
+
+        with self._lock:
+            if not self.changed:
+                return
+
+            directory = str(self.path.parent)
+            fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as temp_file:
+                    self.parser.write(temp_file)
+                os.replace(temp_path, str(self.path))
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+            self.changed = False
@@ -1,8 +1,11 @@
 """ Decorators.
 """
 
-import time
 import sys
+import time
+import functools
+import threading
+import collections
 
 
 def one_moment(func):
@@ -31,14 +34,16 @@ def slow_down(sec=1):
 
 
 def timer(func):
-    """ Prints the runtime of the decorated function.
+    """ Prints the runtime of the decorated function to stderr.
+
+    Output is written to stderr, so formatted weather output isn't broken.
     """
 
     def wrapper(*args, **kwargs):
         start_time = time.perf_counter()
         result = func(*args, **kwargs)
         run_time = time.perf_counter() - start_time
-        sys.stdout.write(f"Finished {func.__name__!r} in {run_time:.4f} secs\n")
+        sys.stderr.write(f"Finished {func.__name__!r} in {run_time:.4f} secs\n")
         return result
     return wrapper
 
@@ -65,27 +70,141 @@ def counted(func):
     return wrapper
 
 
+CacheInfo = collections.namedtuple('CacheInfo', 'hits misses maxsize currsize')
+CacheInfo.__doc__ = """ Statistics of memoized function cache.
+"""
+
+# separates positional and keyword arguments in cache keys
+_KWARGS_MARK = object()
+
+
+def _make_key(args, kwargs):
+    """ Hashable cache key, keyword arguments order doesn't matter.
+    """
+
+    if not kwargs:
+        return args
+    return args + (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+
+
+def memoize(maxsize=128, ttl=None):
+    """ Caches the result of the function, safe to use from many threads.
+
+    Least recently used results are evicted when cache has 'maxsize'
+    entries. Concurrent calls with the same arguments wait for the first
+    one instead of calling function again, exceptions are not cached.
+    Decorated function gets 'cache_info', 'invalidate' and 'cache_clear'
+    attributes.
+
+    :param maxsize: maximum number of cached results, unbounded if None
+    :type maxsize: int
+    :param ttl: how long result is valid (in seconds), forever if None
+    :type ttl: float
+    """
+
+    if callable(maxsize):
+        # used without arguments
+        return memoize()(maxsize)
+
+    def decorator(func):
+        cache = collections.OrderedDict()  # key: (result, expires_at)
+        in_flight = {}  # key: event set when result is ready
+        lock = threading.Lock()
+        stats = {'hits': 0, 'misses': 0}
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _make_key(args, kwargs)
+            while True:
+                with lock:
+                    if key in cache:
+                        result, expires_at = cache[key]
+                        if expires_at is None or \
+                                expires_at > time.monotonic():
+                            cache.move_to_end(key)
+                            stats['hits'] += 1
+                            return result
+                        del cache[key]
+                    event = in_flight.get(key)
+                    if event is None:
+                        event = in_flight[key] = threading.Event()
+                        stats['misses'] += 1
+                        break
+                # result is computed by another thread
+                event.wait()
+
+            try:
+                result = func(*args, **kwargs)
+                with lock:
+                    # result is dropped if key was invalidated meanwhile
+                    if in_flight.get(key) is event:
+                        expires_at = None
+                        if ttl is not None:
+                            expires_at = time.monotonic() + ttl
+                        cache[key] = (result, expires_at)
+                        if maxsize is not None and len(cache) > maxsize:
+                            cache.popitem(last=False)
+                return result
+            finally:
+                with lock:
+                    if in_flight.get(key) is event:
+                        del in_flight[key]
+                event.set()
+
+        def cache_info():
+            with lock:
+                return CacheInfo(stats['hits'], stats['misses'], maxsize,
+                                 len(cache))
+
+        def invalidate(*args, **kwargs):
+            """ Removes cached result of the call with given arguments.
+            """
+
+            key = _make_key(args, kwargs)
+            with lock:
+                cache.pop(key, None)
+                in_flight.pop(key, None)
+
+        def cache_clear():
+            """ Removes all cached results and statistics.
+            """
+
+            with lock:
+                cache.clear()
+                in_flight.clear()
+                stats.update(hits=0, misses=0)
+
+        wrapper.cache_info = cache_info
+        wrapper.invalidate = invalidate
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+
 def func_cache(func):
     """ Caches the result of the function.
+
+    Results are never evicted, see 'memoize' for bounded cache.
     """
 
-    cache = dict()
-    def wrapper(*args):
-        if args in cache:
-            return cache[args]
-        result = func(*args)
-        cache[args] = result
-        return result
-    return wrapper
+    return memoize(maxsize=None)(func)
 
 
 def singleton(cls):
     """ Singleton decorator for class.
+
+    Only one instance is created even if class is called from many
+    threads at once.
     """
 
     instances = {}
+    lock = threading.Lock()
+
+    @functools.wraps(cls)
     def wrapper(*args, **kwargs):
         if cls not in instances:
-          instances[cls] = cls(*args, **kwargs)
+            with lock:
+                if cls not in instances:
+                    instances[cls] = cls(*args, **kwargs)
         return instances[cls]
-    return wrapper
\ No newline at end of file
+    return wrapper
@@ -0,0 +1,104 @@
+""" Thread pool which doesn't keep the process alive.
+
+Workers of 'ThreadPoolExecutor' are joined when interpreter exits, so a
+provider hanging in a worker holds the process past the run deadline even
+if executor is shut down without waiting. Workers of 'DaemonExecutor' are
+daemon threads which are left behind at exit.
+"""
+
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class DaemonExecutor(ThreadPoolExecutor):
+
+    """ Thread pool of daemon workers.
+
+    It is a 'ThreadPoolExecutor', so it may be set as the default
+    executor of the event loop, but workers are managed by the pool
+    itself and are never joined at exit.
+
+    :param max_workers: how many functions may be run at once
+    :type max_workers: int
+    """
+
+    def __init__(self, max_workers):
+        super().__init__(max_workers=max_workers)
+        self._queue = queue.SimpleQueue()
+        self._workers = []
+        self._idle = 0
+        self._stopped = False
+        self._workers_lock = threading.Lock()
+
+    def submit(self, fn, /, *args, **kwargs):
+        future = Future()
+        with self._workers_lock:
+            if self._stopped:
+                raise RuntimeError("cannot schedule new futures after "
+                                   "shutdown")
+            self._queue.put((future, fn, args, kwargs))
+            if self._idle:
+                self._idle -= 1
+            elif len(self._workers) < self._max_workers:
+                worker = threading.Thread(target=self._work, daemon=True)
+                self._workers.append(worker)
+                worker.start()
+        return future
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            future, fn, args, kwargs = item
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException as error:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+            # drops references to the result while worker is idle
+            item = future = result = None
+            with self._workers_lock:
+                self._idle += 1
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        with self._workers_lock:
+            self._stopped = True
+            workers = list(self._workers)
+        if cancel_futures:
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    item[0].cancel()
+        for _ in workers:
+            self._queue.put(None)
+        if wait:
+            for worker in workers:
+                worker.join()
+
+
+class InlineExecutor(ThreadPoolExecutor):
+
+    """ Executor which runs functions at once in the calling thread.
+
+    cProfile profiles only the thread it is enabled in, so providers are
+    run this way when the run is profiled.
+    """
+
+    def __init__(self):
+        super().__init__(max_workers=1)
+
+    def submit(self, fn, /, *args, **kwargs):
+        future = Future()
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as error:
+            future.set_exception(error)
+        return future
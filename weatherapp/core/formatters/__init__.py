@@ -1 +1,4 @@
-from weatherapp.core.formatters.table import TableFormatter
\ No newline at end of file
+from weatherapp.core.formatters.table import TableFormatter
+from weatherapp.core.formatters.jsonlines import JSONLinesFormatter
+from weatherapp.core.formatters.csv import CSVFormatter
+from weatherapp.core.formatters.plain import PlainFormatter
@@ -0,0 +1,39 @@
+import csv
+
+from weatherapp.core import config
+from weatherapp.core.abstract import Formatter
+
+
+class CSVFormatter(Formatter):
+
+    """ CSV formatter, one row per provider.
+
+    Header is written before the first row.
+    """
+
+    def __init__(self):
+        self.writer = None
+
+    def emit(self, column_names, data, stdout):
+        """ Writes provider title, location and data as CSV row.
+
+        :param column_names: provider title and location
+        :type column_names: list
+        :param data: weather information
+        :type data: dict
+        :param stdout: output stream where data should be written
+        :type stdout: sys.stdout or file like object
+        """
+
+        if self.writer is None:
+            fieldnames = ['provider', 'location'] + config.WEATHER_FIELDS
+            self.writer = csv.DictWriter(stdout, fieldnames,
+                                         extrasaction='ignore',
+                                         lineterminator='\n')
+            self.writer.writeheader()
+
+        title, location = column_names
+        row = {'provider': title, 'location': location}
+        row.update(data)
+        self.writer.writerow(row)
+        stdout.flush()
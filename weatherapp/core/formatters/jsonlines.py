@@ -0,0 +1,27 @@
+import json
+
+from weatherapp.core.abstract import Formatter
+
+
+class JSONLinesFormatter(Formatter):
+
+    """ JSON Lines formatter, one JSON object per provider.
+    """
+
+    def emit(self, column_names, data, stdout):
+        """ Writes provider title, location and data as JSON object.
+
+        :param column_names: provider title and location
+        :type column_names: list
+        :param data: weather information
+        :type data: dict
+        :param stdout: output stream where data should be written
+        :type stdout: sys.stdout or file like object
+        """
+
+        title, location = column_names
+        record = {'provider': title, 'location': location}
+        record.update(data)
+        stdout.write(json.dumps(record, ensure_ascii=False))
+        stdout.write('\n')
+        stdout.flush()
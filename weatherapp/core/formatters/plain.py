@@ -0,0 +1,24 @@
+from weatherapp.core.abstract import Formatter
+
+
+class PlainFormatter(Formatter):
+
+    """ Compact plain text formatter, one line per provider.
+    """
+
+    def emit(self, column_names, data, stdout):
+        """ Writes provider title, location and data in a single line.
+
+        :param column_names: provider title and location
+        :type column_names: list
+        :param data: weather information
+        :type data: dict
+        :param stdout: output stream where data should be written
+        :type stdout: sys.stdout or file like object
+        """
+
+        title, location = column_names
+        values = ', '.join(f'{key}: {value}' for key, value in data.items()
+                           if value)
+        stdout.write(f'{title} ({location}): {values}\n')
+        stdout.flush()
@@ -1,5 +1,3 @@
-import prettytable
-
 from weatherapp.core.abstract import Formatter
 
 
@@ -8,7 +6,7 @@ class TableFormatter(Formatter):
     """ Table formatter for app output.
     """
 
-    def emit(self, column_names, data):
+    def emit(self, column_names, data, stdout):
         """ Formats and prints data from the iterable source.
         
         :param column_names: names of the columns
@@ -16,8 +14,12 @@ class TableFormatter(Formatter):
         :param data: iterable data source, one tuple per object
                      with values in order of column names
         :type data: list or tuple
+        :param stdout: output stream where data should be written
+        :type stdout: sys.stdout or file like object
         """
 
+        import prettytable  # imported only when output is produced
+
         pt = prettytable.PrettyTable()
 
         for column, values, in zip(column_names, (data.keys(), data.values())):
@@ -26,4 +28,5 @@ class TableFormatter(Formatter):
 
         pt.align = 'l'
         pt.padding_width = 1
-        return pt.get_string()
\ No newline at end of file
+        stdout.write(pt.get_string())
+        stdout.write('\n')
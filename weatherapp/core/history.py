@@ -0,0 +1,266 @@
+""" Append-only local history of weather observations.
+
+Every (provider, location) series is a file of fixed size records sorted
+by time: timestamp, temperature and feels like temperature in °C, wind
+speed in m/s and condition code. Files are memory-mapped for reading,
+so time range is found by binary search over timestamps without reading
+the whole series. Condition strings are kept once in a shared list.
+"""
+
+import os
+import mmap
+import json
+import math
+import struct
+import hashlib
+import tempfile
+import threading
+import collections
+
+from weatherapp.core import config
+from weatherapp.core.locks import KeyLock
+
+
+# timestamp, temp, feels_like, wind, condition code
+RECORD = struct.Struct('<dfffI')
+
+HistoryRecord = collections.namedtuple(
+    'HistoryRecord', 'time cond temp feels_like wind')
+HistoryRecord.__doc__ = """ Stored observation.
+
+:param time: unix timestamp of the observation
+:type time: float
+:param temp: temperature in °C, nan if unknown
+:param feels_like: feels like temperature in °C, nan if unknown
+:param wind: wind speed in m/s, nan if unknown
+"""
+
+Series = collections.namedtuple('Series', 'provider location file')
+
+
+class HistoryStore:
+
+    """ Observations history in given directory.
+
+    :param directory: where series files are stored
+    :type directory: pathlib.Path
+    :param min_interval: same observation isn't stored again within this
+                         interval (in seconds), so runs served from cache
+                         don't repeat records
+    :type min_interval: float
+    """
+
+    INDEX_FILE = 'index.json'
+    CONDITIONS_FILE = 'conditions.json'
+    SERIES_SUFFIX = '.bin'
+
+    def __init__(self, directory, min_interval=config.CACHE_TIME):
+        self.directory = directory
+        self.min_interval = min_interval
+        self.lock = KeyLock(directory / config.LOCK_DIR)
+        self._index = None
+        self._conditions = None
+        self._codes = {}
+        self._thread_lock = threading.RLock()
+
+    @staticmethod
+    def get_series_key(provider, location):
+        return f'{provider}|{location}'
+
+    def _read_json(self, name, default):
+        try:
+            with (self.directory / name).open('r') as json_file:
+                return json.load(json_file)
+        except (OSError, ValueError):
+            return default
+
+    def _write_json(self, name, data):
+        """ Atomically replaces json file.
+        """
+
+        fd, temp_path = tempfile.mkstemp(dir=str(self.directory),
+                                         suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as temp_file:
+                json.dump(data, temp_file, ensure_ascii=False)
+            os.replace(temp_path, str(self.directory / name))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def _load(self, force=False):
+        with self._thread_lock:
+            if self._index is None or force:
+                self._index = self._read_json(self.INDEX_FILE, {})
+                self._conditions = self._read_json(self.CONDITIONS_FILE, [])
+                self._codes = {cond: code for code, cond
+                               in enumerate(self._conditions)}
+
+    def series(self):
+        """ All stored series.
+
+        :rtype: list of Series
+        """
+
+        self._load()
+        return [Series(*item) for item in self._index.values()]
+
+    def _get_series_path(self, provider, location, create=False):
+        key = self.get_series_key(provider, location)
+        self._load()
+        if key not in self._index:
+            # series might be added by another process
+            self._load(force=True)
+        if key not in self._index:
+            if not create:
+                return None
+            self._update_index(key, provider, location)
+        return self.directory / self._index[key][2]
+
+    def _update_index(self, key, provider, location):
+        """ Registers new series, index may be updated by other process.
+        """
+
+        # file lock is always taken before the thread lock
+        with self.lock(self.INDEX_FILE), self._thread_lock:
+            self._load(force=True)
+            if key not in self._index:
+                name = hashlib.md5(key.encode('utf-8')).hexdigest()
+                self._index[key] = [provider, location,
+                                    name + self.SERIES_SUFFIX]
+                self._write_json(self.INDEX_FILE, self._index)
+
+    def _get_code(self, cond):
+        self._load()
+        with self._thread_lock:
+            if cond in self._codes:
+                return self._codes[cond]
+
+        with self.lock(self.CONDITIONS_FILE), self._thread_lock:
+            self._load(force=True)
+            if cond not in self._codes:
+                self._codes[cond] = len(self._conditions)
+                self._conditions.append(cond)
+                self._write_json(self.CONDITIONS_FILE, self._conditions)
+            return self._codes[cond]
+
+    def _get_condition(self, code):
+        if code >= len(self._conditions):
+            self._load(force=True)
+        return self._conditions[code]
+
+    def append(self, observation, timestamp):
+        """ Stores observation unless the same one was just stored.
+
+        :param observation: provider observation
+        :type observation: observation.Observation
+        :param timestamp: unix time of the observation
+        :type timestamp: float
+        :return: whether observation was stored
+        :rtype: bool
+        """
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._get_series_path(observation.provider,
+                                     observation.location, create=True)
+        record = HistoryRecord(timestamp, observation.cond,
+                               observation.temp_celsius,
+                               observation.feels_like_celsius,
+                               observation.wind_ms)
+        data = RECORD.pack(record.time, *record[2:],
+                           self._get_code(record.cond))
+        key = self.get_series_key(observation.provider, observation.location)
+        with self.lock(key):
+            last = self.latest(observation.provider, observation.location, 1)
+            if last and self._is_repeated(last[0], record):
+                return False
+            # records must stay sorted by time
+            if last and last[0].time > timestamp:
+                return False
+            with path.open('ab') as series_file:
+                # record cut short by crash or full disk would misalign
+                # every record appended after it
+                size = series_file.seek(0, os.SEEK_END)
+                if size % RECORD.size:
+                    series_file.truncate(size - size % RECORD.size)
+                series_file.write(data)
+        return True
+
+    def _is_repeated(self, last, record):
+        if record.time - last.time >= self.min_interval:
+            return False
+        # values are compared as they are stored, in single precision
+        packed = RECORD.unpack(RECORD.pack(0, *record[2:], 0))
+        return last.cond == record.cond and all(
+            a == b or (math.isnan(a) and math.isnan(b))
+            for a, b in zip(last[2:], packed[1:4]))
+
+    def _map(self, provider, location):
+        """ Read-only view of series file, None if there is no series.
+        """
+
+        path = self._get_series_path(provider, location)
+        if path is None:
+            return None
+        try:
+            with path.open('rb') as series_file:
+                size = os.fstat(series_file.fileno()).st_size
+                if size < RECORD.size:
+                    return None
+                return mmap.mmap(series_file.fileno(), 0,
+                                 access=mmap.ACCESS_READ)
+        except OSError:
+            return None
+
+    def _unpack(self, data, position):
+        timestamp, temp, feels_like, wind, code = RECORD.unpack_from(
+            data, position * RECORD.size)
+        return HistoryRecord(timestamp, self._get_condition(code),
+                             temp, feels_like, wind)
+
+    def _bisect(self, data, count, timestamp):
+        """ Position of the first record not older than timestamp.
+        """
+
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            if RECORD.unpack_from(data, middle * RECORD.size)[0] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def range(self, provider, location, start=None, end=None):
+        """ Observations stored within time range.
+
+        :param start: unix time of the range start, included
+        :type start: float
+        :param end: unix time of the range end, excluded
+        :type end: float
+        :rtype: list of HistoryRecord
+        """
+
+        data = self._map(provider, location)
+        if data is None:
+            return []
+        with data:
+            count = len(data) // RECORD.size
+            first = 0 if start is None else self._bisect(data, count, start)
+            last = count if end is None else self._bisect(data, count, end)
+            return [self._unpack(data, position)
+                    for position in range(first, last)]
+
+    def latest(self, provider, location, count=1):
+        """ The latest stored observations, oldest first.
+
+        :rtype: list of HistoryRecord
+        """
+
+        data = self._map(provider, location)
+        if data is None:
+            return []
+        with data:
+            total = len(data) // RECORD.size
+            return [self._unpack(data, position)
+                    for position in range(max(total - count, 0), total)]
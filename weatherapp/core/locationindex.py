@@ -0,0 +1,224 @@
+""" Local index of provider locations.
+
+Provider sites list locations as a tree of pages, e.g. countries, regions
+of a country and cities of a region. The index keeps all cities in a list
+sorted by name, so they are found by name prefix with binary search and
+by similar names with difflib, without network round-trips. Pages the
+index was built from are kept with their digests, so refresh parses only
+the pages which were changed.
+"""
+
+import os
+import json
+import time
+import bisect
+import difflib
+import collections
+from concurrent.futures import ThreadPoolExecutor
+
+from weatherapp.core import parsing
+
+
+# should be increased when index file layout is changed
+INDEX_FORMAT = 1
+PATH_SEPARATOR = ' / '
+
+IndexedLocation = collections.namedtuple('IndexedLocation', 'name path url')
+IndexedLocation.__doc__ = """ Location found in the index.
+
+:param name: city name
+:type name: str
+:param path: names of the pages location is listed on, e.g. country and
+             region, separated by ' / '
+:type path: str
+:param url: location url
+:type url: str
+"""
+
+
+def normalize(name):
+    """ Search key of location name.
+    """
+
+    return ' '.join(name.casefold().split())
+
+
+class LocationIndex:
+
+    """ Provider locations sorted by name.
+
+    :param locations: indexed locations
+    :type locations: list of IndexedLocation
+    :param pages: parsed locations of every page with page digest,
+                  {url: {'digest': str, 'locations': [[name, url, leaf]]}}
+    :type pages: dict
+    :param version: provider 'location_index_version' index was built with
+    :type version: int
+    :param presorted: whether locations are already sorted, e.g. read
+                      from index file
+    :type presorted: bool
+    """
+
+    def __init__(self, locations, pages=None, version=None, built_at=None,
+                 presorted=False):
+        if presorted:
+            self.locations = list(locations)
+            self.keys = [normalize(location.name)
+                         for location in self.locations]
+        else:
+            items = sorted((normalize(location.name), location)
+                           for location in locations)
+            self.keys = [key for key, location in items]
+            self.locations = [location for key, location in items]
+        self.pages = pages or {}
+        self.version = version
+        self.built_at = built_at
+        self._names = None
+
+    def __len__(self):
+        return len(self.locations)
+
+    def prefix(self, text, limit=None):
+        """ Locations which names start with text.
+
+        :rtype: list of IndexedLocation
+        """
+
+        key = normalize(text)
+        start = position = bisect.bisect_left(self.keys, key)
+        while position < len(self.keys) and \
+                self.keys[position].startswith(key):
+            if limit is not None and position - start >= limit:
+                break
+            position += 1
+        return self.locations[start:position]
+
+    def fuzzy(self, text, limit=10, cutoff=0.6):
+        """ Locations with names similar to text, the most similar first.
+
+        :rtype: list of IndexedLocation
+        """
+
+        if self._names is None:
+            # the same name may be listed in different regions
+            self._names = list(dict.fromkeys(self.keys))
+        result = []
+        for name in difflib.get_close_matches(normalize(text), self._names,
+                                              limit, cutoff):
+            start = bisect.bisect_left(self.keys, name)
+            end = bisect.bisect_right(self.keys, name)
+            result.extend(self.locations[start:end])
+        return result[:limit]
+
+    def search(self, text, limit=10):
+        """ Locations found by name prefix, similar names if not enough.
+
+        :rtype: list of IndexedLocation
+        """
+
+        result = self.prefix(text, limit)
+        if len(result) < limit:
+            found = set(result)
+            result.extend(location for location
+                          in self.fuzzy(text, limit - len(result))
+                          if location not in found)
+        return result
+
+    @classmethod
+    def load(cls, path):
+        """ Reads index file, None if it is missing or has other format.
+
+        :type path: pathlib.Path
+        :rtype: LocationIndex
+        """
+
+        try:
+            with path.open('r', encoding='utf-8') as index_file:
+                data = json.load(index_file)
+        except (OSError, ValueError):
+            return None
+        if data.get('format') != INDEX_FORMAT:
+            return None
+        # locations are written sorted
+        return cls(map(IndexedLocation._make, data['locations']),
+                   data['pages'], data['version'], data['built_at'],
+                   presorted=True)
+
+    def dump(self, path):
+        """ Atomically writes index file.
+
+        :type path: pathlib.Path
+        """
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix('.tmp')
+        with temp_path.open('w', encoding='utf-8') as index_file:
+            json.dump({'format': INDEX_FORMAT, 'version': self.version,
+                       'built_at': self.built_at, 'pages': self.pages,
+                       'locations': self.locations},
+                      index_file, ensure_ascii=False)
+        os.replace(str(temp_path), str(path))
+
+
+def read_locations_page(provider, url, previous):
+    """ Locations listed on the page, parsed again only if page changed.
+
+    :param previous: page from the previous index build
+    :type previous: dict
+    :return: page digest and locations
+    :rtype: dict
+    """
+
+    page = provider.get_page(url)
+    digest = page.info.get('digest')
+    if previous is not None and digest is not None and \
+            previous['digest'] == digest:
+        return previous
+    content = parsing.decode(page.data, page.info.get('charset'))
+    return {'digest': digest,
+            'locations': [list(location) for location
+                          in provider.get_locations(content)]}
+
+
+def build_index(provider, previous=None, jobs=1):
+    """ Walks provider locations pages and indexes all found locations.
+
+    Pages are fetched through the page cache, so pages which are still
+    valid aren't fetched again and expired ones are revalidated. Page is
+    parsed only if it was changed since the previous index was built.
+
+    :param provider: provider which supports location index
+    :type provider: abstract.WeatherProvider
+    :param previous: index to be refreshed
+    :type previous: LocationIndex
+    :param jobs: how many pages are fetched in parallel
+    :type jobs: int
+    :rtype: LocationIndex
+    """
+
+    version = provider.location_index_version
+    previous_pages = {}
+    if previous is not None and previous.version == version:
+        previous_pages = previous.pages
+
+    pages = {}
+    locations = []
+    level = [(provider.get_locations_url(), ())]
+    with ThreadPoolExecutor(max_workers=max(jobs, 1)) as executor:
+        while level:
+            results = executor.map(
+                lambda item: read_locations_page(
+                    provider, item[0], previous_pages.get(item[0])),
+                level)
+            next_level = []
+            for (url, path), page in zip(level, results):
+                pages[url] = page
+                for name, location_url, leaf in page['locations']:
+                    if leaf:
+                        locations.append(IndexedLocation(
+                            name, PATH_SEPARATOR.join(path), location_url))
+                    elif location_url not in pages:
+                        next_level.append((location_url, path + (name,)))
+            # the same page may be listed twice on a level
+            level = list(dict(next_level).items())
+    return LocationIndex(locations, pages, version, time.time())
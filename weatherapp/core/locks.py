@@ -0,0 +1,65 @@
+""" Locks shared between threads and processes.
+"""
+
+import hashlib
+import threading
+import contextlib
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+
+class KeyLock:
+
+    """ Exclusive lock by key for threads and processes.
+
+    Keys are spread between fixed number of stripes, every stripe is
+    guarded by a thread lock and by a lock file in given directory, so
+    the number of lock files stays bounded. Inter-process locking is
+    available only on platforms with 'fcntl'.
+
+    :param directory: directory for lock files
+    :type directory: pathlib.Path
+    :param stripes: number of independent locks
+    :type stripes: int
+    """
+
+    def __init__(self, directory, stripes=64):
+        self.directory = directory
+        self.stripes = stripes
+        self._thread_locks = [threading.Lock() for _ in range(stripes)]
+
+    def get_stripe(self, key):
+        """ Stripe number for given key.
+        """
+
+        digest = hashlib.md5(key.encode('utf-8')).hexdigest()
+        return int(digest[:8], 16) % self.stripes
+
+    @contextlib.contextmanager
+    def _file_lock(self, stripe):
+        if fcntl is None:
+            yield
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with (self.directory / f'{stripe}.lock').open('a+b') as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    @contextlib.contextmanager
+    def __call__(self, key):
+        """ Acquires lock for given key.
+
+        :param key: locked key
+        :type key: str
+        """
+
+        stripe = self.get_stripe(key)
+        with self._thread_locks[stripe], self._file_lock(stripe):
+            yield
@@ -0,0 +1,111 @@
+""" Run metrics: per provider phase timings and cache counters.
+"""
+
+import time
+import threading
+import contextlib
+import collections
+
+
+# phases in the order they happen during provider run
+PHASES = ('config', 'cache', 'network', 'decode', 'parse', 'format')
+
+# cache counters
+COUNTERS = ('hit', 'miss', 'stale', 'not_modified', 'parsed_hit')
+
+
+class Metrics:
+
+    """ Thread safe collector of provider phase timings and counters.
+
+    Timings of the same provider and phase are summed up, so provider
+    run for several locations is reported once.
+    """
+
+    def __init__(self):
+        self._timings = collections.defaultdict(float)
+        self._calls = collections.Counter()
+        self._counters = collections.Counter()
+        self._lock = threading.Lock()
+
+    def add_timing(self, provider, phase, seconds):
+        """ Adds time spent by provider in the phase.
+        """
+
+        with self._lock:
+            self._timings[provider, phase] += seconds
+            self._calls[provider, phase] += 1
+
+    @contextlib.contextmanager
+    def timer(self, provider, phase):
+        """ Measures time spent in the block.
+
+        :param provider: provider name
+        :type provider: str
+        :param phase: phase name, see PHASES
+        :type phase: str
+        """
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_timing(provider, phase, time.perf_counter() - start)
+
+    def incr(self, provider, counter, value=1):
+        """ Increments provider counter.
+
+        :param counter: counter name, see COUNTERS
+        :type counter: str
+        """
+
+        with self._lock:
+            self._counters[provider, counter] += value
+
+    def as_dict(self):
+        """ Collected metrics grouped by provider.
+
+        :return: {provider: {'timings': {phase: {'seconds', 'calls'}},
+                             'counters': {counter: value}}}
+        :rtype: dict
+        """
+
+        result = {}
+        with self._lock:
+            for (provider, phase), seconds in self._timings.items():
+                timings = result.setdefault(
+                    provider, {'timings': {}, 'counters': {}})['timings']
+                timings[phase] = {'seconds': seconds,
+                                  'calls': self._calls[provider, phase]}
+            for (provider, counter), value in self._counters.items():
+                result.setdefault(
+                    provider, {'timings': {}, 'counters': {}}
+                )['counters'][counter] = value
+        return result
+
+    def summary(self):
+        """ Human readable table of collected metrics.
+
+        :rtype: str
+        """
+
+        metrics = self.as_dict()
+        phases = [phase for phase in PHASES
+                  if any(phase in item['timings']
+                         for item in metrics.values())]
+        width = max([len('provider')] + [len(name) for name in metrics])
+        lines = [' '.join(['provider'.ljust(width)] +
+                          [f'{phase:>9}' for phase in phases] +
+                          ['  counters'])]
+        for provider in sorted(metrics):
+            timings = metrics[provider]['timings']
+            counters = metrics[provider]['counters']
+            cells = [provider.ljust(width)]
+            for phase in phases:
+                seconds = timings.get(phase, {}).get('seconds', 0)
+                cells.append(f'{seconds * 1000:7.1f}ms')
+            cells.append('  ' + ', '.join(f'{name}={counters[name]}'
+                                          for name in COUNTERS
+                                          if name in counters))
+            lines.append(' '.join(cells))
+        return '\n'.join(lines) + '\n'
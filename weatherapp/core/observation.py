@@ -0,0 +1,352 @@
+""" Typed weather observations and their batch aggregation.
+
+Providers produce weather information as strings, e.g. '+5°C' or
+'SW 14 km/h'. Observation keeps parsed numeric values with units, batch
+keeps many observations in columns, so aggregates across providers and
+locations are computed in one pass over the columns.
+"""
+
+import re
+import math
+import array
+import collections
+
+from weatherapp.core import config
+
+
+TEMPERATURE_RE = re.compile(
+    r'(?P<value>[-+−]?\d+(?:[.,]\d+)?)\s*°?\s*(?P<unit>[CF])?(?![a-zA-Z])')
+WIND_RE = re.compile(
+    r'(?P<value>\d+(?:[.,]\d+)?)\s*(?P<unit>km/h|m/s|mph|kmh|м/с|км/ч)?',
+    re.IGNORECASE)
+WIND_DIRECTION_RE = re.compile(r'\b(?P<direction>[NSEW]{1,3})\b')
+
+# factors to convert wind speed to m/s
+WIND_UNITS = {'m/s': 1.0, 'м/с': 1.0, 'km/h': 1 / 3.6, 'kmh': 1 / 3.6,
+              'км/ч': 1 / 3.6, 'mph': 0.44704}
+
+
+def parse_temperature(value):
+    """ Parses temperature string.
+
+    :param value: temperature, e.g. '+5°C', '-3°' or 'RealFeel® 41°F'
+    :type value: str
+    :return: value and unit, unit is None if it isn't specified, value is
+             nan if it can't be parsed
+    :rtype: tuple
+    """
+
+    match = TEMPERATURE_RE.search(value or '')
+    if match is None:
+        return math.nan, None
+    number = match.group('value').replace('−', '-').replace(',', '.')
+    return float(number), match.group('unit')
+
+
+def parse_wind(value):
+    """ Parses wind string.
+
+    :param value: wind, e.g. 'SW 14 km/h' or '3 m/s'
+    :type value: str
+    :return: speed, unit ('m/s' if not specified) and direction, speed is
+             nan if value can't be parsed
+    :rtype: tuple
+    """
+
+    value = value or ''
+    direction = WIND_DIRECTION_RE.search(value)
+    direction = direction.group('direction') if direction else None
+    match = WIND_RE.search(value)
+    if match is None:
+        return math.nan, None, direction
+    speed = float(match.group('value').replace(',', '.'))
+    return speed, (match.group('unit') or 'm/s').lower(), direction
+
+
+def to_celsius(value, unit):
+    if unit == 'F':
+        return (value - 32) * 5 / 9
+    return value
+
+
+def from_celsius(value, unit):
+    if unit == 'F':
+        return value * 9 / 5 + 32
+    return value
+
+
+class Observation:
+
+    """ Weather observation of a provider for a location.
+
+    :param temp: temperature
+    :type temp: float
+    :param temp_unit: 'C' or 'F'
+    :type temp_unit: str
+    :param wind: wind speed
+    :type wind: float
+    :param wind_unit: 'm/s', 'km/h' or 'mph'
+    :type wind_unit: str
+    """
+
+    __slots__ = ('provider', 'location', 'cond', 'temp', 'feels_like',
+                 'temp_unit', 'wind', 'wind_unit', 'wind_direction')
+
+    def __init__(self, provider, location, cond='', temp=math.nan,
+                 feels_like=math.nan, temp_unit='C', wind=math.nan,
+                 wind_unit='m/s', wind_direction=None):
+        self.provider = provider
+        self.location = location
+        self.cond = cond
+        self.temp = temp
+        self.feels_like = feels_like
+        self.temp_unit = temp_unit
+        self.wind = wind
+        self.wind_unit = wind_unit
+        self.wind_direction = wind_direction
+
+    @classmethod
+    def from_weather_info(cls, provider, location, weather_info):
+        """ Creates observation from 'get_weather_info' result.
+
+        :param weather_info: weather information strings
+        :type weather_info: dict
+        :rtype: Observation
+        """
+
+        temp, temp_unit = parse_temperature(weather_info.get('temp'))
+        feels_like, feels_like_unit = parse_temperature(
+            weather_info.get('feels_like'))
+        # unit is usually given only once, e.g. '+5°C' and 'RealFeel +3°'
+        temp_unit = temp_unit or feels_like_unit or 'C'
+        if feels_like_unit is not None and feels_like_unit != temp_unit:
+            feels_like = from_celsius(
+                to_celsius(feels_like, feels_like_unit), temp_unit)
+        wind, wind_unit, direction = parse_wind(weather_info.get('wind'))
+        return cls(provider, location, weather_info.get('cond', ''),
+                   temp, feels_like, temp_unit, wind, wind_unit or 'm/s',
+                   direction)
+
+    @property
+    def temp_celsius(self):
+        return to_celsius(self.temp, self.temp_unit)
+
+    @property
+    def feels_like_celsius(self):
+        return to_celsius(self.feels_like, self.temp_unit)
+
+    @property
+    def wind_ms(self):
+        """ Wind speed in m/s.
+        """
+
+        return self.wind * WIND_UNITS.get(self.wind_unit, 1.0)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return (f'Observation({self.provider!r}, {self.location!r}, '
+                f'{self.cond!r}, {self.temp}{self.temp_unit}, '
+                f'wind {self.wind} {self.wind_unit})')
+
+
+def get_numpy():
+    """ NumPy module or None if it isn't installed.
+    """
+
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class ObservationBatch:
+
+    """ Columnar container of many observations.
+
+    Numeric values are normalized to °C and m/s and kept in 'array'
+    columns, missing values are nan. Provider, location and condition
+    are kept as integer codes, so aggregation is done over the columns
+    only, without per row Python objects.
+    """
+
+    NUMERIC = ('temp', 'feels_like', 'wind')
+    LABELS = ('provider', 'location', 'cond')
+
+    def __init__(self):
+        self.columns = {name: array.array('d') for name in self.NUMERIC}
+        self.codes = {name: array.array('q') for name in self.LABELS}
+        # label value for every code, e.g. self.labels['location'][code]
+        self.labels = {name: [] for name in self.LABELS}
+        self._index = {name: {} for name in self.LABELS}
+
+    def __len__(self):
+        return len(self.codes['provider'])
+
+    def _add_label(self, name, value):
+        index = self._index[name]
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(self.labels[name])
+            self.labels[name].append(value)
+        self.codes[name].append(code)
+
+    def append(self, observation):
+        """ Adds observation to the batch.
+
+        :type observation: Observation
+        """
+
+        self._add_label('provider', observation.provider)
+        self._add_label('location', observation.location)
+        self._add_label('cond', observation.cond)
+        self.columns['temp'].append(observation.temp_celsius)
+        self.columns['feels_like'].append(observation.feels_like_celsius)
+        self.columns['wind'].append(observation.wind_ms)
+
+    def add(self, provider, location, weather_info):
+        """ Adds provider weather information strings to the batch.
+        """
+
+        self.append(Observation.from_weather_info(provider, location,
+                                                  weather_info))
+
+    def aggregate(self, by='location', use_numpy=None):
+        """ Computes min, max, mean and consensus condition per group.
+
+        :param by: 'location' or 'provider'
+        :type by: str
+        :param use_numpy: whether NumPy is used, if it is available by
+                          default
+        :type use_numpy: bool
+        :return: {group: {'count': n, 'cond': most common condition,
+                          'temp': {'min', 'max', 'mean'}, ...}}
+                 numeric stats are nan if group has no values
+        :rtype: dict
+        """
+
+        groups = self.labels[by]
+        if not groups:
+            # NumPy can't find consensus of an empty condition matrix
+            return {}
+        numpy = get_numpy() if use_numpy is not False else None
+        if numpy is not None:
+            stats = self._aggregate_numpy(numpy, self.codes[by], len(groups))
+        else:
+            stats = self._aggregate_python(self.codes[by], len(groups))
+
+        conds = self.labels['cond']
+        result = {}
+        for index, group in enumerate(groups):
+            cond = stats['cond'][index]
+            item = result[group] = {
+                'count': stats['count'][index],
+                'cond': conds[cond] if cond >= 0 else ''}
+            for name in self.NUMERIC:
+                item[name] = {stat: stats[name][stat][index]
+                              for stat in ('min', 'max', 'mean')}
+        return result
+
+    def _get_empty_cond(self):
+        """ Code of empty condition, -1 if there is no such condition.
+        """
+
+        return self._index['cond'].get('', -1)
+
+    def _aggregate_numpy(self, numpy, codes, size):
+        codes = numpy.frombuffer(codes, dtype=numpy.int64)
+        stats = {'count': numpy.bincount(codes, minlength=size).tolist()}
+        for name in self.NUMERIC:
+            values = numpy.frombuffer(self.columns[name], dtype=numpy.float64)
+            valid = ~numpy.isnan(values)
+            values, value_codes = values[valid], codes[valid]
+            counts = numpy.bincount(value_codes, minlength=size)
+            sums = numpy.bincount(value_codes, weights=values, minlength=size)
+            mins = numpy.full(size, numpy.inf)
+            maxs = numpy.full(size, -numpy.inf)
+            numpy.minimum.at(mins, value_codes, values)
+            numpy.maximum.at(maxs, value_codes, values)
+            empty = counts == 0
+            with numpy.errstate(invalid='ignore', divide='ignore'):
+                means = sums / counts
+            mins[empty] = maxs[empty] = means[empty] = numpy.nan
+            stats[name] = {'min': mins.tolist(), 'max': maxs.tolist(),
+                           'mean': means.tolist()}
+
+        # condition counts of every group in a (groups, conditions) matrix
+        conds = len(self.labels['cond'])
+        cond_codes = numpy.frombuffer(self.codes['cond'], dtype=numpy.int64)
+        matrix = numpy.bincount(codes * conds + cond_codes,
+                                minlength=size * conds).reshape(size, conds)
+        empty_cond = self._get_empty_cond()
+        if empty_cond >= 0:
+            matrix[:, empty_cond] = 0
+        consensus = matrix.argmax(axis=1)
+        consensus[matrix.max(axis=1) == 0] = -1
+        stats['cond'] = consensus.tolist()
+        return stats
+
+    def _aggregate_python(self, codes, size):
+        stats = {'count': [0] * size}
+        for code in codes:
+            stats['count'][code] += 1
+        for name in self.NUMERIC:
+            counts = [0] * size
+            sums = [0.0] * size
+            mins = [math.inf] * size
+            maxs = [-math.inf] * size
+            for code, value in zip(codes, self.columns[name]):
+                if value != value:  # nan
+                    continue
+                counts[code] += 1
+                sums[code] += value
+                if value < mins[code]:
+                    mins[code] = value
+                if value > maxs[code]:
+                    maxs[code] = value
+            stats[name] = {
+                'min': [mins[i] if counts[i] else math.nan
+                        for i in range(size)],
+                'max': [maxs[i] if counts[i] else math.nan
+                        for i in range(size)],
+                'mean': [sums[i] / counts[i] if counts[i] else math.nan
+                         for i in range(size)]}
+
+        cond_counts = [collections.Counter() for _ in range(size)]
+        empty_cond = self._get_empty_cond()
+        for code, cond in zip(codes, self.codes['cond']):
+            if cond != empty_cond:
+                cond_counts[code][cond] += 1
+        # ties are resolved by the first seen condition, as argmax does
+        stats['cond'] = [min(counter, key=lambda cond: (-counter[cond], cond))
+                         if counter else -1 for counter in cond_counts]
+        return stats
+
+
+def format_summary(stats):
+    """ Formats group aggregates as weather information strings.
+
+    :param stats: aggregates of a single group, see 'aggregate'
+    :type stats: dict
+    :return: weather information with config.WEATHER_FIELDS keys
+    :rtype: dict
+    """
+
+    def temperature(values):
+        if math.isnan(values['mean']):
+            return ''
+        return (f"{values['mean']:+.0f}°C ({values['min']:+.0f}.."
+                f"{values['max']:+.0f})")
+
+    wind = stats['wind']
+    info = dict.fromkeys(config.WEATHER_FIELDS, '')
+    info.update({
+        'cond': stats['cond'],
+        'temp': temperature(stats['temp']),
+        'feels_like': temperature(stats['feels_like']),
+        'wind': '' if math.isnan(wind['mean']) else
+                f"{wind['mean']:.1f} m/s ({wind['min']:.1f}..{wind['max']:.1f})",
+    })
+    return info
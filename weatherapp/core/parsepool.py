@@ -0,0 +1,94 @@
+""" Process pool for CPU-heavy page parsing.
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from weatherapp.core import parsing
+
+
+def parse_page(provider_class, location, url, page_source, charset=None):
+    """ Runs provider parser in the worker process.
+
+    Provider is created without application, so parser should depend on
+    page source, location and url only.
+
+    :param provider_class: provider class, imported by worker by reference
+    :type provider_class: type
+    :param page_source: raw page source
+    :type page_source: bytes
+    :param charset: response charset
+    :type charset: str
+    :return: weather information
+    :rtype: dict
+    """
+
+    provider = provider_class.__new__(provider_class)
+    provider.app = None
+    provider.location = location
+    provider.url = url
+    return provider.get_weather_info(
+        provider.get_content(page_source, charset))
+
+
+def get_context():
+    """ Multiprocessing context which starts workers without fork.
+
+    'forkserver' forks workers from a clean single threaded server
+    process, 'spawn' is used where it isn't supported, e.g. on Windows.
+    """
+
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+class ParsePool:
+
+    """ Parses pages in worker processes.
+
+    Only raw page bytes, or just page fragment if provider defines it,
+    are sent to the worker and only weather information dict is sent back.
+
+    Pool is started lazily from provider threads, so workers are never
+    forked: a fork copies locks held by other threads, e.g. of cache or
+    logging, and the worker may hang on them. Providers are sent to
+    workers by reference, so they are imported there anew.
+
+    :param workers: number of worker processes
+    :type workers: int
+    """
+
+    def __init__(self, workers):
+        self.executor = ProcessPoolExecutor(max_workers=workers,
+                                            mp_context=get_context())
+
+    def submit(self, provider, page_source, charset=None):
+        """ Schedules page parsing.
+
+        :param provider: provider which page should be parsed
+        :type provider: abstract.WeatherProvider
+        :param page_source: raw page source
+        :type page_source: bytes or memoryview
+        :param charset: response charset
+        :type charset: str
+        :rtype: concurrent.futures.Future
+        """
+
+        if provider.page_fragment is not None:
+            page_source = parsing.slice_fragment(page_source,
+                                                 *provider.page_fragment)
+        return self.executor.submit(parse_page, type(provider),
+                                    provider.location, provider.url,
+                                    bytes(page_source), charset)
+
+    def parse(self, provider, page_source, charset=None):
+        """ Parses page and waits for the result.
+
+        :rtype: dict
+        """
+
+        return self.submit(provider, page_source, charset).result()
+
+    def close(self):
+        self.executor.shutdown(wait=True)
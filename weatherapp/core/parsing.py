@@ -0,0 +1,191 @@
+""" HTML parsing helpers shared by providers.
+
+Providers need only a few fields from a big page, so page may be cut
+down to the relevant fragment before parsing and parsed by the fastest
+installed backend: selectolax, lxml or built-in html.parser.
+"""
+
+import mmap
+import importlib.util
+
+from weatherapp.core import config
+
+
+# python modules required by parser backends
+BACKEND_MODULES = {
+    'selectolax': 'selectolax',
+    'lxml': 'lxml',
+    'html.parser': None,
+}
+
+
+def is_available(backend):
+    """ Checks whether parser backend is installed.
+
+    :param backend: backend name
+    :type backend: str
+    :rtype: bool
+    """
+
+    if backend not in BACKEND_MODULES:
+        return False
+    module = BACKEND_MODULES[backend]
+    return module is None or importlib.util.find_spec(module) is not None
+
+
+def get_backend(preferred=config.HTML_PARSERS):
+    """ Gets the first installed parser backend.
+
+    :param preferred: backend names in order of preference
+    :type preferred: tuple
+    :rtype: str
+    """
+
+    for backend in preferred:
+        if is_available(backend):
+            return backend
+    return 'html.parser'
+
+
+def get_charset(content_type):
+    """ Gets charset parameter of Content-Type header.
+
+    :param content_type: Content-Type header value
+    :type content_type: str
+    :return: lowercase charset name or None if it isn't specified
+    :rtype: str
+    """
+
+    for param in (content_type or '').split(';')[1:]:
+        name, _, value = param.partition('=')
+        if name.strip().lower() == 'charset':
+            return value.strip().strip('"\'').lower() or None
+    return None
+
+
+def decode(data, charset=None):
+    """ Decodes page data without intermediate copies.
+
+    Works with any bytes-like object, including memory-mapped cache
+    entries. Unknown charset falls back to UTF-8.
+
+    :param data: page data
+    :type data: bytes or memoryview
+    :param charset: response charset
+    :type charset: str
+    :rtype: str
+    """
+
+    try:
+        return str(data, charset or 'utf-8')
+    except LookupError:
+        return str(data, 'utf-8')
+
+
+def _get_haystack(content):
+    """ Object with 'find' method over the whole memoryview content.
+    """
+
+    source = content.obj
+    if isinstance(source, (bytes, mmap.mmap)) and \
+            len(source) == content.nbytes:
+        return source
+    return bytes(content)
+
+
+def slice_fragment(content, start, end=None):
+    """ Cuts page source down to the fragment between two markers.
+
+    Fragment starts with 'start' marker and ends right after 'end' marker.
+    Whole content is returned if start marker isn't found, so changed page
+    layout is still parsed, just slower.
+
+    :param content: page source
+    :type content: str or bytes
+    :param start: marker of the fragment start
+    :type start: str or bytes
+    :param end: marker of the fragment end
+    :type end: str or bytes
+    :return: str for str content, bytes otherwise, only the fragment is
+             copied out of memoryview content
+    """
+
+    haystack = content
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        if isinstance(content, memoryview):
+            haystack = _get_haystack(content)
+        if isinstance(start, str):
+            start = start.encode('utf-8')
+        if isinstance(end, str):
+            end = end.encode('utf-8')
+
+    begin = haystack.find(start)
+    finish = len(content)
+    if begin == -1:
+        begin = 0
+    elif end is not None:
+        finish = haystack.find(end, begin + len(start))
+        finish = len(content) if finish == -1 else finish + len(end)
+
+    fragment = content[begin:finish]
+    if isinstance(fragment, memoryview):
+        return fragment.tobytes()
+    return fragment
+
+
+def make_soup(content, backend=None, parse_only=None):
+    """ Parses page source into BeautifulSoup tree.
+
+    :param backend: 'lxml' or 'html.parser', the best installed if None
+    :type backend: str
+    :param parse_only: tag name or (name, attrs) pair, only matching tags
+                       are added to the tree
+    :type parse_only: str or tuple
+    :rtype: bs4.BeautifulSoup
+    """
+
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    if backend is None:
+        backend = get_backend(('lxml', 'html.parser'))
+
+    strainer = None
+    if isinstance(parse_only, tuple):
+        strainer = SoupStrainer(*parse_only)
+    elif parse_only is not None:
+        strainer = SoupStrainer(parse_only)
+    return BeautifulSoup(content, backend, parse_only=strainer)
+
+
+def select_text(content, selectors, backend=None, parse_only=None):
+    """ Gets text of elements matched by CSS selectors.
+
+    :param content: page source
+    :type content: str or bytes
+    :param selectors: CSS selector for each field name
+    :type selectors: dict
+    :param backend: parser backend name, the best installed if None
+    :type backend: str
+    :param parse_only: restricts BeautifulSoup tree, see 'make_soup'
+    :return: stripped text for each field, empty string if not found
+    :rtype: dict
+    """
+
+    if backend is None:
+        backend = get_backend()
+
+    result = {}
+    if backend == 'selectolax':
+        from selectolax.parser import HTMLParser
+
+        tree = HTMLParser(content)
+        for field, selector in selectors.items():
+            node = tree.css_first(selector)
+            result[field] = node.text(strip=True) if node is not None else ''
+        return result
+
+    soup = make_soup(content, backend, parse_only)
+    for field, selector in selectors.items():
+        node = soup.select_one(selector)
+        result[field] = node.get_text(strip=True) if node is not None else ''
+    return result
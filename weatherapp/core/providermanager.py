@@ -1,23 +1,129 @@
+import os
+import sys
+import json
 import logging
-import pkg_resources
+import importlib
+from pathlib import Path
 
 from weatherapp.core import config
 from weatherapp.core import commandmanager
 
 
+def iter_entry_points(group):
+    """ Lists installed entry points of given group.
+
+    :return: entry point name and 'module:attr' reference pairs
+    :rtype: list
+    """
+
+    from importlib import metadata
+
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, 'select'):
+        selected = entry_points.select(group=group)
+    else:  # python < 3.10
+        selected = entry_points.get(group, [])
+    return [(entry_point.name, entry_point.value)
+            for entry_point in selected]
+
+
+def load_reference(reference):
+    """ Imports object by 'module:attr' reference.
+    """
+
+    module_name, _, attrs = reference.partition(':')
+    obj = importlib.import_module(module_name.strip())
+    for attr in filter(None, attrs.strip().split('.')):
+        obj = getattr(obj, attr)
+    return obj
+
+
 class ProviderManager(commandmanager.CommandManager):
 
     """ Discovers registered providers and loads them.
+
+    Providers are discovered from an entrypoint and imported only when
+    they are requested. Discovered entry points are kept in the index file
+    which is valid while nothing is installed or removed in 'sys.path'.
     """
 
     logger = logging.getLogger(__name__)
 
+    @staticmethod
+    def get_index_file():
+        """ Path to the providers index file.
+        """
+
+        return Path.home() / config.CACHE_DIR / config.PROVIDER_INDEX_FILE
+
+    @staticmethod
+    def get_index_key():
+        """ Fingerprint of installed packages.
+
+        Modification time of 'sys.path' directory changes when package
+        is installed to or removed from it.
+        """
+
+        key = []
+        for path in sys.path:
+            try:
+                key.append([path, os.stat(path or '.').st_mtime])
+            except OSError:
+                continue
+        return key
+
+    def _read_index(self, key):
+        try:
+            with self.get_index_file().open('r') as index_file:
+                index = json.load(index_file)
+        except (OSError, ValueError):
+            return None
+        if index.get('key') != key:
+            return None
+        return index['entry_points']
+
+    def _write_index(self, key, entry_points):
+        index_file = self.get_index_file()
+        try:
+            index_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = index_file.with_suffix('.tmp')
+            with temp_file.open('w') as index:
+                json.dump({'key': key, 'entry_points': entry_points}, index)
+            os.replace(str(temp_file), str(index_file))
+        except OSError:
+            self.logger.debug('providers index is not saved', exc_info=True)
+
     def _load_commands(self):
         """ Loads all registered providers from an entrypoint.
         """
 
-        entry_points = pkg_resources.iter_entry_points(
-            config.PROVIDER_EP_NAMESPACE)
-        for entry_point in entry_points:
-            self.logger.debug('found provider %r', entry_point.name)
-            self._commands[entry_point.name] = entry_point.load()
\ No newline at end of file
+        key = self.get_index_key()
+        entry_points = self._read_index(key)
+        if entry_points is None:
+            entry_points = iter_entry_points(config.PROVIDER_EP_NAMESPACE)
+            self._write_index(key, entry_points)
+
+        for name, reference in entry_points:
+            self.logger.debug('found provider %r', name)
+            self._commands[name] = reference
+
+    def get(self, name):
+        """ Gets provider from registry, imports it on first request.
+
+        :param name: provider name
+        :type name: str
+        """
+
+        provider = self._commands.get(name, None)
+        if isinstance(provider, str):
+            provider = self._commands[name] = load_reference(provider)
+        return provider
+
+    def __getitem__(self, name):
+        if name not in self._commands:
+            raise KeyError(name)
+        return self.get(name)
+
+    def __iter__(self):
+        for name in list(self._commands):
+            yield name, self.get(name)
@@ -0,0 +1,216 @@
+""" Background refresh scheduling and request rate limits.
+"""
+
+import math
+import time
+import heapq
+import random
+import logging
+import itertools
+import threading
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+
+from weatherapp.core import config
+
+
+class TokenBucket:
+
+    """ Token bucket rate limit.
+
+    :param rate: how many tokens are added per second
+    :type rate: float
+    :param capacity: maximum number of tokens, allowed burst of requests
+    :type capacity: float
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """ Takes one token.
+
+        :return: how long to wait before token may be used (in seconds)
+        :rtype: float
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity,
+                              self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0
+            return -self.tokens / self.rate
+
+    def acquire(self):
+        """ Waits until token is available and takes it.
+        """
+
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+
+class RateLimiter:
+
+    """ Per host request rate limits.
+
+    Host rate which is zero or less means requests to the host aren't
+    limited, rate which isn't a number is ignored.
+
+    :param rate: default requests per second for every host
+    :type rate: float
+    :param burst: how many requests may be sent at once
+    :type burst: int
+    :param rates: requests per second of specific hosts
+    :type rates: dict
+    """
+
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, rate=config.RATE_LIMIT, burst=config.RATE_BURST,
+                 rates=None):
+        self.rate = rate
+        self.burst = burst
+        self.rates = rates or {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def get_rate(self, host):
+        """ Requests per second allowed to the host.
+
+        :rtype: float
+        """
+
+        value = self.rates.get(host, self.rate)
+        try:
+            rate = float(value)
+        except (TypeError, ValueError):
+            rate = math.nan
+        if math.isnan(rate):
+            self.logger.warning("Wrong rate limit of %s: %r, default %s "
+                                "is used", host, value, self.rate)
+            rate = float(self.rate)
+        return rate
+
+    def get_bucket(self, host):
+        """ Host rate limit, None if requests to host aren't limited.
+
+        :rtype: TokenBucket
+        """
+
+        with self._lock:
+            if host not in self._buckets:
+                rate = self.get_rate(host)
+                self._buckets[host] = (TokenBucket(rate, self.burst)
+                                       if rate > 0 else None)
+            return self._buckets[host]
+
+    def wait(self, url):
+        """ Waits until request to url host is allowed.
+        """
+
+        bucket = self.get_bucket(urlsplit(url).hostname or '')
+        if bucket is not None:
+            bucket.acquire()
+
+
+class Scheduler:
+
+    """ Runs function for every key periodically in a thread pool.
+
+    Runs are spread with random jitter, so keys added at once are not
+    refreshed at once. Key is never run again while its previous run is
+    in flight.
+
+    :param func: function which is called with key
+    :type func: callable
+    :param interval: delay between runs of the same key (in seconds)
+    :type interval: float
+    :param jitter: maximum random delay added to every run (in seconds)
+    :type jitter: float
+    :param workers: how many keys may be run at once
+    :type workers: int
+    """
+
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, func, interval, jitter=config.SCHEDULE_JITTER,
+                 workers=config.DEFAULT_JOBS):
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        self.stopped = False
+        self._queue = []
+        self._counter = itertools.count()
+        self._in_flight = set()
+        self._condition = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=max(workers, 1))
+
+    def add(self, key, delay=0):
+        """ Schedules key to be run after delay and random jitter.
+        """
+
+        when = time.monotonic() + delay + random.uniform(0, self.jitter)
+        with self._condition:
+            heapq.heappush(self._queue, (when, next(self._counter), key))
+            self._condition.notify()
+
+    def submit(self, key):
+        """ Runs key at once unless it is already in flight.
+
+        :return: False if key is in flight
+        :rtype: bool
+        """
+
+        with self._condition:
+            if key in self._in_flight:
+                return False
+            self._in_flight.add(key)
+        self._executor.submit(self._run, key)
+        return True
+
+    def _run(self, key):
+        try:
+            self.func(key)
+        except Exception:
+            self.logger.exception("Scheduled run of %s failed", key)
+        finally:
+            with self._condition:
+                self._in_flight.discard(key)
+            if not self.stopped:
+                self.add(key, self.interval)
+
+    def run(self):
+        """ Runs scheduled keys until scheduler is stopped.
+        """
+
+        while True:
+            with self._condition:
+                while not self.stopped:
+                    timeout = None
+                    if self._queue:
+                        timeout = self._queue[0][0] - time.monotonic()
+                        if timeout <= 0:
+                            break
+                    self._condition.wait(timeout)
+                if self.stopped:
+                    break
+                when, counter, key = heapq.heappop(self._queue)
+            # key in flight is scheduled again when its run finishes
+            self.submit(key)
+        self._executor.shutdown(wait=True)
+
+    def stop(self):
+        """ Stops scheduler, runs in flight are finished.
+        """
+
+        with self._condition:
+            self.stopped = True
+            self._condition.notify_all()
@@ -0,0 +1,168 @@
+""" Local HTTP API for weather information.
+"""
+
+import json
+import time
+import threading
+import socketserver
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from weatherapp.core.scheduler import Scheduler
+
+
+class WeatherService:
+
+    """ Keeps weather information of all providers in memory.
+
+    Weather information is refreshed by scheduler in the background
+    before the page cache expires, so requests are always answered from
+    memory.
+
+    :param app: Main application instance
+    :type app: 'app.App'
+    :param interval: how often weather information is refreshed
+    :type interval: float
+    """
+
+    def __init__(self, app, interval):
+        self.app = app
+        self.results = {}
+        self.scheduler = Scheduler(self.refresh_one, interval,
+                                   workers=app.options.jobs)
+        self._lock = threading.Lock()
+
+    def store(self, key, result):
+        """ Stores provider output by (provider, location) key.
+        """
+
+        title, location, weather_info = result
+        with self._lock:
+            self.results[key] = {
+                'provider': key[0],
+                'title': title,
+                'location': location,
+                'weather': weather_info,
+                'updated_at': time.time(),
+            }
+
+    def refresh(self):
+        """ Runs all providers at once and stores their results.
+        """
+
+        for task, result in self.app.iter_results(self.app.get_tasks(), []):
+            if result is not None:
+                self.store((task.name, task.location), result)
+                self.app.save_history(task.name, result)
+
+    def refresh_one(self, key):
+        """ Refreshes single provider, invoked by scheduler.
+
+        Previous weather information is kept if provider fails.
+        """
+
+        self.store(key, self.app.refresh_provider(*key))
+
+    def start(self):
+        """ Starts background refresh of all providers.
+        """
+
+        for task in self.app.get_tasks():
+            self.scheduler.add((task.name, task.location),
+                               self.scheduler.interval)
+        thread = threading.Thread(target=self.scheduler.run, daemon=True)
+        thread.start()
+
+    def stop(self):
+        """ Stops background refresh.
+        """
+
+        self.scheduler.stop()
+
+    def get_weather(self, provider=None):
+        """ Returns stored weather information.
+
+        :param provider: provider name, all providers if None
+        :type provider: str
+        :rtype: list
+        """
+
+        with self._lock:
+            results = list(self.results.values())
+        if provider is not None:
+            results = [result for result in results
+                       if result['provider'] == provider]
+        return results
+
+
+class WeatherRequestHandler(BaseHTTPRequestHandler):
+
+    """ Answers weather requests with JSON.
+
+    Supported requests:
+
+        GET /providers           - list of provider names
+        GET /weather             - weather information of all providers
+        GET /weather/<provider>  - weather information of single provider
+    """
+
+    service = None
+
+    def do_GET(self):
+        parts = [part for part in self.path.split('?')[0].split('/') if part]
+        if parts == ['providers']:
+            self.send_json(self.service.app.providermanager.names())
+        elif parts == ['weather']:
+            self.send_json(self.service.get_weather())
+        elif len(parts) == 2 and parts[0] == 'weather' and \
+                parts[1] in self.service.app.providermanager:
+            self.send_json(self.service.get_weather(parts[1]))
+        else:
+            self.send_json({'error': 'Not found'}, HTTPStatus.NOT_FOUND)
+
+    def send_json(self, data, status=HTTPStatus.OK):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        # unix socket client has no address
+        if isinstance(self.client_address, tuple):
+            return super().address_string()
+        return 'unix'
+
+    def log_message(self, format, *args):
+        self.service.app.logger.info("%s - %s", self.address_string(),
+                                     format % args)
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn,
+                     socketserver.UnixStreamServer):
+
+    """ HTTP server listening on unix socket.
+    """
+
+    daemon_threads = True
+
+    def server_bind(self):
+        socketserver.UnixStreamServer.server_bind(self)
+        self.server_name = 'localhost'
+        self.server_port = 0
+
+
+def make_server(service, host=None, port=None, socket=None):
+    """ Creates HTTP server for weather service.
+
+    :param service: weather service
+    :type service: WeatherService
+    :param socket: unix socket path, host and port are used if None
+    :type socket: str
+    """
+
+    handler = type('Handler', (WeatherRequestHandler,), {'service': service})
+    if socket:
+        return UnixHTTPServer(socket, handler)
+    return ThreadingHTTPServer((host, port), handler)
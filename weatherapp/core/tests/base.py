@@ -0,0 +1,22 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+
+class HomeTestCase(unittest.TestCase):
+
+    """ Base test case which runs in a temporary home directory.
+
+    Provider index, cache and configuration are written to the home
+    directory, so tests never touch the one of the user who runs them.
+    """
+
+    def setUp(self):
+        self.home_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.home_directory.cleanup)
+        patcher = mock.patch.dict(os.environ, {
+            'HOME': self.home_directory.name,
+            'USERPROFILE': self.home_directory.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
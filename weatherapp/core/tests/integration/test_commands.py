@@ -2,9 +2,10 @@ import unittest
 import io
 
 from weatherapp.core.app import App
+from weatherapp.core.tests.base import HomeTestCase
 
 
-class CommandsTestCase(unittest.TestCase):
+class CommandsTestCase(HomeTestCase):
 
     """ Test case for commands tests.
     """
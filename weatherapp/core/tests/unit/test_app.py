@@ -1,7 +1,116 @@
+import io
+import sys
+import json
+import time
+import pstats
+import asyncio
+import tempfile
 import unittest
 import argparse
+import subprocess
+from pathlib import Path
 
+from weatherapp.core import config
 from weatherapp.core.app import App
+from weatherapp.core.abstract import AsyncWeatherProvider
+from weatherapp.core.configuration import Configuration
+from weatherapp.core.history import HistoryStore
+from weatherapp.core.backends import SQLiteBackend
+from weatherapp.core.tests.unit.test_provider import (FakeTransport,
+                                                      FakeResponse)
+from weatherapp.core.tests.base import HomeTestCase
+
+
+class DummyProvider:
+
+    """ Provider stub which answers after given delay.
+    """
+
+    delay = 0
+    title = 'Dummy'
+    location = 'Kyiv'
+
+    def __init__(self, app, location=None):
+        self.app = app
+        if location is not None:
+            self.location = location.label or location.name
+
+    def run(self, argv):
+        time.sleep(self.delay)
+        return {'temp': self.title}
+
+
+# project root, so test providers are importable in a child process
+ROOT = Path(__file__).resolve().parents[4]
+
+
+def make_provider(title, delay=0):
+    return type(title, (DummyProvider,), {'title': title, 'delay': delay})
+
+
+class DummyAsyncProvider(AsyncWeatherProvider):
+
+    """ Async provider stub which answers after given delay.
+    """
+
+    delay = 0
+    title = 'Async'
+    location = 'Kyiv'
+    cancelled = False
+
+    def __init__(self, app, location=None):
+        self.app = app
+
+    def get_name(self):
+        return self.title
+
+    def get_default_location(self):
+        return self.location
+
+    def get_default_url(self):
+        return ''
+
+    def configurate(self):
+        pass
+
+    def get_weather_info(self, content):
+        return {}
+
+    async def run_async(self, argv):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            type(self).cancelled = True
+            raise
+        return {'temp': self.title}
+
+
+def make_async_provider(title, delay=0):
+    return type(title, (DummyAsyncProvider,), {'title': title,
+                                               'delay': delay})
+
+
+class PageAsyncProvider(AsyncWeatherProvider):
+
+    """ Async provider which uses default fetch and parse hooks.
+    """
+
+    title = 'Page'
+
+    def get_name(self):
+        return 'page'
+
+    def get_default_location(self):
+        return 'Kyiv'
+
+    def get_default_url(self):
+        return 'https://example.com/kyiv'
+
+    def configurate(self):
+        pass
+
+    def get_weather_info(self, content):
+        return {'cond': content}
 
 
 class AppTestCase(unittest.TestCase):
@@ -26,6 +135,8 @@ class AppTestCase(unittest.TestCase):
         self.assertIsNone(parsed_args.command)
         self.assertFalse(parsed_args.debug)
         self.assertEqual(parsed_args.formatter, 'table')
+        self.assertEqual(parsed_args.jobs, config.DEFAULT_JOBS)
+        self.assertEqual(parsed_args.timeout, config.PROVIDER_TIMEOUT)
 
     def test_arg_parser_arg(self):
         """ Test application argument parser.
@@ -38,4 +149,399 @@ class AppTestCase(unittest.TestCase):
         self.assertTrue(parsed_args.debug)
         self.assertEqual(parsed_args.formatter, 'table')
         self.assertTrue(parsed_args.refresh)
-        self.assertEqual(parsed_args.verbose_level, 1)
\ No newline at end of file
+        self.assertEqual(parsed_args.verbose_level, 1)
+
+
+class ProvidersTestCase(HomeTestCase):
+
+    """ Base test case for providers execution with stub providers.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.stdout = io.StringIO()
+        self.app = App(stdout=self.stdout)
+        self.app.providermanager._commands = {}
+        self.history = tempfile.TemporaryDirectory()
+        self.app._history = HistoryStore(Path(self.history.name))
+
+    def tearDown(self):
+        self.history.cleanup()
+
+    def run_providers(self, *argv):
+        self.app.options, remaining = self.app.arg_parser.parse_known_args(
+            list(argv))
+        self.app.run_providers(remaining)
+        return self.stdout.getvalue()
+
+
+class RunProvidersTestCase(ProvidersTestCase):
+
+    """ Test concurrent providers execution.
+    """
+
+    def test_output_order(self):
+        """ Test results are printed in provider manager order.
+        """
+
+        self.app.providermanager.add('first', make_provider('First', 0.2))
+        self.app.providermanager.add('second', make_provider('Second'))
+
+        output = self.run_providers('--jobs', '2')
+        self.assertLess(output.index('First'), output.index('Second'))
+
+    def test_providers_run_in_parallel(self):
+        """ Test providers are not waiting for each other.
+        """
+
+        for name in ('one', 'two', 'three'):
+            self.app.providermanager.add(name, make_provider(name, 0.2))
+
+        start = time.monotonic()
+        self.run_providers('--jobs', '3')
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_provider_timeout(self):
+        """ Test slow provider does not hold back the others.
+        """
+
+        self.app.providermanager.add('slow', make_provider('Slow', 1))
+        self.app.providermanager.add('fast', make_provider('Fast'))
+
+        with self.assertLogs('weatherapp.core.app', 'ERROR'):
+            output = self.run_providers('--jobs', '2', '--timeout', '0.1')
+        self.assertNotIn('Slow', output)
+        self.assertIn('Fast', output)
+
+    def test_queued_provider_timeout(self):
+        """ Test timeout of queued provider is counted from its start.
+        """
+
+        self.app.providermanager.add('slow', make_provider('Slow', 0.6))
+        self.app.providermanager.add('fast', make_provider('Fast'))
+
+        with self.assertLogs('weatherapp.core.app', 'ERROR') as logs:
+            output = self.run_providers('--jobs', '1', '--timeout', '0.3')
+        self.assertEqual(len(logs.records), 1)
+        self.assertNotIn('Slow', output)
+        self.assertIn('Fast', output)
+
+    def test_deadline_exit(self):
+        """ Test hanging provider doesn't hold process past the deadline.
+        """
+
+        script = ('import sys\n'
+                  'from weatherapp.core.app import App\n'
+                  'from weatherapp.core.tests.unit.test_app import '
+                  'make_provider\n'
+                  'app = App()\n'
+                  'app.providermanager._commands = '
+                  '{"slow": make_provider("Slow", 5)}\n'
+                  'try:\n'
+                  '    app.run(sys.argv[1:])\n'
+                  'finally:\n'
+                  '    app.close()\n')
+        for argv in ([], ['--async']):
+            with self.subTest(argv=argv):
+                start = time.monotonic()
+                subprocess.run([sys.executable, '-c', script,
+                                '--deadline', '0.3', '--no-history', *argv],
+                               cwd=ROOT, capture_output=True, check=True)
+                self.assertLess(time.monotonic() - start, 3)
+
+
+class BatchModeTestCase(ProvidersTestCase):
+
+    """ Test providers execution for many locations.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.app.providermanager.add('first', make_provider('First'))
+        self.app.providermanager.add('second', make_provider('Second'))
+
+    def tearDown(self):
+        super().tearDown()
+        self.directory.cleanup()
+
+    def test_locations_file(self):
+        """ Test providers are run for every location from the file.
+        """
+
+        path = Path(self.directory.name) / 'locations.csv'
+        path.write_text('provider,name,url\n'
+                        'first,Lviv,https://lviv\n'
+                        'second,Odesa,https://odesa\n'
+                        'first,Dnipro,https://dnipro\n')
+
+        output = self.run_providers('--locations', str(path))
+        positions = [output.index(name) for name in ('Lviv', 'Odesa',
+                                                     'Dnipro')]
+        self.assertEqual(positions, sorted(positions))
+        self.assertNotIn('Kyiv', output)
+
+    def test_same_name(self):
+        """ Test labels keep locations of the same city apart.
+        """
+
+        path = Path(self.directory.name) / 'locations.csv'
+        path.write_text('provider,name,url,label\n'
+                        'first,Kyiv,https://kyiv/center,center\n'
+                        'first,Kyiv,https://kyiv/airport,airport\n')
+
+        output = self.run_providers('--locations', str(path))
+
+        self.assertIn('center', output)
+        self.assertIn('airport', output)
+        self.assertEqual(sorted(series.location for series
+                                in self.app.history.series()),
+                         ['airport', 'center'])
+
+    def test_bad_locations_file(self):
+        """ Test missing file or column is logged and nothing is run.
+        """
+
+        path = Path(self.directory.name) / 'locations.csv'
+        path.write_text('provider,name\nfirst,Lviv\n')
+
+        for locations in (str(path), str(path.with_name('missing.csv'))):
+            with self.subTest(locations=locations):
+                with self.assertLogs('weatherapp.core.app', 'ERROR'):
+                    output = self.run_providers('--locations', locations)
+                self.assertNotIn('Lviv', output)
+
+    def test_all_locations(self):
+        """ Test providers are run for all configured locations.
+        """
+
+        path = Path(self.directory.name) / 'weatherapp.ini'
+        path.write_text('[first:lviv]\nname = Lviv\nurl = https://lviv\n')
+        self.app._configuration = Configuration(path)
+
+        output = self.run_providers('--all-locations')
+        self.assertIn('lviv', output)
+        # provider without configured locations is run for default one
+        self.assertIn('Second', output)
+
+
+class AsyncDriverTestCase(ProvidersTestCase):
+
+    """ Test providers execution in the asyncio event loop.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.app._cache = SQLiteBackend(Path(self.history.name),
+                                        max_size=2 ** 20, max_entries=100,
+                                        evict_time=3600)
+        self.app._configuration = Configuration(
+            Path(self.history.name) / config.CONFIG_FILE)
+
+    def tearDown(self):
+        self.app.close()
+        super().tearDown()
+
+    def test_default_hooks(self):
+        """ Test page is fetched, parsed and cached by default hooks.
+        """
+
+        transport = FakeTransport(FakeResponse(content=b'sunny'))
+        self.app._transport = transport
+        self.app.providermanager.add('page', PageAsyncProvider)
+
+        output = self.run_providers('--async')
+        self.run_providers('--async')
+
+        self.assertEqual(output.count('sunny'), 1)
+        self.assertEqual(self.stdout.getvalue().count('sunny'), 2)
+        self.assertEqual(len(transport.requests), 1)
+
+    def test_deadline_blocking_fetch(self):
+        """ Test run isn't held by fetch blocked in the executor.
+        """
+
+        self.app._transport = FakeTransport(FakeResponse(content=b'sunny'))
+        self.app._transport.delay = 1
+        self.app.providermanager.add('page', PageAsyncProvider)
+
+        start = time.monotonic()
+        with self.assertLogs('weatherapp.core.app', 'ERROR'):
+            output = self.run_providers('--async', '--deadline', '0.2')
+        self.assertLess(time.monotonic() - start, 0.6)
+        self.assertNotIn('sunny', output)
+
+    def test_timeout_from_start(self):
+        """ Test timeout of queued provider is counted from its start.
+        """
+
+        self.app.providermanager.add('first', make_provider('First', 0.3))
+        self.app.providermanager.add('second', make_provider('Second', 0.3))
+
+        output = self.run_providers('--async', '--jobs', '1',
+                                    '--timeout', '0.5')
+        self.assertIn('First', output)
+        self.assertIn('Second', output)
+
+    def test_mixed_providers(self):
+        """ Test async and sync providers are run side by side in order.
+        """
+
+        self.app.providermanager.add('async', make_async_provider('Async',
+                                                                  0.2))
+        self.app.providermanager.add('sync', make_provider('Sync', 0.2))
+
+        start = time.monotonic()
+        output = self.run_providers('--async')
+        self.assertLess(time.monotonic() - start, 0.4)
+        self.assertLess(output.index('Async'), output.index('Sync'))
+
+    def test_single_thread(self):
+        """ Test many async providers don't need many workers.
+        """
+
+        for index in range(20):
+            self.app.providermanager.add(
+                f'async{index}', make_async_provider(f'Async{index}', 0.2))
+
+        start = time.monotonic()
+        output = self.run_providers('--async', '--jobs', '1')
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertIn('Async19', output)
+
+    def test_deadline(self):
+        """ Test providers not finished before deadline are cancelled.
+        """
+
+        slow = make_async_provider('Slow', 1)
+        self.app.providermanager.add('fast', make_async_provider('Fast'))
+        self.app.providermanager.add('slow', slow)
+
+        with self.assertLogs('weatherapp.core.app', 'ERROR'):
+            output = self.run_providers('--async', '--deadline', '0.1')
+        self.assertIn('Fast', output)
+        self.assertNotIn('Slow', output)
+        self.assertTrue(slow.cancelled)
+
+
+class ProfileTestCase(ProvidersTestCase):
+
+    """ Test run metrics output.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.stderr = io.StringIO()
+        self.app.stderr = self.stderr
+        self.app.providermanager.add('dummy', make_provider('Dummy'))
+
+    def test_profile(self):
+        """ Test summary is written to stderr and output isn't touched.
+        """
+
+        self.app.run(['--profile'])
+
+        self.assertIn('format', self.stderr.getvalue())
+        self.assertIn('total', self.stderr.getvalue())
+        self.assertNotIn('format', self.stdout.getvalue())
+
+    def test_profile_json(self):
+        """ Test metrics are written as JSON.
+        """
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'profile.json'
+            stats = Path(directory) / 'profile.pstats'
+            self.app.run(['--profile-json', str(path),
+                          '--profile-stats', str(stats)])
+            report = json.loads(path.read_text())
+            self.assertTrue(stats.exists())
+
+        self.assertIn('format', report['providers']['dummy']['timings'])
+        self.assertEqual(self.stderr.getvalue(), '')
+
+
+    def test_profile_stats(self):
+        """ Test work of providers is in cProfile statistics.
+        """
+
+        run = (__file__, DummyProvider.run.__code__.co_firstlineno, 'run')
+        for argv in ([], ['--async']):
+            with self.subTest(argv=argv), \
+                    tempfile.TemporaryDirectory() as directory:
+                path = Path(directory) / 'profile.pstats'
+                self.app.run(['--profile-stats', str(path), *argv])
+                self.assertIn(run, pstats.Stats(str(path)).stats)
+
+
+class AggregateTestCase(ProvidersTestCase):
+
+    """ Test aggregated output of all providers.
+    """
+
+    def test_aggregate(self):
+        """ Test summary row is printed for every location.
+        """
+
+        for name, temp in (('first', '+2°C'), ('second', '+4°C')):
+            provider = make_provider(name.title())
+            provider.run = lambda self, argv, temp=temp: {'temp': temp}
+            self.app.providermanager.add(name, provider)
+
+        output = self.run_providers('--aggregate', '--formatter', 'plain')
+
+        self.assertIn('All providers (2)', output)
+        self.assertIn('+3°C (+2..+4)', output)
+
+    def test_no_results(self):
+        """ Test nothing is printed if no provider returned result.
+        """
+
+        self.assertEqual(self.run_providers('--aggregate'), '')
+
+
+class RecordReplayTestCase(ProvidersTestCase):
+
+    """ Test transport is chosen by record and replay options.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.archive = str(Path(self.history.name) / 'rec.db')
+
+    def tearDown(self):
+        self.app.close()
+        super().tearDown()
+
+    def test_record(self):
+        """ Test responses are recorded by the network transport.
+        """
+
+        from weatherapp.core.transport import RecordingTransport
+
+        self.app.options = self.app.arg_parser.parse_args(
+            ['--record', self.archive])
+        self.assertIsInstance(self.app.transport, RecordingTransport)
+
+    def test_replay(self):
+        """ Test recorded responses are replayed with latency.
+        """
+
+        from weatherapp.core.transport import ReplayTransport
+
+        self.app.options = self.app.arg_parser.parse_args(
+            ['--replay', self.archive, '--replay-latency', '0.1'])
+        self.assertIsInstance(self.app.transport, ReplayTransport)
+        self.assertEqual(self.app.transport.latency, 0.1)
+
+    def test_replay_cache(self):
+        """ Test replayed pages are not cached in the user cache.
+        """
+
+        self.app.options = self.app.arg_parser.parse_args(
+            ['--replay', self.archive])
+        location = self.app.cache.location
+
+        self.assertNotEqual(location, Path.home() / config.CACHE_DIR)
+        self.app.close()
+        self.assertFalse(location.exists())
@@ -0,0 +1,139 @@
+import time
+import tempfile
+import unittest
+from pathlib import Path
+
+from weatherapp.core.backends import SQLiteBackend, FileBackend
+
+
+class SQLiteBackendTestCase(unittest.TestCase):
+
+    """ Unit test case for SQLite cache backend.
+    """
+
+    backend_class = SQLiteBackend
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.backend = self.backend_class(Path(self.directory.name),
+                                          max_size=100, max_entries=3,
+                                          evict_time=3600)
+
+    def tearDown(self):
+        self.backend.close()
+        self.directory.cleanup()
+
+    def test_set_get(self):
+        """ Test stored entry is returned with its metadata.
+        """
+
+        self.backend.set('key', b'data', {'etag': 'v1'})
+        entry = self.backend.get('key')
+
+        self.assertEqual(entry.data, b'data')
+        self.assertEqual(entry.info, {'etag': 'v1'})
+        self.assertIsNone(self.backend.head('key').data)
+        self.assertIsNone(self.backend.get('bar'))
+
+    def test_access_time(self):
+        """ Test access time of recently used entry isn't written again.
+        """
+
+        if self.backend_class is not SQLiteBackend:
+            self.skipTest('access time is kept by SQLite backend only')
+
+        self.backend.set('key', b'data', {})
+        changes = self.backend.connection.total_changes
+        self.backend.get('key')
+        self.assertEqual(self.backend.connection.total_changes, changes)
+
+        self.backend.access_resolution = 0
+        self.backend.get('key')
+        self.assertEqual(self.backend.connection.total_changes, changes + 1)
+
+    def test_touch(self):
+        """ Test touch updates metadata and keeps data.
+        """
+
+        self.backend.set('key', b'data', {'etag': 'v1'})
+        self.backend.touch('key', {'etag': 'v2'})
+        entry = self.backend.get('key')
+
+        self.assertEqual(entry.data, b'data')
+        self.assertEqual(entry.info, {'etag': 'v2'})
+
+    def test_max_entries(self):
+        """ Test oldest entry is evicted when count limit is exceeded.
+        """
+
+        for key in ('one', 'two', 'three', 'four'):
+            self.backend.set(key, b'data', {})
+            time.sleep(0.01)
+
+        self.assertIsNone(self.backend.head('one'))
+        self.assertEqual(self.backend.stats()['entries'], 3)
+
+    def test_max_size(self):
+        """ Test entries are evicted when size limit is exceeded.
+        """
+
+        self.backend.set('one', b'x' * 60, {})
+        time.sleep(0.01)
+        self.backend.set('two', b'x' * 60, {})
+
+        self.assertIsNone(self.backend.head('one'))
+        self.assertEqual(self.backend.stats(), {'entries': 1, 'size': 60})
+
+    def test_clear(self):
+        """ Test clear removes all entries.
+        """
+
+        self.backend.set('key', b'data', {})
+        self.backend.clear()
+
+        self.assertEqual(self.backend.stats(), {'entries': 0, 'size': 0})
+
+    def test_prune(self):
+        """ Test prune removes entries unused longer than evict time.
+        """
+
+        self.backend.evict_time = 0
+        self.backend.set('key', b'data', {})
+
+        self.assertEqual(self.backend.prune(), 1)
+        self.assertIsNone(self.backend.head('key'))
+
+
+class FileBackendTestCase(SQLiteBackendTestCase):
+
+    """ Unit test case for file cache backend.
+    """
+
+    backend_class = FileBackend
+
+    def test_mapped_data(self):
+        """ Test data is mapped from file instead of read into memory.
+        """
+
+        self.backend.set('key', b'data', {})
+        entry = self.backend.get('key')
+
+        self.assertIsInstance(entry.data, memoryview)
+        self.assertTrue(entry.data.readonly)
+        # mapping outlives replaced file
+        self.backend.set('key', b'other', {})
+        self.assertEqual(entry.data, b'data')
+
+    def test_torn_write(self):
+        """ Test data isn't paired with metadata of another write.
+        """
+
+        self.backend.set('key', b'data', {'digest': 'v1'})
+        # reader between data and metadata replacement
+        self.backend._write(self.backend.get_path('key'), b'other')
+
+        self.assertIsNone(self.backend.get('key'))
+
+
+if __name__ == '__main__':
+    unittest.main()
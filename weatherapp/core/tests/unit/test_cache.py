@@ -0,0 +1,64 @@
+import io
+import unittest
+
+from weatherapp.core import config
+from weatherapp.core.app import App
+from weatherapp.core.commands.cache import Cache
+from weatherapp.core.tests.base import HomeTestCase
+
+
+class CacheCommandTestCase(HomeTestCase):
+
+    """ Unit test case for cache command.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.stdout = io.StringIO()
+        self.app = App(stdout=self.stdout)
+        self.app.options = self.app.arg_parser.parse_args([])
+        self.addCleanup(self.app.close)
+        self.app.cache.set('kyiv', b'sunny', {})
+        self.app.cache.set('lviv', b'rainy', {})
+
+    def run_command(self, *argv):
+        Cache(self.app).run(list(argv))
+        return self.stdout.getvalue()
+
+    def test_stats(self):
+        """ Test cache usage is shown with its limits.
+        """
+
+        output = self.run_command('stats')
+
+        self.assertIn(f'entries: 2 / {config.CACHE_MAX_ENTRIES}', output)
+        self.assertIn(f'size: 10 / {config.CACHE_MAX_SIZE} bytes', output)
+
+    def test_prune(self):
+        """ Test entries unused longer than evict time are removed.
+        """
+
+        self.assertIn('removed entries: 0', self.run_command('prune'))
+
+        self.app.cache.evict_time = 0
+        self.assertIn('removed entries: 2', self.run_command('prune'))
+        self.assertIsNone(self.app.cache.head('kyiv'))
+
+    def test_clear(self):
+        """ Test all entries are removed.
+        """
+
+        self.run_command('clear')
+
+        self.assertEqual(self.app.cache.stats(), {'entries': 0, 'size': 0})
+
+    def test_wrong_action(self):
+        """ Test unknown action is rejected.
+        """
+
+        with self.assertRaises(SystemExit):
+            Cache(self.app).run(['drop'])
+
+
+if __name__ == '__main__':
+    unittest.main()
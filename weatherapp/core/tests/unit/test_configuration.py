@@ -0,0 +1,103 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from weatherapp.core.configuration import Configuration, Location
+
+
+class ConfigurationTestCase(unittest.TestCase):
+
+    """ Unit test case for application configuration.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name) / 'weatherapp.ini'
+        self.path.write_text('[accu]\nname = Kyiv\nurl = https://kyiv\n'
+                             'stale = error\n\n'
+                             '[accu:lviv]\nname = Lviv\nurl = https://lviv\n')
+        self.configuration = Configuration(self.path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_get_location(self):
+        """ Test default and additional provider locations.
+        """
+
+        self.assertEqual(self.configuration.get_location('accu'),
+                         Location(None, 'Kyiv', 'https://kyiv'))
+        self.assertEqual(self.configuration.get_location('accu', 'lviv'),
+                         Location('lviv', 'Lviv', 'https://lviv'))
+        self.assertIsNone(self.configuration.get_location('rp5'))
+
+    def test_location_cache(self):
+        """ Test cached location is updated when configuration changes.
+        """
+
+        self.configuration.get_location('accu')
+        self.configuration.set_location('accu', 'Odesa', 'https://odesa')
+        self.assertEqual(self.configuration.get_location('accu').name,
+                         'Odesa')
+
+        self.configuration.remove_location('accu', 'lviv')
+        self.assertIsNone(self.configuration.get_location('accu', 'lviv'))
+
+    def test_instance_cache(self):
+        """ Test location cache isn't shared between configurations.
+        """
+
+        other = Configuration(Path(self.directory.name) / 'other.ini')
+        self.configuration.load()
+        self.configuration.get_location('accu')
+        other.set_location('accu', 'Odesa', 'https://odesa')
+
+        self.assertEqual(other.get_location('accu').name, 'Odesa')
+        self.assertEqual(
+            self.configuration.get_location.cache_info().currsize, 1)
+        self.assertEqual(self.configuration.get_location('accu').name,
+                         'Kyiv')
+
+    def test_get_locations(self):
+        """ Test all provider locations are listed, default one first.
+        """
+
+        locations = self.configuration.get_locations('accu')
+
+        self.assertEqual([location.name for location in locations],
+                         ['Kyiv', 'Lviv'])
+        self.assertEqual(self.configuration.get_locations('rp5'), [])
+
+    def test_get_section(self):
+        """ Test provider settings.
+        """
+
+        self.assertEqual(self.configuration.get_section('accu')['stale'],
+                         'error')
+        self.assertEqual(self.configuration.get_section('rp5'), {})
+
+    def test_save(self):
+        """ Test changed configuration is written and other settings kept.
+        """
+
+        self.configuration.set_location('accu', 'Odesa', 'https://odesa')
+        self.configuration.save()
+
+        configuration = Configuration(self.path)
+        self.assertEqual(configuration.get_location('accu').name, 'Odesa')
+        self.assertEqual(configuration.get_section('accu')['stale'], 'error')
+
+    def test_save_unchanged(self):
+        """ Test configuration file isn't rewritten without changes.
+        """
+
+        self.configuration.set_location('accu', 'Kyiv', 'https://kyiv')
+        self.assertFalse(self.configuration.changed)
+
+        self.path.unlink()
+        self.configuration.save()
+        self.assertFalse(self.path.exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
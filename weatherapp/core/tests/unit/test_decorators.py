@@ -0,0 +1,137 @@
+import time
+import threading
+import unittest
+
+from weatherapp.core.decorators import memoize, singleton
+
+
+class MemoizeTestCase(unittest.TestCase):
+
+    """ Unit test case for memoize decorator.
+    """
+
+    def setUp(self):
+        self.calls = []
+
+    def make_function(self, delay=0, **options):
+        @memoize(**options)
+        def function(value, power=1):
+            self.calls.append(value)
+            time.sleep(delay)
+            return value ** power
+        return function
+
+    def test_hits_and_misses(self):
+        """ Test result is cached, keyword arguments are part of the key.
+        """
+
+        function = self.make_function()
+
+        self.assertEqual(function(2), 2)
+        self.assertEqual(function(2), 2)
+        self.assertEqual(function(2, power=2), 4)
+        self.assertEqual(function(2, power=2), 4)
+
+        self.assertEqual(self.calls, [2, 2])
+        info = function.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (2, 2, 2))
+
+    def test_lru(self):
+        """ Test least recently used result is evicted.
+        """
+
+        function = self.make_function(maxsize=2)
+        function(1)
+        function(2)
+        function(1)
+        function(3)  # evicts 2
+
+        function(1)
+        function(2)
+        self.assertEqual(self.calls, [1, 2, 3, 2])
+
+    def test_ttl(self):
+        """ Test expired result is computed again.
+        """
+
+        function = self.make_function(ttl=0.05)
+        function(1)
+        function(1)
+        time.sleep(0.1)
+        function(1)
+
+        self.assertEqual(self.calls, [1, 1])
+
+    def test_invalidate(self):
+        """ Test invalidated result is computed again.
+        """
+
+        function = self.make_function()
+        function(1)
+        function(2)
+        function.invalidate(1)
+        function(1)
+        function(2)
+        self.assertEqual(self.calls, [1, 2, 1])
+
+        function.cache_clear()
+        self.assertEqual(function.cache_info().currsize, 0)
+
+    def test_single_flight(self):
+        """ Test concurrent misses call function once.
+        """
+
+        function = self.make_function(delay=0.1)
+        threads = [threading.Thread(target=function, args=(5,))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.calls, [5])
+
+    def test_exception_not_cached(self):
+        """ Test failed call is repeated.
+        """
+
+        @memoize
+        def function():
+            self.calls.append(None)
+            raise ValueError
+
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                function()
+        self.assertEqual(len(self.calls), 2)
+
+
+class SingletonTestCase(unittest.TestCase):
+
+    """ Unit test case for singleton decorator.
+    """
+
+    def test_concurrent_creation(self):
+        """ Test only one instance is created by concurrent calls.
+        """
+
+        created = []
+
+        @singleton
+        class Slow:
+            def __init__(self):
+                time.sleep(0.05)
+                created.append(self)
+
+        threads = [threading.Thread(target=Slow) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(created), 1)
+        self.assertIs(Slow(), created[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import time
+import threading
+import unittest
+
+from weatherapp.core.executor import DaemonExecutor
+
+
+class DaemonExecutorTestCase(unittest.TestCase):
+
+    """ Unit test case for thread pool of daemon workers.
+    """
+
+    def setUp(self):
+        self.executor = DaemonExecutor(2)
+
+    def tearDown(self):
+        self.executor.shutdown(wait=False)
+
+    def test_submit(self):
+        """ Test results and errors are set to futures.
+        """
+
+        self.assertEqual(self.executor.submit(pow, 2, 3).result(), 8)
+        with self.assertRaises(ZeroDivisionError):
+            self.executor.submit(divmod, 1, 0).result()
+        self.assertEqual(list(self.executor.map(abs, [-1, -2, 3])),
+                         [1, 2, 3])
+
+    def test_workers(self):
+        """ Test workers are daemon threads reused up to the limit.
+        """
+
+        threads = set()
+
+        def work():
+            time.sleep(0.05)
+            threads.add(threading.current_thread())
+
+        futures = [self.executor.submit(work) for _ in range(6)]
+        for future in futures:
+            future.result()
+
+        self.assertEqual(len(threads), 2)
+        self.assertTrue(all(thread.daemon for thread in threads))
+
+    def test_shutdown(self):
+        """ Test queued functions are cancelled and new ones rejected.
+        """
+
+        release = threading.Event()
+        for _ in range(2):
+            self.executor.submit(release.wait)
+        queued = self.executor.submit(pow, 2, 3)
+
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        release.set()
+
+        self.assertTrue(queued.cancelled())
+        with self.assertRaises(RuntimeError):
+            self.executor.submit(pow, 2, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import io
+import json
+import unittest
+
+from weatherapp.core.formatters import (TableFormatter, JSONLinesFormatter,
+                                        CSVFormatter, PlainFormatter)
+
+
+DATA = {'cond': 'Sunny', 'temp': '+5°C', 'feels_like': '+3°C', 'wind': ''}
+
+
+class FormattersTestCase(unittest.TestCase):
+
+    """ Unit test case for output formatters.
+    """
+
+    def emit(self, formatter, times=1):
+        stdout = io.StringIO()
+        for _ in range(times):
+            formatter.emit(['Accu', 'Kyiv'], DATA, stdout)
+        return stdout.getvalue()
+
+    def test_table(self):
+        """ Test table is written to the stream.
+        """
+
+        output = self.emit(TableFormatter())
+
+        self.assertIn('Accu', output)
+        self.assertIn('+5°C', output)
+        self.assertTrue(output.endswith('\n'))
+
+    def test_jsonlines(self):
+        """ Test one JSON object per provider.
+        """
+
+        lines = self.emit(JSONLinesFormatter(), times=2).splitlines()
+
+        self.assertEqual(len(lines), 2)
+        record = json.loads(lines[0])
+        self.assertEqual(record['provider'], 'Accu')
+        self.assertEqual(record['location'], 'Kyiv')
+        self.assertEqual(record['temp'], '+5°C')
+
+    def test_csv(self):
+        """ Test header is written only once.
+        """
+
+        lines = self.emit(CSVFormatter(), times=2).splitlines()
+
+        self.assertEqual(lines[0], 'provider,location,cond,temp,feels_like,'
+                                   'wind')
+        self.assertEqual(lines[1], 'Accu,Kyiv,Sunny,+5°C,+3°C,')
+        self.assertEqual(len(lines), 3)
+
+    def test_plain(self):
+        """ Test single line per provider without empty values.
+        """
+
+        self.assertEqual(self.emit(PlainFormatter()),
+                         'Accu (Kyiv): cond: Sunny, temp: +5°C, '
+                         'feels_like: +3°C\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
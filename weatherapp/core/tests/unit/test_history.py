@@ -0,0 +1,182 @@
+import io
+import json
+import math
+import tempfile
+import unittest
+from pathlib import Path
+
+from weatherapp.core.app import App
+from weatherapp.core.history import HistoryStore
+from weatherapp.core.observation import Observation
+from weatherapp.core.commands.history import History, parse_time
+from weatherapp.core.tests.base import HomeTestCase
+
+
+def make_observation(temp, cond='Sunny', provider='accu', location='Lviv'):
+    return Observation(provider, location, cond, temp, temp - 2, 'C', 3.0)
+
+
+class HistoryStoreTestCase(unittest.TestCase):
+
+    """ Unit test case for history store.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = HistoryStore(Path(self.directory.name), min_interval=60)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_append(self):
+        """ Test observation is stored in °C and m/s.
+        """
+
+        observation = Observation('accu', 'Lviv', 'Snow', 23, math.nan, 'F',
+                                  36, 'km/h')
+        self.assertTrue(self.store.append(observation, 1000))
+
+        record, = self.store.latest('accu', 'Lviv')
+        self.assertEqual(record.time, 1000)
+        self.assertEqual(record.cond, 'Snow')
+        self.assertEqual(record.temp, -5)
+        self.assertTrue(math.isnan(record.feels_like))
+        self.assertAlmostEqual(record.wind, 10)
+
+    def test_repeated(self):
+        """ Test the same observation isn't stored again within interval.
+        """
+
+        self.assertTrue(self.store.append(make_observation(5), 1000))
+        self.assertFalse(self.store.append(make_observation(5), 1030))
+        self.assertTrue(self.store.append(make_observation(6), 1040))
+        self.assertTrue(self.store.append(make_observation(6), 1100))
+        self.assertEqual(len(self.store.range('accu', 'Lviv')), 3)
+
+    def test_older(self):
+        """ Test records are kept sorted by time.
+        """
+
+        self.assertTrue(self.store.append(make_observation(5), 1000))
+        self.assertFalse(self.store.append(make_observation(6), 900))
+
+    def test_partial_record(self):
+        """ Test partially written record is dropped on append.
+        """
+
+        self.store.append(make_observation(5), 1000)
+        path = self.store._get_series_path('accu', 'Lviv')
+        with path.open('ab') as series_file:
+            series_file.write(b'\x00' * 7)
+
+        self.assertTrue(self.store.append(make_observation(6), 2000))
+        self.assertEqual([record.temp for record in
+                          self.store.range('accu', 'Lviv')], [5, 6])
+
+    def test_range(self):
+        """ Test time range includes start and excludes end.
+        """
+
+        for index in range(100):
+            self.store.append(make_observation(index), index * 100)
+
+        records = self.store.range('accu', 'Lviv', 1000, 2000)
+        self.assertEqual([record.time for record in records],
+                         list(range(1000, 2000, 100)))
+        self.assertEqual(len(self.store.range('accu', 'Lviv', 9950)), 0)
+        self.assertEqual(len(self.store.range('accu', 'Lviv', end=50)), 1)
+
+    def test_latest(self):
+        """ Test the latest records are returned oldest first.
+        """
+
+        for index in range(5):
+            self.store.append(make_observation(index), index * 100)
+
+        self.assertEqual([record.temp for record in
+                          self.store.latest('accu', 'Lviv', 2)], [3, 4])
+        self.assertEqual(self.store.latest('accu', 'Kyiv'), [])
+
+    def test_series(self):
+        """ Test series are shared between store instances.
+        """
+
+        self.store.append(make_observation(5), 1000)
+        self.store.append(make_observation(5, 'Rain', 'rp5', 'Kyiv'), 1000)
+
+        store = HistoryStore(Path(self.directory.name))
+        self.assertEqual(
+            sorted((series.provider, series.location)
+                   for series in store.series()),
+            [('accu', 'Lviv'), ('rp5', 'Kyiv')])
+        self.assertEqual(store.latest('rp5', 'Kyiv')[0].cond, 'Rain')
+
+
+class HistoryCommandTestCase(HomeTestCase):
+
+    """ Unit test case for history command.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.stdout = io.StringIO()
+        self.app = App(stdout=self.stdout)
+        self.app.options = self.app.arg_parser.parse_args(['-f', 'jsonl'])
+        self.app._history = HistoryStore(Path(self.directory.name))
+        for index in range(20):
+            self.app.history.append(make_observation(index), index * 3600)
+        self.app.history.append(make_observation(1, 'Rain', 'rp5'), 0)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_command(self, *argv):
+        History(self.app).run(list(argv))
+        return [json.loads(line) for line in
+                self.stdout.getvalue().splitlines()]
+
+    def test_parse_time(self):
+        """ Test relative and absolute time.
+        """
+
+        self.assertEqual(parse_time('2d', now=200000), 200000 - 2 * 86400)
+        self.assertEqual(parse_time('30m', now=3600), 1800)
+        with self.assertRaises(ValueError):
+            parse_time('yesterday')
+
+    def test_latest(self):
+        """ Test the latest observations are shown by default.
+        """
+
+        records = self.run_command('accu')
+        self.assertEqual(len(records), 10)
+        self.assertEqual(records[-1]['temp'], '+19°C')
+        self.assertEqual(records[-1]['wind'], '3.0 m/s')
+
+    def test_range(self):
+        """ Test observations are filtered by time range.
+        """
+
+        records = self.run_command('--since', '1970-01-01T05:00+00:00',
+                                   '--until', '1970-01-01T08:00+00:00')
+        self.assertEqual([record['temp'] for record in records],
+                         ['+5°C', '+6°C', '+7°C'])
+
+    def test_filter(self):
+        """ Test observations are filtered by provider and location.
+        """
+
+        records = self.run_command('rp5', '--location', 'Lviv')
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]['cond'], 'Rain')
+
+    def test_no_series(self):
+        """ Test nothing is shown for unknown location.
+        """
+
+        self.assertEqual(self.run_command('rp5', '--location', 'Kyiv'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,241 @@
+import io
+import json
+import hashlib
+import tempfile
+import unittest
+import argparse
+from pathlib import Path
+from unittest import mock
+
+from weatherapp.core.abstract import CacheEntry
+from weatherapp.core.configuration import Configuration
+from weatherapp.core.commands.config import Configurate
+from weatherapp.core.locationindex import (LocationIndex, IndexedLocation,
+                                           build_index)
+from weatherapp.core.tests.unit.test_provider import (DummyProvider, FakeApp,
+                                                      FakeTransport)
+
+
+SITE = {
+    '/': [['Ukraine', '/ua', False], ['Poland', '/pl', False]],
+    '/ua': [['Lviv Oblast', '/ua/lviv', False], ['Kyiv', '/ua/kyiv', True]],
+    '/ua/lviv': [['Lviv', '/ua/lviv/lviv', True],
+                 ['Drohobych', '/ua/lviv/drohobych', True]],
+    '/pl': [['Lublin', '/pl/lublin', True], ['Lwówek', '/pl/lwowek', True]],
+}
+
+
+class SiteProvider:
+
+    """ Provider stub with locations pages of the SITE.
+    """
+
+    location_index_version = 1
+
+    def __init__(self, site):
+        self.site = site
+        self.fetched = []
+        self.parsed = []
+
+    def get_name(self):
+        return 'site'
+
+    def supports_location_index(self):
+        return True
+
+    def get_locations_url(self):
+        return '/'
+
+    def get_page(self, url):
+        self.fetched.append(url)
+        data = json.dumps(self.site[url]).encode('utf-8')
+        return CacheEntry(data, {'digest': hashlib.md5(data).hexdigest(),
+                                 'charset': 'utf-8'}, 0)
+
+    def get_locations(self, content):
+        locations = json.loads(content)
+        self.parsed.append(locations)
+        return locations
+
+
+class HalfProvider(DummyProvider):
+
+    """ Provider which implements only one location index hook.
+    """
+
+    def get_locations_url(self):
+        return 'https://example.com/locations'
+
+
+class LocationIndexTestCase(unittest.TestCase):
+
+    """ Unit test case for location index.
+    """
+
+    def setUp(self):
+        self.provider = SiteProvider(dict(SITE))
+        self.index = build_index(self.provider, jobs=2)
+
+    def test_build(self):
+        """ Test all leaf locations are indexed with their path.
+        """
+
+        self.assertEqual(len(self.index), 5)
+        self.assertEqual(len(self.provider.fetched), 4)
+        self.assertIn(IndexedLocation('Lviv', 'Ukraine / Lviv Oblast',
+                                      '/ua/lviv/lviv'),
+                      self.index.locations)
+        self.assertIn(IndexedLocation('Kyiv', 'Ukraine', '/ua/kyiv'),
+                      self.index.locations)
+
+    def test_prefix(self):
+        """ Test locations are found by case insensitive name prefix.
+        """
+
+        self.assertEqual([location.name for location
+                          in self.index.prefix('l')],
+                         ['Lublin', 'Lviv', 'Lwówek'])
+        self.assertEqual(len(self.index.prefix('L', limit=2)), 2)
+        self.assertEqual(self.index.prefix('Odesa'), [])
+
+    def test_fuzzy(self):
+        """ Test locations are found by similar names.
+        """
+
+        self.assertEqual(self.index.fuzzy('Lvov')[0].name, 'Lviv')
+        self.assertEqual(self.index.search('Drogobych')[0].name,
+                         'Drohobych')
+
+    def test_incremental(self):
+        """ Test only changed pages are parsed again.
+        """
+
+        self.provider.site['/pl'] = SITE['/pl'] + [['Lodz', '/pl/lodz',
+                                                    True]]
+        self.provider.parsed = []
+
+        index = build_index(self.provider, self.index)
+
+        self.assertEqual(self.provider.parsed, [self.provider.site['/pl']])
+        self.assertEqual(index.prefix('Lodz')[0].path, 'Poland')
+
+    def test_version(self):
+        """ Test index of other provider version is built from scratch.
+        """
+
+        self.provider.location_index_version = 2
+        self.provider.parsed = []
+
+        index = build_index(self.provider, self.index)
+
+        self.assertEqual(len(self.provider.parsed), 4)
+        self.assertEqual(index.version, 2)
+
+    def test_dump(self):
+        """ Test index is read back from file.
+        """
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'site.json'
+            self.index.dump(path)
+            index = LocationIndex.load(path)
+
+        self.assertEqual(index.locations, self.index.locations)
+        self.assertEqual(index.pages, self.index.pages)
+        self.assertIsNone(LocationIndex.load(path))
+
+
+class ConfigurateTestCase(unittest.TestCase):
+
+    """ Unit test case for configuration from location index.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.provider = SiteProvider(SITE)
+        self.app = mock.Mock()
+        self.app.options = argparse.Namespace(jobs=1)
+        self.app.stdout = io.StringIO()
+        self.app.stderr = io.StringIO()
+        self.app.providermanager = mock.MagicMock()
+        self.app.providermanager.__contains__.return_value = True
+        self.app.providermanager.get.return_value = lambda app: self.provider
+        patcher = mock.patch.object(
+            Configurate, 'get_index_file',
+            return_value=Path(self.directory.name) / 'site.json')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_command(self, *argv, stdin=''):
+        self.app.stdin = io.StringIO(stdin)
+        Configurate(self.app).run(['site', *argv])
+
+    def test_search(self):
+        """ Test the only found location is saved.
+        """
+
+        self.run_command('--search', 'kyi')
+
+        self.app.configuration.set_location.assert_called_once_with(
+            'site', 'Kyiv', '/ua/kyiv', None)
+        self.app.configuration.save.assert_called_once_with()
+
+    def test_choose(self):
+        """ Test one of found locations is chosen.
+        """
+
+        self.run_command('--search', 'L', '--label', 'home', stdin='2\n')
+
+        self.assertIn('2. Lviv (Ukraine / Lviv Oblast)',
+                      self.app.stdout.getvalue())
+        self.app.configuration.set_location.assert_called_once_with(
+            'site', 'Lviv', '/ua/lviv/lviv', 'home')
+
+    def test_index_reused(self):
+        """ Test index is built once and then searched offline.
+        """
+
+        self.run_command('--update-index')
+        self.provider.fetched = []
+        self.run_command('--search', 'Lublin')
+
+        self.assertIn('5 locations indexed', self.app.stdout.getvalue())
+        self.assertEqual(self.provider.fetched, [])
+
+    def test_batch(self):
+        """ Test the best match of every name is added.
+        """
+
+        names = Path(self.directory.name) / 'names.txt'
+        names.write_text('Lviv\nLublin\n\nOdesa\n', encoding='utf-8')
+
+        self.run_command('--batch', str(names))
+
+        self.assertEqual(self.app.configuration.set_location.call_args_list,
+                         [mock.call('site', 'Lviv', '/ua/lviv/lviv', 'Lviv'),
+                          mock.call('site', 'Lublin', '/pl/lublin',
+                                    'Lublin')])
+        self.assertIn('Odesa is not found', self.app.stderr.getvalue())
+
+    def test_not_supported(self):
+        """ Test provider with only locations url has no index.
+        """
+
+        configuration = Configuration(Path(self.directory.name) /
+                                      'weatherapp.ini')
+        provider = HalfProvider(FakeApp(FakeTransport(), None, configuration))
+        self.app.providermanager.get.return_value = lambda app: provider
+
+        self.assertFalse(provider.supports_location_index())
+        self.run_command('--search', 'Lviv')
+
+        self.assertIn("doesn't support location index",
+                      self.app.stderr.getvalue())
+        self.app.configuration.set_location.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
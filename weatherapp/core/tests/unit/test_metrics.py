@@ -0,0 +1,53 @@
+import unittest
+
+from weatherapp.core.metrics import Metrics
+
+
+class MetricsTestCase(unittest.TestCase):
+
+    """ Unit test case for run metrics.
+    """
+
+    def setUp(self):
+        self.metrics = Metrics()
+
+    def test_timings(self):
+        """ Test timings of the same phase are summed up.
+        """
+
+        self.metrics.add_timing('accu', 'parse', 0.5)
+        with self.metrics.timer('accu', 'parse'):
+            pass
+
+        parse = self.metrics.as_dict()['accu']['timings']['parse']
+        self.assertEqual(parse['calls'], 2)
+        self.assertGreaterEqual(parse['seconds'], 0.5)
+
+    def test_counters(self):
+        """ Test counters are kept per provider.
+        """
+
+        self.metrics.incr('accu', 'hit')
+        self.metrics.incr('accu', 'hit')
+        self.metrics.incr('rp5', 'miss')
+
+        metrics = self.metrics.as_dict()
+        self.assertEqual(metrics['accu']['counters'], {'hit': 2})
+        self.assertEqual(metrics['rp5']['counters'], {'miss': 1})
+
+    def test_summary(self):
+        """ Test summary has row per provider and only measured phases.
+        """
+
+        self.metrics.add_timing('accu', 'network', 0.25)
+        self.metrics.incr('accu', 'miss')
+
+        header, row = self.metrics.summary().splitlines()
+        self.assertIn('network', header)
+        self.assertNotIn('parse', header)
+        self.assertIn('250.0ms', row)
+        self.assertIn('miss=1', row)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import math
+import unittest
+
+from weatherapp.core.observation import (Observation, ObservationBatch,
+                                         parse_temperature, parse_wind,
+                                         format_summary, get_numpy)
+
+
+class ParseTestCase(unittest.TestCase):
+
+    """ Unit test case for weather strings parsing.
+    """
+
+    def test_parse_temperature(self):
+        """ Test temperature value and unit.
+        """
+
+        self.assertEqual(parse_temperature('+5°C'), (5.0, 'C'))
+        self.assertEqual(parse_temperature('−3,5°'), (-3.5, None))
+        self.assertEqual(parse_temperature('RealFeel® 41°F'), (41.0, 'F'))
+        self.assertTrue(math.isnan(parse_temperature('')[0]))
+
+    def test_parse_wind(self):
+        """ Test wind speed, unit and direction.
+        """
+
+        self.assertEqual(parse_wind('SW 14 km/h'), (14.0, 'km/h', 'SW'))
+        self.assertEqual(parse_wind('3 м/с'), (3.0, 'м/с', None))
+        self.assertTrue(math.isnan(parse_wind('Calm')[0]))
+
+    def test_observation(self):
+        """ Test observation from provider weather information.
+        """
+
+        observation = Observation.from_weather_info('accu', 'Lviv', {
+            'cond': 'Sunny', 'temp': '+41°F', 'feels_like': 'RealFeel 32°',
+            'wind': 'N 36 km/h'})
+
+        self.assertEqual(observation.temp_unit, 'F')
+        self.assertEqual(observation.feels_like_celsius, 0)
+        self.assertEqual(observation.temp_celsius, 5)
+        self.assertEqual(observation.wind_ms, 10)
+        self.assertEqual(observation.wind_direction, 'N')
+        with self.assertRaises(AttributeError):
+            observation.extra = 1
+
+
+class ObservationBatchTestCase(unittest.TestCase):
+
+    """ Unit test case for columnar aggregation.
+    """
+
+    def setUp(self):
+        self.batch = ObservationBatch()
+        self.batch.add('accu', 'Kyiv', {'cond': 'Sunny', 'temp': '+4°C',
+                                        'wind': '2 m/s'})
+        self.batch.add('rp5', 'Kyiv', {'cond': 'Sunny', 'temp': '+8°',
+                                       'wind': '14.4 km/h'})
+        self.batch.add('sinoptik', 'Kyiv', {'cond': 'Rain', 'temp': ''})
+        self.batch.add('accu', 'Lviv', {'cond': 'Rain', 'temp': '-1°C'})
+
+    def check(self, result):
+        kyiv = result['Kyiv']
+        self.assertEqual(kyiv['count'], 3)
+        self.assertEqual(kyiv['cond'], 'Sunny')
+        self.assertEqual(kyiv['temp'], {'min': 4, 'max': 8, 'mean': 6})
+        self.assertEqual(kyiv['wind']['max'], 4)
+        self.assertTrue(math.isnan(result['Lviv']['wind']['mean']))
+
+    def test_aggregate_python(self):
+        """ Test aggregation without NumPy.
+        """
+
+        self.check(self.batch.aggregate(use_numpy=False))
+
+    @unittest.skipIf(get_numpy() is None, 'NumPy is not installed')
+    def test_aggregate_numpy(self):
+        """ Test NumPy aggregation gives the same result.
+        """
+
+        self.check(self.batch.aggregate())
+
+    def test_empty(self):
+        """ Test empty batch has no groups.
+        """
+
+        batch = ObservationBatch()
+        self.assertEqual(batch.aggregate(use_numpy=False), {})
+        self.assertEqual(batch.aggregate(), {})
+
+    def test_by_provider(self):
+        """ Test aggregation by provider.
+        """
+
+        result = self.batch.aggregate(by='provider', use_numpy=False)
+        self.assertEqual(result['accu']['temp']['min'], -1)
+
+    def test_format_summary(self):
+        """ Test aggregates are formatted as weather information.
+        """
+
+        info = format_summary(self.batch.aggregate(use_numpy=False)['Kyiv'])
+
+        self.assertEqual(info['temp'], '+6°C (+4..+8)')
+        self.assertEqual(info['feels_like'], '')
+        self.assertEqual(info['wind'], '3.0 m/s (2.0..4.0)')
+
+
+if __name__ == '__main__':
+    unittest.main()
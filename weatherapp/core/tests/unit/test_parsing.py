@@ -0,0 +1,100 @@
+import unittest
+
+from weatherapp.core import parsing
+
+
+PAGE = '''<html><body>
+<nav><div class="temp">-1</div></nav>
+<div class="weather">
+  <div class="cond">Ясно</div>
+  <div class="temp"> +5°C </div>
+</div>
+<footer>footer</footer>
+</body></html>'''
+
+SELECTORS = {'cond': 'div.cond', 'temp': 'div.weather div.temp',
+             'wind': 'div.wind'}
+
+
+class ParsingTestCase(unittest.TestCase):
+
+    """ Unit test case for HTML parsing helpers.
+    """
+
+    def test_slice_fragment(self):
+        """ Test fragment is cut by markers in both str and bytes.
+        """
+
+        fragment = parsing.slice_fragment(PAGE, '<div class="weather">',
+                                          '</div>\n</div>')
+
+        self.assertTrue(fragment.startswith('<div class="weather">'))
+        self.assertTrue(fragment.endswith('</div>\n</div>'))
+        self.assertNotIn('footer', fragment)
+        self.assertEqual(
+            parsing.slice_fragment(PAGE.encode('utf-8'),
+                                   '<div class="weather">', '</div>\n</div>'),
+            fragment.encode('utf-8'))
+
+    def test_slice_memoryview(self):
+        """ Test only fragment is copied out of memoryview.
+        """
+
+        data = memoryview(PAGE.encode('utf-8'))
+        fragment = parsing.slice_fragment(data, '<footer>', '</footer>')
+
+        self.assertEqual(fragment, b'<footer>footer</footer>')
+        self.assertIsInstance(parsing.slice_fragment(data, '<table>'), bytes)
+
+    def test_decode(self):
+        """ Test page is decoded by charset, UTF-8 is used by default.
+        """
+
+        self.assertEqual(parsing.get_charset('text/html; Charset="CP1251"'),
+                         'cp1251')
+        self.assertIsNone(parsing.get_charset('text/html'))
+        self.assertEqual(parsing.decode(memoryview('Ясно'.encode('cp1251')),
+                                        'cp1251'), 'Ясно')
+        self.assertEqual(parsing.decode('Ясно'.encode('utf-8'), 'unknown'),
+                         'Ясно')
+
+    def test_slice_missing_marker(self):
+        """ Test whole page is returned if page layout has changed.
+        """
+
+        self.assertEqual(parsing.slice_fragment(PAGE, '<table>'), PAGE)
+
+    def test_select_text(self):
+        """ Test fields are selected, missing ones are empty.
+        """
+
+        expected = {'cond': 'Ясно', 'temp': '+5°C', 'wind': ''}
+        for backend in parsing.BACKEND_MODULES:
+            if not parsing.is_available(backend):
+                continue
+            with self.subTest(backend=backend):
+                self.assertEqual(
+                    parsing.select_text(PAGE, SELECTORS, backend), expected)
+
+    def test_parse_only(self):
+        """ Test restricted tree gives the same fields.
+        """
+
+        result = parsing.select_text(PAGE, SELECTORS, 'html.parser',
+                                     ('div', {'class': 'weather'}))
+
+        self.assertEqual(result['temp'], '+5°C')
+        self.assertIsNone(parsing.make_soup(
+            PAGE, 'html.parser', ('div', {'class': 'weather'})).footer)
+
+    def test_get_backend(self):
+        """ Test the first installed backend is used.
+        """
+
+        self.assertEqual(parsing.get_backend(('missing', 'html.parser')),
+                         'html.parser')
+        self.assertFalse(parsing.is_available('missing'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import io
+import unittest
+from unittest import mock
+
+from weatherapp.core.app import App
+from weatherapp.core.commands.prefetch import Prefetch
+from weatherapp.core.tests.base import HomeTestCase
+from weatherapp.core.tests.unit.test_provider import (DummyProvider,
+                                                      FakeTransport,
+                                                      FakeResponse)
+
+
+class PrefetchCommandTestCase(HomeTestCase):
+
+    """ Unit test case for prefetch command.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.stdout = io.StringIO()
+        self.app = App(stdout=self.stdout)
+        self.app.options = self.app.arg_parser.parse_args([])
+        self.addCleanup(self.app.close)
+        self.app.providermanager._commands = {'dummy': DummyProvider}
+        self.transport = self.app._transport = FakeTransport(
+            FakeResponse(content=b'Sunny', headers={'ETag': '"v1"'}),
+            FakeResponse(status_code=304))
+        self.url = DummyProvider.get_default_url(None)
+
+    def test_prefetch(self):
+        """ Test page cache and history are refreshed, nothing is printed.
+        """
+
+        Prefetch(self.app).run([])
+
+        self.assertEqual(self.transport.requests, [(self.url, mock.ANY)])
+        self.assertEqual(self.app.cache.stats()['entries'], 2)
+        record, = self.app.history.latest('dummy', 'Kyiv')
+        self.assertEqual(record.cond, 'Sunny')
+        self.assertEqual(self.stdout.getvalue(), '')
+
+    def test_revalidate(self):
+        """ Test valid page cache is revalidated with conditional request.
+        """
+
+        Prefetch(self.app).run([])
+        Prefetch(self.app).run([])
+
+        self.assertEqual(len(self.transport.requests), 2)
+        url, headers = self.transport.requests[1]
+        self.assertEqual(headers['If-None-Match'], '"v1"')
+
+    def test_loop(self):
+        """ Test every provider is scheduled until interrupted.
+        """
+
+        with mock.patch('weatherapp.core.commands.prefetch.Scheduler') \
+                as scheduler:
+            scheduler.return_value.run.side_effect = KeyboardInterrupt
+            Prefetch(self.app).run(['--loop'])
+
+        scheduler.return_value.add.assert_called_once_with(('dummy', None))
+        scheduler.return_value.stop.assert_called_once_with()
+
+
+if __name__ == '__main__':
+    unittest.main()
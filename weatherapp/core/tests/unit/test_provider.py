@@ -0,0 +1,473 @@
+import time
+import logging
+import gzip
+import argparse
+import threading
+import http.server
+import tempfile
+import unittest
+from pathlib import Path
+
+from weatherapp.core.abstract import WeatherProvider
+from weatherapp.core.backends import SQLiteBackend
+from weatherapp.core.configuration import Configuration, Location
+from weatherapp.core.parsepool import ParsePool, get_context
+from weatherapp.core.transport import HttpTransport
+from weatherapp.core.metrics import Metrics
+
+
+class FakeResponse:
+
+    def __init__(self, status_code=200, content=b'', headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+
+class FakeTransport:
+
+    """ Transport stub which returns prepared responses.
+    """
+
+    delay = 0
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None):
+        self.requests.append((url, headers))
+        time.sleep(self.delay)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def close(self):
+        pass
+
+
+class StalledServer:
+
+    """ HTTP server which sends headers and stalls sending the body.
+    """
+
+    def __init__(self):
+        released = self.released = threading.Event()
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header('Content-Length', '100')
+                self.end_headers()
+                self.wfile.write(b'sunny')
+                self.wfile.flush()
+                released.wait(5)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0),
+                                                      Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_port}/kyiv'
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def close(self):
+        self.released.set()
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+
+class FakeApp:
+
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, transport, cache, configuration):
+        self.transport = transport
+        self.cache = cache
+        self.configuration = configuration
+        self.parse_pool = None
+        self.metrics = Metrics()
+        self.options = argparse.Namespace(refresh=False, debug=False,
+                                          cache_compression='zlib')
+
+    def run_in_background(self, func, *args):
+        func(*args)
+
+
+class DummyProvider(WeatherProvider):
+
+    name = 'dummy'
+    title = 'Dummy'
+
+    def get_name(self):
+        return self.name
+
+    def get_default_location(self):
+        return 'Kyiv'
+
+    def get_default_url(self):
+        return 'https://example.com/kyiv'
+
+    def configurate(self):
+        pass
+
+    def get_weather_info(self, content):
+        self.parsed += 1
+        return {'cond': content}
+
+    parsed = 0
+
+
+class ProviderTestCase(unittest.TestCase):
+
+    """ Base test case which runs dummy provider in temp home directory.
+    """
+
+    def setUp(self):
+        self.home = tempfile.TemporaryDirectory()
+        self.config_file = Path(self.home.name) / 'weatherapp.ini'
+        self.url = DummyProvider.get_default_url(None)
+        self.cache = SQLiteBackend(Path(self.home.name), max_size=2 ** 20,
+                                   max_entries=100, evict_time=3600)
+
+    def tearDown(self):
+        self.cache.close()
+        self.home.cleanup()
+
+    def make_provider(self, *responses):
+        return DummyProvider(FakeApp(FakeTransport(*responses), self.cache,
+                                     Configuration(self.config_file)))
+
+    def expire(self, provider):
+        self.cache.connection.execute(
+            'UPDATE entries SET stored_at = stored_at - 3600')
+
+
+class WeatherProviderCacheTestCase(ProviderTestCase):
+
+    """ Unit test case for provider page cache.
+    """
+
+    def test_cache_hit(self):
+        """ Test valid cache is served without request.
+        """
+
+        provider = self.make_provider(FakeResponse(content=b'sunny'))
+        self.assertEqual(provider.get_page_source(self.url), 'sunny')
+        self.assertEqual(provider.get_page_source(self.url), 'sunny')
+        self.assertEqual(len(provider.app.transport.requests), 1)
+        self.assertEqual(provider.app.metrics.as_dict()['dummy']['counters'],
+                         {'miss': 1, 'hit': 1})
+
+    def test_response_charset(self):
+        """ Test page is decoded by the charset of the response.
+        """
+
+        headers = {'Content-Type': 'text/html; charset=windows-1251'}
+        provider = self.make_provider(
+            FakeResponse(content='Ясно'.encode('cp1251'), headers=headers))
+
+        self.assertEqual(provider.run([]), {'cond': 'Ясно'})
+        self.assertEqual(provider.get_page_source(self.url), 'Ясно')
+
+    def test_compressed_cache(self):
+        """ Test page is stored compressed and restored on cache hit.
+        """
+
+        page = b'sunny' * 100
+        provider = self.make_provider(FakeResponse(content=page))
+        provider.get_page_source(self.url)
+
+        entry = self.cache.get(provider.get_cache_key(self.url))
+        self.assertEqual(entry.info['encoding'], 'zlib')
+        self.assertLess(len(entry.data), len(page))
+        self.assertEqual(provider.get_page(self.url).data, page)
+
+    def test_gzip_body_stored_as_is(self):
+        """ Test gzip encoded response body isn't compressed again.
+        """
+
+        page = b'sunny' * 100
+        response = FakeResponse(content=page,
+                                headers={'Content-Encoding': 'gzip'})
+        response.encoded_content = gzip.compress(page)
+        provider = self.make_provider(response)
+        provider.get_page_source(self.url)
+
+        entry = self.cache.get(provider.get_cache_key(self.url))
+        self.assertEqual(entry.info['encoding'], 'gzip')
+        self.assertEqual(entry.data, response.encoded_content)
+        self.assertEqual(provider.get_page_source(self.url), 'sunny' * 100)
+
+    def test_revalidation(self):
+        """ Test expired cache is revalidated with conditional request.
+        """
+
+        headers = {'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jan 2024'}
+        provider = self.make_provider(
+            FakeResponse(content=b'sunny', headers=headers),
+            FakeResponse(status_code=304))
+        provider.get_page_source(self.url)
+        self.expire(provider)
+
+        self.assertEqual(provider.get_page_source(self.url), 'sunny')
+        request_headers = provider.app.transport.requests[1][1]
+        self.assertEqual(request_headers['If-None-Match'], '"v1"')
+        self.assertEqual(request_headers['If-Modified-Since'],
+                         'Mon, 01 Jan 2024')
+        self.assertTrue(provider.get_cache(self.url))
+
+    def test_refresh_page(self):
+        """ Test scheduled refresh of valid cache is conditional request.
+        """
+
+        provider = self.make_provider(
+            FakeResponse(content=b'sunny', headers={'ETag': '"v1"'}),
+            FakeResponse(status_code=304), FakeResponse(content=b'rainy'))
+        provider.get_page_source(self.url)
+
+        self.assertEqual(bytes(provider.refresh_page(self.url).data),
+                         b'sunny')
+        self.assertEqual(
+            provider.app.transport.requests[1][1]['If-None-Match'], '"v1"')
+
+        # '--refresh' bypasses cache
+        provider.app.options.refresh = True
+        self.assertEqual(bytes(provider.refresh_page(self.url).data),
+                         b'rainy')
+        self.assertNotIn('If-None-Match',
+                         provider.app.transport.requests[2][1])
+
+    def test_server_max_age(self):
+        """ Test server max-age is used instead of default cache time.
+        """
+
+        provider = self.make_provider(
+            FakeResponse(content=b'sunny',
+                         headers={'Cache-Control': 'public, max-age=0'}),
+            FakeResponse(content=b'rainy'))
+        provider.get_page_source(self.url)
+
+        self.assertEqual(provider.get_page_source(self.url), 'rainy')
+
+    def test_single_flight(self):
+        """ Test concurrent requests for the same page do one fetch.
+        """
+
+        provider = self.make_provider(FakeResponse(content=b'sunny'))
+        provider.app.transport.delay = 0.1
+        results = []
+
+        def fetch():
+            results.append(provider.get_page_source(self.url))
+
+        threads = [threading.Thread(target=fetch) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, ['sunny'] * 4)
+        self.assertEqual(len(provider.app.transport.requests), 1)
+
+    def test_get_max_age(self):
+        """ Test max age parsing from Cache-Control header.
+        """
+
+        self.assertEqual(WeatherProvider.get_max_age(
+            {'Cache-Control': 'public, max-age=60'}), 60)
+        self.assertEqual(WeatherProvider.get_max_age(
+            {'Cache-Control': 'no-cache'}), 0)
+        self.assertIsNone(WeatherProvider.get_max_age({}))
+
+
+class WeatherProviderLocationTestCase(ProviderTestCase):
+
+    """ Unit test case for provider location.
+    """
+
+    def test_location_label(self):
+        """ Test location is named by its label if it has one.
+        """
+
+        app = self.make_provider().app
+        center = DummyProvider(app, location=Location(
+            'center', 'Kyiv', 'https://example.com/kyiv/center'))
+        lviv = DummyProvider(app, location=Location(
+            None, 'Lviv', 'https://example.com/lviv'))
+
+        self.assertEqual(center.location, 'center')
+        self.assertEqual(center.url, 'https://example.com/kyiv/center')
+        self.assertEqual(lviv.location, 'Lviv')
+        self.assertEqual(self.make_provider().location, 'Kyiv')
+
+
+class WeatherProviderParsedCacheTestCase(ProviderTestCase):
+
+    """ Unit test case for parsed weather information cache.
+    """
+
+    def test_warm_run(self):
+        """ Test warm run doesn't parse page again.
+        """
+
+        provider = self.make_provider(FakeResponse(content=b'sunny'))
+        self.assertEqual(provider.run([]), {'cond': 'sunny'})
+        self.assertEqual(provider.run([]), {'cond': 'sunny'})
+        self.assertEqual(provider.parsed, 1)
+
+    def test_not_modified_page(self):
+        """ Test page revalidated without changes isn't parsed again.
+        """
+
+        provider = self.make_provider(
+            FakeResponse(content=b'sunny', headers={'ETag': '"v1"'}),
+            FakeResponse(status_code=304))
+        provider.run([])
+        self.expire(provider)
+
+        self.assertEqual(provider.run([]), {'cond': 'sunny'})
+        self.assertEqual(provider.parsed, 1)
+
+    def test_changed_page(self):
+        """ Test parsed result is invalidated when page changes.
+        """
+
+        provider = self.make_provider(FakeResponse(content=b'sunny'),
+                                      FakeResponse(content=b'rainy'))
+        provider.run([])
+        self.expire(provider)
+
+        self.assertEqual(provider.run([]), {'cond': 'rainy'})
+        self.assertEqual(provider.parsed, 2)
+
+    def test_parser_version(self):
+        """ Test parsed result of another parser version is not used.
+        """
+
+        provider = self.make_provider(FakeResponse(content=b'sunny'))
+        provider.run([])
+        provider.parser_version = 2
+
+        self.assertIsNone(provider.get_parsed_cache(self.url))
+
+
+class WeatherProviderStaleTestCase(ProviderTestCase):
+
+    """ Unit test case for serving expired page cache.
+    """
+
+    def configure(self, stale):
+        with self.config_file.open('w') as ini:
+            ini.write(f'[dummy]\nstale = {stale}\nmax_stale = 7200\n')
+
+    def test_stale_while_revalidate(self):
+        """ Test expired cache is served and refreshed in the background.
+        """
+
+        self.configure('revalidate')
+        provider = self.make_provider(FakeResponse(content=b'sunny'),
+                                      FakeResponse(content=b'rainy'))
+        provider.get_page_source(self.url)
+        self.expire(provider)
+
+        self.assertEqual(provider.get_page_source(self.url), 'sunny')
+        self.assertIsNotNone(provider.stale_age)
+        self.assertEqual(provider.get_cache(self.url), b'rainy')
+
+    def test_stale_on_error(self):
+        """ Test expired cache is served when page can't be fetched.
+        """
+
+        self.configure('error')
+        provider = self.make_provider(FakeResponse(content=b'sunny'),
+                                      ConnectionError())
+        provider.get_page_source(self.url)
+        self.expire(provider)
+
+        with self.assertLogs(FakeApp.logger, 'WARNING'):
+            self.assertEqual(provider.get_page_source(self.url), 'sunny')
+        self.assertIsNotNone(provider.stale_age)
+
+    def test_stale_on_stalled_body(self):
+        """ Test expired cache is served when server stalls sending body.
+        """
+
+        server = StalledServer()
+        self.addCleanup(server.close)
+        self.configure('error')
+        provider = self.make_provider(FakeResponse(content=b'sunny'))
+        provider.get_page_source(server.url)
+        self.expire(provider)
+
+        provider.app.transport = HttpTransport(read_timeout=0.2, retries=0)
+        self.addCleanup(provider.app.transport.close)
+
+        with self.assertLogs(FakeApp.logger, 'WARNING'):
+            self.assertEqual(provider.get_page_source(server.url), 'sunny')
+
+    def test_max_stale(self):
+        """ Test too old cache is never served.
+        """
+
+        self.configure('revalidate, error')
+        provider = self.make_provider(FakeResponse(content=b'sunny'),
+                                      ConnectionError())
+        provider.get_page_source(self.url)
+        self.cache.connection.execute(
+            'UPDATE entries SET stored_at = stored_at - 86400')
+
+        with self.assertRaises(ConnectionError):
+            provider.get_page_source(self.url)
+
+    def test_stale_off(self):
+        """ Test expired cache is not served by default.
+        """
+
+        provider = self.make_provider(FakeResponse(content=b'sunny'),
+                                      ConnectionError())
+        provider.get_page_source(self.url)
+        self.expire(provider)
+
+        with self.assertRaises(ConnectionError):
+            provider.get_page_source(self.url)
+        self.assertIsNone(provider.stale_age)
+
+
+class ParsePoolTestCase(ProviderTestCase):
+
+    """ Unit test case for parsing in worker processes.
+    """
+
+    def test_same_result(self):
+        """ Test pool produces exactly the same result as in-process parser.
+        """
+
+        page = 'Ясно, +5°C'.encode('utf-8')
+        provider = self.make_provider(FakeResponse(content=page),
+                                      FakeResponse(content=page))
+        expected = provider.run([])
+
+        provider.app.parse_pool = ParsePool(workers=1)
+        try:
+            self.assertEqual(provider.app.parse_pool.parse(provider, page),
+                             expected)
+            provider.app.options.refresh = True
+            self.assertEqual(provider.run([]), expected)
+        finally:
+            provider.app.parse_pool.close()
+
+    def test_no_fork(self):
+        """ Test workers aren't forked from the threaded application.
+        """
+
+        self.assertIn(get_context().get_start_method(),
+                      ('forkserver', 'spawn'))
+
+
+if __name__ == '__main__':
+    unittest.main()
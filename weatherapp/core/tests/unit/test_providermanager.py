@@ -1,18 +1,21 @@
 import unittest
 
+from weatherapp.core.commands import Providers
 from weatherapp.core.providermanager import ProviderManager
+from weatherapp.core.tests.base import HomeTestCase
 
 
 class DummyCommand:
     pass
 
 
-class ProviderManagerTestCase(unittest.TestCase):
+class ProviderManagerTestCase(HomeTestCase):
 
     """ Unit test case for providers manager.
     """
 
     def setUp(self):
+        super().setUp()
         self.provider_manager = ProviderManager()
 
     def test_load_commands(self):
@@ -26,6 +29,17 @@ class ProviderManagerTestCase(unittest.TestCase):
         self.assertFalse('bar' in self.provider_manager)
         self.assertIsNone(self.provider_manager.get('bar'))
 
+    def test_lazy_load(self):
+        """ Test provider is imported only when it is requested.
+        """
+
+        self.provider_manager._commands['lazy'] = \
+            'weatherapp.core.commands:Providers'
+
+        self.assertIn('lazy', self.provider_manager.names())
+        self.assertEqual(self.provider_manager.get('lazy'), Providers)
+        self.assertEqual(self.provider_manager._commands['lazy'], Providers)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,89 @@
+import time
+import threading
+import unittest
+
+from weatherapp.core.scheduler import TokenBucket, RateLimiter, Scheduler
+
+
+class TokenBucketTestCase(unittest.TestCase):
+
+    """ Unit test case for token bucket rate limit.
+    """
+
+    def test_burst(self):
+        """ Test burst of requests is allowed and then delayed.
+        """
+
+        bucket = TokenBucket(rate=10, capacity=2)
+
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertAlmostEqual(bucket.reserve(), 0.1, places=2)
+
+    def test_per_host(self):
+        """ Test hosts have separate limits.
+        """
+
+        limiter = RateLimiter(rate=1, burst=1, rates={'slow.com': 0.5})
+
+        self.assertIsNot(limiter.get_bucket('a.com'),
+                         limiter.get_bucket('b.com'))
+        self.assertEqual(limiter.get_bucket('slow.com').rate, 0.5)
+        start = time.monotonic()
+        limiter.wait('https://a.com/kyiv')
+        limiter.wait('https://b.com/kyiv')
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_unlimited(self):
+        """ Test zero rate disables limit and wrong rate is ignored.
+        """
+
+        limiter = RateLimiter(rate=1, burst=1,
+                              rates={'free.com': '0', 'bad.com': 'fast'})
+
+        self.assertIsNone(limiter.get_bucket('free.com'))
+        with self.assertLogs('weatherapp.core.scheduler', 'WARNING'):
+            self.assertEqual(limiter.get_bucket('bad.com').rate, 1)
+        start = time.monotonic()
+        for _ in range(3):
+            limiter.wait('https://free.com/kyiv')
+        self.assertLess(time.monotonic() - start, 0.5)
+
+
+class SchedulerTestCase(unittest.TestCase):
+
+    """ Unit test case for refresh scheduler.
+    """
+
+    def test_periodic_runs(self):
+        """ Test keys are run periodically.
+        """
+
+        runs = []
+        scheduler = Scheduler(runs.append, interval=0.05, jitter=0)
+        scheduler.add('kyiv')
+        thread = threading.Thread(target=scheduler.run)
+        thread.start()
+        time.sleep(0.3)
+        scheduler.stop()
+        thread.join()
+
+        self.assertGreater(runs.count('kyiv'), 2)
+
+    def test_in_flight(self):
+        """ Test key is not run again while previous run is in flight.
+        """
+
+        release = threading.Event()
+        scheduler = Scheduler(lambda key: release.wait(), interval=60)
+
+        self.assertTrue(scheduler.submit('kyiv'))
+        self.assertFalse(scheduler.submit('kyiv'))
+        self.assertTrue(scheduler.submit('lviv'))
+        release.set()
+        scheduler.stop()
+        scheduler.run()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import io
+import json
+import threading
+import unittest
+import urllib.request
+
+from weatherapp.core.app import App
+from weatherapp.core.server import WeatherService, make_server
+from weatherapp.core.tests.base import HomeTestCase
+
+
+class DummyProvider:
+
+    title = 'Dummy'
+    location = 'Kyiv'
+    runs = 0
+
+    def __init__(self, app):
+        self.app = app
+
+    def run(self, argv):
+        DummyProvider.runs += 1
+        return {'temp': '+5'}
+
+
+class WeatherServiceTestCase(HomeTestCase):
+
+    """ Unit test case for weather HTTP API.
+    """
+
+    def setUp(self):
+        super().setUp()
+        DummyProvider.runs = 0
+        self.app = App(stdout=io.StringIO())
+        self.app.options, _ = self.app.arg_parser.parse_known_args(
+            ['--no-history'])
+        self.app.providermanager._commands = {'dummy': DummyProvider}
+        self.service = WeatherService(self.app, interval=60)
+        self.service.refresh()
+
+        self.server = make_server(self.service, '127.0.0.1', 0)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def get(self, path):
+        url = f'http://127.0.0.1:{self.server.server_port}{path}'
+        with urllib.request.urlopen(url) as response:
+            return json.loads(response.read().decode('utf-8'))
+
+    def test_providers(self):
+        """ Test providers list request.
+        """
+
+        self.assertEqual(self.get('/providers'), ['dummy'])
+
+    def test_weather(self):
+        """ Test weather is answered from memory.
+        """
+
+        for path in ('/weather', '/weather/dummy'):
+            weather = self.get(path)
+            self.assertEqual(len(weather), 1)
+            self.assertEqual(weather[0]['weather'], {'temp': '+5'})
+            self.assertEqual(weather[0]['location'], 'Kyiv')
+        self.assertEqual(DummyProvider.runs, 1)
+
+    def test_not_found(self):
+        """ Test unknown request.
+        """
+
+        with self.assertRaises(urllib.error.HTTPError) as error:
+            self.get('/weather/bar')
+        self.assertEqual(error.exception.code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+import gzip
+import time
+import zlib
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import requests
+
+from weatherapp.core.archive import ResponseArchive
+from weatherapp.core.transport import (HttpTransport, RecordingTransport,
+                                       ReplayTransport)
+
+
+class HttpTransportTestCase(unittest.TestCase):
+
+    """ Unit test case for HTTP transport.
+    """
+
+    def setUp(self):
+        self.transport = HttpTransport(connect_timeout=1, read_timeout=2,
+                                       retries=2, pool_size=5)
+
+    def tearDown(self):
+        self.transport.close()
+
+    def test_adapter(self):
+        """ Test connection pool and retry policy configuration.
+        """
+
+        adapter = self.transport.session.get_adapter('https://example.com')
+
+        self.assertEqual(adapter._pool_maxsize, 5)
+        self.assertEqual(adapter.max_retries.total, 2)
+
+    def test_accept_encoding(self):
+        """ Test compressed responses are negotiated.
+        """
+
+        self.assertIn('gzip',
+                      self.transport.session.headers['Accept-Encoding'])
+
+    def test_get_timeout(self):
+        """ Test connect and read timeouts are passed with request.
+        """
+
+        with mock.patch.object(self.transport.session, 'get') as get:
+            get.return_value.headers = {}
+            get.return_value.raw.read.return_value = b'page'
+            self.transport.get('https://example.com', headers={'A': 'b'})
+
+        get.assert_called_once_with('https://example.com', headers={'A': 'b'},
+                                    timeout=(1, 2), stream=True)
+        get.return_value.raise_for_status.assert_called_once_with()
+
+    def test_encoded_content(self):
+        """ Test gzip encoded body is kept along with decoded content.
+        """
+
+        body = gzip.compress(b'page')
+        with mock.patch.object(self.transport.session, 'get') as get:
+            get.return_value.headers = {'Content-Encoding': 'gzip'}
+            get.return_value.raw.read.return_value = body
+            response = self.transport.get('https://example.com')
+
+        get.return_value.raw.read.assert_called_once_with(
+            decode_content=False)
+        self.assertEqual(response.encoded_content, body)
+        self.assertEqual(response._content, b'page')
+
+    def test_decode_content(self):
+        """ Test deflate with and without zlib header is decoded.
+        """
+
+        compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+        raw = compressor.compress(b'page') + compressor.flush()
+
+        for body in (zlib.compress(b'page'), raw):
+            self.assertEqual(HttpTransport.decode_content(body, 'deflate'),
+                             b'page')
+        self.assertEqual(HttpTransport.decode_content(b'page', None), b'page')
+
+    def test_corrupted_content(self):
+        """ Test corrupted body is raised as request error.
+        """
+
+        with self.assertRaises(requests.exceptions.ContentDecodingError):
+            HttpTransport.decode_content(b'page', 'gzip')
+
+
+class RecordReplayTestCase(unittest.TestCase):
+
+    """ Unit test case for recording and replaying responses.
+    """
+
+    URL = 'https://example.com/weather'
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.archive = ResponseArchive(Path(self.directory.name) / 'rec.db')
+
+    def tearDown(self):
+        self.archive.close()
+        self.directory.cleanup()
+
+    def record(self, body, headers):
+        transport = mock.Mock()
+        transport.get.return_value.status_code = 200
+        transport.get.return_value.headers = headers
+        transport.get.return_value.encoded_content = body
+        recording = RecordingTransport(transport, self.archive)
+        recording.get(self.URL, headers={'If-None-Match': '"v1"',
+                                         'User-Agent': 'test'})
+        return transport
+
+    def test_record(self):
+        """ Test response is recorded as sent, without conditional request.
+        """
+
+        body = gzip.compress(b'page')
+        transport = self.record(body, {'Content-Encoding': 'gzip'})
+
+        transport.get.assert_called_once_with(
+            self.URL, headers={'User-Agent': 'test'})
+        recorded = self.archive.get(self.URL)
+        self.assertEqual(recorded.body, body)
+        self.assertEqual(recorded.headers, {'Content-Encoding': 'gzip'})
+        self.assertIsNone(self.archive.get('https://example.com'))
+
+    def test_replay(self):
+        """ Test recorded response is decoded as the original one.
+        """
+
+        body = gzip.compress(b'page')
+        self.record(body, {'Content-Encoding': 'gzip', 'ETag': '"v1"'})
+
+        response = ReplayTransport(self.archive).get(self.URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'page')
+        self.assertEqual(response.encoded_content, body)
+        self.assertEqual(response.headers['etag'], '"v1"')
+
+    def test_replay_not_modified(self):
+        """ Test conditional request with recorded validator.
+        """
+
+        self.record(b'page', {'ETag': '"v1"'})
+        transport = ReplayTransport(self.archive)
+
+        self.assertEqual(transport.get(self.URL, headers={
+            'If-None-Match': '"v1"'}).status_code, 304)
+        self.assertEqual(transport.get(self.URL, headers={
+            'If-None-Match': '"v0"'}).status_code, 200)
+
+    def test_replay_missing(self):
+        """ Test url which wasn't recorded fails as unreachable.
+        """
+
+        with self.assertRaises(requests.ConnectionError):
+            ReplayTransport(self.archive).get(self.URL)
+
+    def test_replay_latency(self):
+        """ Test latency is injected.
+        """
+
+        self.record(b'page', {})
+        transport = ReplayTransport(self.archive, latency=0.05)
+
+        start = time.monotonic()
+        transport.get(self.URL)
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+
+
+if __name__ == '__main__':
+    unittest.main()
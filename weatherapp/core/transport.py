@@ -0,0 +1,252 @@
+""" HTTP transport shared by all providers.
+"""
+
+import time
+import zlib
+
+import urllib3
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from weatherapp.core import config
+
+
+def get_accept_encoding():
+    """ Content encodings supported by installed decoders.
+
+    Brotli is negotiated only when brotli package is available, otherwise
+    urllib3 can't decode the response body.
+    """
+
+    encodings = ['gzip', 'deflate']
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        encodings.append('br')
+    return ', '.join(encodings)
+
+
+class HttpTransport:
+
+    """ Pooled keep-alive HTTP transport.
+
+    Wraps single 'requests.Session', so connections to the same host are
+    reused between requests and providers.
+
+    :param connect_timeout: how long to wait for connection (in seconds)
+    :type connect_timeout: float
+    :param read_timeout: how long to wait for server response (in seconds)
+    :type read_timeout: float
+    :param retries: how many times failed request is repeated
+    :type retries: int
+    :param backoff: backoff factor for delays between retries
+    :type backoff: float
+    :param pool_size: how many connections are kept open per host
+    :type pool_size: int
+    :param rate_limiter: per host request rate limits
+    :type rate_limiter: scheduler.RateLimiter
+    """
+
+    def __init__(self, connect_timeout=config.CONNECT_TIMEOUT,
+                 read_timeout=config.READ_TIMEOUT,
+                 retries=config.MAX_RETRIES,
+                 backoff=config.RETRY_BACKOFF,
+                 pool_size=config.POOL_SIZE,
+                 rate_limiter=None):
+        self.timeout = (connect_timeout, read_timeout)
+        self.rate_limiter = rate_limiter
+        self.session = requests.Session()
+        self.session.headers['Accept-Encoding'] = get_accept_encoding()
+
+        retry = Retry(total=retries, backoff_factor=backoff,
+                      status_forcelist=config.RETRY_STATUSES)
+        adapter = HTTPAdapter(pool_connections=pool_size,
+                              pool_maxsize=pool_size,
+                              max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get(self, url, headers=None):
+        """ Sends GET request.
+
+        Response body is read as it was sent by the server and kept in
+        'encoded_content' attribute, so gzip encoded body may be cached
+        without compressing it again. 'content' is decoded as usual.
+
+        :param url: requested url address
+        :type url: str
+        :param headers: additional request headers
+        :type headers: dict
+        :return: server response
+        :rtype: requests.Response
+        """
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.wait(url)
+        response = self.session.get(url, headers=headers,
+                                    timeout=self.timeout, stream=True)
+        try:
+            response.raise_for_status()
+            response.encoded_content = self.read_body(response)
+        finally:
+            response.close()
+        response._content = self.decode_content(
+            response.encoded_content,
+            response.headers.get('Content-Encoding'))
+        return response
+
+    @staticmethod
+    def read_body(response):
+        """ Reads response body as it was sent by the server.
+
+        urllib3 errors are raised as requests exceptions, the same way
+        'iter_content' does, so callers handle them as any other request
+        error.
+
+        :param response: streamed server response
+        :type response: requests.Response
+        :rtype: bytes
+        """
+
+        try:
+            return response.raw.read(decode_content=False)
+        except urllib3.exceptions.ProtocolError as error:
+            raise requests.exceptions.ChunkedEncodingError(error)
+        except urllib3.exceptions.ReadTimeoutError as error:
+            raise requests.ConnectionError(error)
+        except urllib3.exceptions.SSLError as error:
+            raise requests.exceptions.SSLError(error)
+
+    @staticmethod
+    def decode_content(body, content_encoding):
+        """ Decodes response body by its Content-Encoding.
+
+        :param body: response body as it was sent by the server
+        :type body: bytes
+        :param content_encoding: Content-Encoding header value
+        :type content_encoding: str
+        :rtype: bytes
+        :raises requests.exceptions.ContentDecodingError: if body is
+                                                          corrupted
+        """
+
+        for encoding in reversed((content_encoding or '').split(',')):
+            encoding = encoding.strip().lower()
+            try:
+                if encoding in ('gzip', 'x-gzip'):
+                    body = zlib.decompress(body, 16 + zlib.MAX_WBITS)
+                elif encoding == 'deflate':
+                    try:
+                        body = zlib.decompress(body)
+                    except zlib.error:  # raw deflate stream without header
+                        body = zlib.decompress(body, -zlib.MAX_WBITS)
+                elif encoding == 'br':
+                    import brotli
+                    try:
+                        body = brotli.decompress(body)
+                    except brotli.error as error:
+                        raise requests.exceptions.ContentDecodingError(
+                            error)
+            except zlib.error as error:
+                raise requests.exceptions.ContentDecodingError(error)
+        return body
+
+    def close(self):
+        """ Closes all pooled connections.
+        """
+
+        self.session.close()
+
+
+class RecordingTransport:
+
+    """ Transport which records all responses to the archive.
+
+    Conditional headers are not sent, so full response bodies are
+    recorded even for pages which are already cached.
+
+    :param transport: transport which sends requests
+    :type transport: HttpTransport
+    :param archive: where responses are recorded
+    :type archive: archive.ResponseArchive
+    """
+
+    CONDITIONAL_HEADERS = ('If-None-Match', 'If-Modified-Since')
+
+    def __init__(self, transport, archive):
+        self.transport = transport
+        self.archive = archive
+
+    def get(self, url, headers=None):
+        headers = {name: value for name, value in (headers or {}).items()
+                   if name not in self.CONDITIONAL_HEADERS}
+        response = self.transport.get(url, headers=headers)
+        self.archive.add(url, response.status_code, response.headers,
+                         response.encoded_content)
+        return response
+
+    def close(self):
+        self.transport.close()
+        self.archive.close()
+
+
+class ReplayTransport:
+
+    """ Transport which serves recorded responses without network access.
+
+    All responses are loaded from the archive in memory at once, so they
+    are served at memory speed unless latency is injected. Conditional
+    requests matching the recorded validators get '304 Not Modified'.
+
+    :param archive: recorded responses
+    :type archive: archive.ResponseArchive
+    :param latency: delay of every response (in seconds)
+    :type latency: float
+    """
+
+    def __init__(self, archive, latency=0):
+        self.archive = archive
+        self.latency = latency
+        self.responses = archive.load()
+
+    def get(self, url, headers=None):
+        """ Sends recorded response of the url.
+
+        :raises requests.ConnectionError: if url wasn't recorded
+        :rtype: requests.Response
+        """
+
+        if self.latency:
+            time.sleep(self.latency)
+        recorded = self.responses.get(url)
+        if recorded is None:
+            raise requests.ConnectionError(f'{url} is not in the archive')
+
+        response = requests.Response()
+        response.url = url
+        response.headers = CaseInsensitiveDict(recorded.headers)
+        if self.is_not_modified(response.headers, headers or {}):
+            response.status_code = 304
+            response.encoded_content = response._content = b''
+            return response
+        response.status_code = recorded.status_code
+        response.encoded_content = recorded.body
+        response._content = HttpTransport.decode_content(
+            recorded.body, response.headers.get('Content-Encoding'))
+        return response
+
+    @staticmethod
+    def is_not_modified(response_headers, request_headers):
+        etag = request_headers.get('If-None-Match')
+        if etag is not None:
+            return etag == response_headers.get('ETag')
+        modified_since = request_headers.get('If-Modified-Since')
+        return modified_since is not None and \
+            modified_since == response_headers.get('Last-Modified')
+
+    def close(self):
+        self.archive.close()